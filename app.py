@@ -1,7 +1,14 @@
+import time
+
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+
+from bmw_dashboard import charts, config, forecast, storage, views
+from bmw_dashboard.cache import ResultCache
+from bmw_dashboard.currency import CurrencyTable
+from bmw_dashboard.engine import DashboardEngine, FilterState, price_column
+from bmw_dashboard.profiling import ProfileStore, RerunProfiler
+from bmw_dashboard.refresher import DEFAULT_INTERVAL, DataRefresher
 
 # ========================================
 # KONFIGURASI HALAMAN
@@ -13,6 +20,17 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# ========================================
+# PROFILING PER RERUN (OPT-IN)
+# ========================================
+@st.cache_resource
+def load_profile_store():
+    """Agregat timing lintas sesi (satu per proses) + ekspor opsional"""
+    return ProfileStore(
+        jsonl_path=config.env_str(config.PROFILE_LOG_ENV),
+        prometheus_path=config.env_str(config.PROFILE_PROMETHEUS_ENV)
+    )
+
 # ========================================
 # CUSTOM CSS UNTUK STYLING
 # ========================================
@@ -131,14 +149,43 @@ st.markdown("""
 # ========================================
 # FUNGSI UNTUK LOAD DATA
 # ========================================
-@st.cache_data
-def load_data():
-    """Load data dari CSV"""
+def load_engine():
+    """Load data (Parquet, dikonversi sekali dari CSV) dan bangun engine.
+
+    Tidak di-cache sendiri: hanya dipanggil `load_refresher`, sehingga
+    refresher satu-satunya pemilik snapshot aktif dan versi lama bisa dilepas
+    setelah swap.
+    """
+    # Forecast dari CSV atau dari model per seri (parameter di-cache ke disk)
+    options = {
+        'forecast_mode': config.env_str(config.FORECAST_MODE_ENV, 'data'),
+        'forecast_cache': config.env_str(config.FORECAST_CACHE_ENV, forecast.CACHE_PATH)
+    }
     try:
-        df = pd.read_csv('bmw_pricing_data.csv')
-        df['Year'] = df['Year'].astype(int)
-        df['Price_USD'] = df['Price_USD'].astype(float)
-        return df
+        shared_dir = config.env_str(config.SHARED_DIR_ENV)
+        if shared_dir:
+            # Mode shared: attach array kolom yang di-publish loader (zero-copy)
+            engine = DashboardEngine.attach_shared(shared_dir, **options)
+        # Mode DuckDB: cube & insight di-query dari Parquet (filter di-push down)
+        elif config.env_str(config.LOAD_MODE_ENV, 'memory') == 'duckdb':
+            engine = DashboardEngine.load_duckdb(
+                threads=config.env_int(config.DUCKDB_THREADS_ENV),
+                **options
+            )
+        # Mode out-of-core: CSV dibaca per chunk, hanya cube yang disimpan
+        elif config.env_str(config.LOAD_MODE_ENV, 'memory') == 'streaming':
+            engine = DashboardEngine.load_streaming(
+                chunk_rows=config.env_int(config.CHUNK_ROWS_ENV, storage.DEFAULT_CHUNK_ROWS),
+                spill_dir=config.env_str(config.SPILL_DIR_ENV),
+                **options
+            )
+        else:
+            engine = DashboardEngine.load(**options)
+
+        # Warm-up: statistik insight semua kombinasi filter dihitung di process pool
+        if config.env_flag(config.WARMUP_ENV):
+            engine.warm_up(config.env_int(config.WARMUP_WORKERS_ENV))
+        return engine
     except FileNotFoundError:
         st.error("❌ File 'bmw_pricing_data.csv' tidak ditemukan!")
         st.stop()
@@ -146,31 +193,47 @@ def load_data():
         st.error(f"❌ Error saat membaca file: {str(e)}")
         st.stop()
 
+@st.cache_resource
+def load_refresher():
+    """Engine aktif + thread refresh background (stale-while-revalidate), sekali per proses"""
+    engine = load_engine()
+
+    def warm_up(fresh):
+        fresh.warm_up(config.env_int(config.WARMUP_WORKERS_ENV))
+
+    return DataRefresher(
+        engine,
+        interval=config.env_int(config.REFRESH_INTERVAL_ENV, DEFAULT_INTERVAL),
+        # Versi data baru juga di-warm-up di background sebelum di-swap
+        prepare=warm_up if config.env_flag(config.WARMUP_ENV) else None
+    ).start()
+
 # ========================================
-# FUNGSI KONVERSI MATA UANG
+# KURS & FORMAT MATA UANG
 # ========================================
-def convert_currency(amount, currency):
-    """Konversi dari USD ke mata uang lain"""
-    rates = {
-        'US Dollar': 1.0,
-        'Euro': 0.92,
-        'Rupiah': 15800.0
-    }
-    return amount * rates[currency]
-
-def format_currency(amount, currency):
-    """Format angka sesuai mata uang"""
-    if currency == 'US Dollar':
-        return f"${amount:,.0f}"
-    elif currency == 'Euro':
-        return f"€{amount:,.0f}"
-    elif currency == 'Rupiah':
-        return f"Rp {amount:,.0f}"
+@st.cache_resource
+def load_currencies():
+    """Tabel kurs (default + file kurs lokal opsional) sekali per proses"""
+    try:
+        return CurrencyTable.load(
+            config.env_str(config.RATES_FILE_ENV),
+            config.env_str(config.RATES_HISTORY_ENV)
+        )
+    except Exception as e:
+        st.error(f"❌ Error saat membaca file kurs: {str(e)}")
+        st.stop()
 
 # ========================================
-# LOAD DATA
+# CACHE FIGURE & MODE RENDER GRAFIK
 # ========================================
-df = load_data()
+@st.cache_resource
+def load_figure_cache():
+    """Cache figure Plotly per data agregat (satu per proses, dipakai semua sesi)"""
+    return ResultCache()
+
+# Ambang titik untuk mode WebGL dan lebar grafik (piksel) untuk downsampling
+webgl_points = config.env_int(config.WEBGL_POINTS_ENV, charts.DEFAULT_WEBGL_POINTS)
+chart_width = config.env_int(config.CHART_WIDTH_ENV, charts.DEFAULT_CHART_WIDTH)
 
 # ========================================
 # HEADER
@@ -186,679 +249,434 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ========================================
-# BARIS 1: KPI METRICS DENGAN PERSENTASE (akan dihitung setelah filter)
+# DASHBOARD (FRAGMENT)
 # ========================================
-# Placeholder - akan diisi setelah filter diterapkan
-kpi_placeholder = st.empty()
+# CSS & header di atas hanya dikirim saat full run (buka/refresh halaman);
+# interaksi widget di dalam fragment hanya menjalankan ulang fragment ini.
+@st.fragment
+def render_dashboard():
+    """Filter, KPI, grafik, insight dan tabel (dijalankan ulang per interaksi)"""
+    # Aktif lewat env BMW_PROFILE=1 atau query param ?profile=1
+    profiling_enabled = (
+        config.env_flag(config.PROFILE_ENV)
+        or st.query_params.get('profile', '').lower() in ('1', 'true', 'yes', 'on')
+    )
+    profiler = RerunProfiler(enabled=profiling_enabled)
+
+    # ========================================
+    # LOAD DATA
+    # ========================================
+    profiler.enter('load')
+    # Snapshot engine untuk rerun ini: data baru di-ingest di background dan
+    # di-swap atomik, sehingga terlihat mulai rerun berikutnya
+    refresher = load_refresher()
+    engine = refresher.current()
+    currencies = load_currencies()
+
+    profiler.enter('render')
+
+    # ========================================
+    # BARIS 1: KPI METRICS DENGAN PERSENTASE (akan dihitung setelah filter)
+    # ========================================
+    # Placeholder - akan diisi setelah filter diterapkan
+    kpi_placeholder = st.empty()
+
+    # ========================================
+    # BARIS 2: FILTERS HORIZONTAL
+    # ========================================
+    # Inisialisasi currency default
+    if 'selected_currency' not in st.session_state:
+        st.session_state.selected_currency = 'USD'
+
+    with st.container(border=True):
+        st.markdown("### 🔍 Filter Data")
+
+        filter_cols = st.columns([2, 2, 2, 3])
+
+        with filter_cols[0]:
+            st.markdown("**Jenis Transmisi**")
+            trans_btn_cols = st.columns(2)
+
+            with trans_btn_cols[0]:
+                auto_selected = st.checkbox("Automatic", value=True, key="auto")
+            with trans_btn_cols[1]:
+                manual_selected = st.checkbox("Manual", value=True, key="manual")
+
+        with filter_cols[1]:
+            st.markdown("**Mata Uang**")
+            currency_codes = currencies.codes()
+            currency_btn_cols = st.columns(len(currency_codes))
+
+            # Satu tombol per mata uang (termasuk tambahan dari file kurs)
+            for col, code in zip(currency_btn_cols, currency_codes):
+                with col:
+                    if st.button(code, key=code.lower(), use_container_width=True):
+                        st.session_state.selected_currency = code
+
+            selected_currency = st.session_state.selected_currency
+
+        with filter_cols[2]:
+            st.markdown("**Tahun**")
+            # Mode rentang: beberapa tahun sekaligus, delta KPI vs rentang setahun sebelumnya
+            use_year_range = st.toggle("Rentang tahun", key="year_range_mode")
+            if use_year_range:
+                year_values = sorted(engine.years())
+                selected_year = 'All'
+                selected_year_range = st.select_slider(
+                    "Rentang tahun",
+                    options=year_values,
+                    value=(year_values[0], year_values[-1]),
+                    key="year_range",
+                    label_visibility="collapsed"
+                )
+            else:
+                year_options = ['All'] + engine.years()
+                selected_year = st.selectbox(
+                    "",
+                    year_options,
+                    index=0,
+                    key="year",
+                    label_visibility="collapsed"
+                )
+                selected_year_range = None
+
+        with filter_cols[3]:
+            st.markdown("**Model**")
+            all_models = engine.models()
+            selected_models = st.multiselect(
+                "",
+                all_models,
+                default=all_models,
+                key="model",
+                label_visibility="collapsed",
+                placeholder="Pilih model..."
+            )
 
-# ========================================
-# BARIS 2: FILTERS HORIZONTAL
-# ========================================
-# Inisialisasi currency default
-if 'selected_currency' not in st.session_state:
-    st.session_state.selected_currency = 'US Dollar'
-
-with st.container(border=True):
-    st.markdown("### 🔍 Filter Data")
-
-    filter_cols = st.columns([2, 2, 2, 3])
-
-    with filter_cols[0]:
-        st.markdown("**Jenis Transmisi**")
-        trans_btn_cols = st.columns(2)
-        
-        with trans_btn_cols[0]:
-            auto_selected = st.checkbox("Automatic", value=True, key="auto")
-        with trans_btn_cols[1]:
-            manual_selected = st.checkbox("Manual", value=True, key="manual")
-
-    with filter_cols[1]:
-        st.markdown("**Mata Uang**")
-        currency_btn_cols = st.columns(3)
-        
-        with currency_btn_cols[0]:
-            usd_selected = st.button("USD", key="usd", use_container_width=True)
-        with currency_btn_cols[1]:
-            eur_selected = st.button("EUR", key="eur", use_container_width=True)
-        with currency_btn_cols[2]:
-            idr_selected = st.button("IDR", key="idr", use_container_width=True)
-        
-        # Update selected currency
-        if usd_selected:
-            st.session_state.selected_currency = 'US Dollar'
-        elif eur_selected:
-            st.session_state.selected_currency = 'Euro'
-        elif idr_selected:
-            st.session_state.selected_currency = 'Rupiah'
-        
-        selected_currency = st.session_state.selected_currency
-
-    with filter_cols[2]:
-        st.markdown("**Tahun**")
-        year_options = ['All'] + sorted(df['Year'].unique().tolist(), reverse=True)
-        selected_year = st.selectbox(
-            "",
-            year_options,
-            index=0,
-            key="year",
-            label_visibility="collapsed"
-        )
+        filter_cols_2 = st.columns(2)
+
+        with filter_cols_2[0]:
+            st.markdown("**Region**")
+            all_regions = engine.regions()
+            selected_regions = st.multiselect(
+                "Region",
+                all_regions,
+                default=all_regions,
+                key="region",
+                label_visibility="collapsed",
+                placeholder="Pilih region..."
+            )
 
-    with filter_cols[3]:
-        st.markdown("**Model**")
-        all_models = sorted(df['Model'].unique().tolist())
-        selected_models = st.multiselect(
-            "",
-            all_models,
-            default=all_models,
-            key="model",
-            label_visibility="collapsed",
-            placeholder="Pilih model..."
-        )
+        with filter_cols_2[1]:
+            st.markdown("**Bahan Bakar**")
+            all_fuel_types = engine.fuel_types()
+            selected_fuel_types = st.multiselect(
+                "Bahan Bakar",
+                all_fuel_types,
+                default=all_fuel_types,
+                key="fuel_type",
+                label_visibility="collapsed",
+                placeholder="Pilih bahan bakar..."
+            )
 
-# ========================================
-# FILTER DATA BERDASARKAN PILIHAN USER
-# ========================================
-# Filter transmisi
-transmission_filter = []
-if auto_selected:
-    transmission_filter.append('Automatic')
-if manual_selected:
-    transmission_filter.append('Manual')
+    # ========================================
+    # FILTER DATA BERDASARKAN PILIHAN USER
+    # ========================================
+    profiler.enter('filter')
+
+    # Filter transmisi
+    transmission_filter = []
+    if auto_selected:
+        transmission_filter.append('Automatic')
+    if manual_selected:
+        transmission_filter.append('Manual')
+
+    # Normalisasi pilihan (transmisi/model/region/bahan bakar kosong = tampilkan semua)
+    filter_state = FilterState.from_selection(
+        transmission_filter, selected_year, selected_models,
+        selected_regions, selected_fuel_types, selected_year_range
+    )
 
-# Jika tidak ada transmisi yang dipilih, tampilkan semua
-if not transmission_filter:
-    transmission_filter = df['Transmission'].unique().tolist()
+    if engine.is_empty(filter_state):
+        st.warning("⚠️ Tidak ada data yang sesuai dengan filter yang dipilih.")
+        st.stop()
 
-# Apply filters
-filtered_df = df[df['Transmission'].isin(transmission_filter)]
+    # Kurs per tahun (as-of, di-cache) untuk mata uang terpilih; None = USD.
+    # Engine mengonversi cube sekali per mata uang, panel memakai hasilnya.
+    year_rates = currencies.year_rates(selected_currency, engine.years())
+    price_col = price_column(year_rates)
+
+    # ========================================
+    # HITUNG KPI METRICS
+    # ========================================
+    profiler.enter('kpi')
+    # Nilai sudah dalam mata uang yang dipilih (setiap tahun dengan kursnya sendiri)
+    kpis = engine.kpis(filter_state, year_rates)
+
+    kpi_cards = views.kpi_metrics(kpis, filter_state, currencies, selected_currency)
+
+    # Tampilkan KPI Cards di placeholder (tanpa container tambahan)
+    profiler.enter('render')
+    with kpi_placeholder.container():
+        for col, card in zip(st.columns(4), kpi_cards):
+            with col:
+                st.metric(label=card['label'], value=card['value'], delta=card['delta'])
+
+    # ========================================
+    # BARIS 3: LINE CHART - RATA-RATA HARGA PER TAHUN
+    # ========================================
+    st.markdown('<div class="section-container">', unsafe_allow_html=True)
+    st.markdown("### 📈 Tren Harga Mobil Per Tahun")
+
+    # Label persentase per titik: selalu untuk 1 model, opsional untuk banyak model
+    if len(selected_models) == 1:
+        show_point_labels = True
+    else:
+        show_point_labels = st.checkbox(
+            "Tampilkan perubahan % di setiap titik", value=False, key="point_labels"
+        )
 
-# Filter tahun (jika bukan "All")
-if selected_year != 'All':
-    filtered_df = filtered_df[filtered_df['Year'] == int(selected_year)]
+    profiler.enter('trend')
+    figure_cache = load_figure_cache()
 
-# Filter model (jika ada yang dipilih)
-if selected_models:
-    filtered_df = filtered_df[filtered_df['Model'].isin(selected_models)]
+    # Rata-rata harga per tahun per model (salin: hasil engine di-cache bersama antar sesi)
+    trend_data = engine.trend(filter_state, year_rates).copy()
 
-if filtered_df.empty:
-    st.warning("⚠️ Tidak ada data yang sesuai dengan filter yang dipilih.")
-    st.stop()
+    # Harga sudah dikonversi per tahun dengan kurs periodenya
+    trend_data = trend_data.rename(columns={price_col: 'Price_Converted'})
 
-# ========================================
-# HITUNG KPI METRICS BERDASARKAN FILTERED DATA
-# ========================================
-# Pisahkan data actual dan forecast dari filtered data
-actual_filtered = filtered_df[filtered_df['Type'] == 'Actual']
-forecast_filtered = filtered_df[filtered_df['Type'] == 'Forecast']
-
-if not actual_filtered.empty:
-    # Jika memilih tahun spesifik, bandingkan dengan tahun sebelumnya
-    if selected_year != 'All':
-        current_year = int(selected_year)
-        prev_year = current_year - 1
-        
-        # Data tahun yang dipilih (sudah terfilter)
-        current_year_data = actual_filtered[actual_filtered['Year'] == current_year]
-        
-        # Data tahun sebelumnya dari dataset asli (dengan filter model & transmisi yang sama)
-        prev_year_base = df[df['Type'] == 'Actual']
-        prev_year_base = prev_year_base[prev_year_base['Year'] == prev_year]
-        
-        # Apply filter transmisi dan model yang sama
-        transmission_filter_list = []
-        if auto_selected:
-            transmission_filter_list.append('Automatic')
-        if manual_selected:
-            transmission_filter_list.append('Manual')
-        if not transmission_filter_list:
-            transmission_filter_list = df['Transmission'].unique().tolist()
-        
-        prev_year_data = prev_year_base[prev_year_base['Transmission'].isin(transmission_filter_list)]
-        if selected_models:
-            prev_year_data = prev_year_data[prev_year_data['Model'].isin(selected_models)]
-    else:
-        # Jika "All", ambil tahun terbaru dan sebelumnya
-        available_years = sorted(actual_filtered['Year'].unique())
-        
-        if len(available_years) >= 2:
-            current_year = available_years[-1]
-            prev_year = available_years[-2]
+    # Figure di-cache per isi data agregat & mata uang (dipakai bersama antar sesi):
+    # filter berbeda dengan hasil agregat sama memakai figure yang sama
+    fig_line = figure_cache.get_or_compute(
+        ('trend', charts.frame_key(trend_data), selected_currency, show_point_labels),
+        lambda: views.trend_figure(trend_data, currencies, selected_currency,
+                                   show_point_labels, webgl_points, chart_width)
+    )
+
+    profiler.enter('render')
+    # Klik titik grafik -> drill-down listing model & tahun itu
+    trend_event = st.plotly_chart(
+        fig_line,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="points",
+        key="trend_chart"
+    )
+    st.markdown('</div>', unsafe_allow_html=True)  # Tutup container grafik
+
+
+    # ========================================
+    # BARIS 4: ANALISIS PASAR & REKOMENDASI INVESTASI
+    # ========================================
+    st.markdown('<div class="section-container">', unsafe_allow_html=True)
+    st.markdown("## 📖 Analisis Pasar & Rekomendasi Investasi")
+    st.markdown("*Insight cerdas berdasarkan analisis data historis dan prediksi masa depan*")
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Analisis data untuk storytelling
+    if kpis['has_actual']:
+        # Analisis semua model sekaligus (grouped, tanpa mask per model)
+        profiler.enter('insights')
+        ranking = engine.insights(filter_state)
+        profiler.enter('render')
+
+        if ranking:
+            # Layout 4 kolom untuk insight cards - format paragraf
+            insight_cols = st.columns(4)
+            for col, card in zip(insight_cols, views.insight_cards(ranking)):
+                with col:
+                    if card is not None:
+                        st.markdown(card, unsafe_allow_html=True)
         else:
-            current_year = available_years[-1] if available_years else actual_filtered['Year'].max()
-            prev_year = current_year - 1
-        
-        current_year_data = actual_filtered[actual_filtered['Year'] == current_year]
-        prev_year_data = actual_filtered[actual_filtered['Year'] == prev_year]
-    
-    # Hitung metrics tahun sekarang
-    min_price = current_year_data['Price_USD'].min() if not current_year_data.empty else 0
-    max_price = current_year_data['Price_USD'].max() if not current_year_data.empty else 0
-    avg_price = current_year_data['Price_USD'].mean() if not current_year_data.empty else 0
-    
-    # Hitung metrics tahun lalu
-    min_price_prev = prev_year_data['Price_USD'].min() if not prev_year_data.empty else min_price
-    max_price_prev = prev_year_data['Price_USD'].max() if not prev_year_data.empty else max_price
-    avg_price_prev = prev_year_data['Price_USD'].mean() if not prev_year_data.empty else avg_price
-    
-    # Hitung persentase perubahan
-    min_pct = ((min_price - min_price_prev) / min_price_prev * 100) if min_price_prev > 0 else 0
-    max_pct = ((max_price - max_price_prev) / max_price_prev * 100) if max_price_prev > 0 else 0
-    avg_pct = ((avg_price - avg_price_prev) / avg_price_prev * 100) if avg_price_prev > 0 else 0
-    
-    # Hitung prediksi harga dari data forecast yang sudah difilter
-    if not forecast_filtered.empty:
-        predicted_price = forecast_filtered['Price_USD'].mean()
-        pred_pct = ((predicted_price - avg_price) / avg_price * 100) if avg_price > 0 else 0
+            st.info("📊 Tidak cukup data untuk analisis mendalam. Pilih lebih banyak model atau tahun.")
     else:
-        predicted_price = avg_price
-        pred_pct = 0
-else:
-    # Fallback jika tidak ada data actual
-    min_price = filtered_df['Price_USD'].min()
-    max_price = filtered_df['Price_USD'].max()
-    avg_price = filtered_df['Price_USD'].mean()
-    predicted_price = avg_price
-    min_pct = max_pct = avg_pct = pred_pct = 0
-
-# Konversi ke mata uang yang dipilih
-min_price_converted = convert_currency(min_price, selected_currency)
-max_price_converted = convert_currency(max_price, selected_currency)
-avg_price_converted = convert_currency(avg_price, selected_currency)
-predicted_price_converted = convert_currency(predicted_price, selected_currency)
-
-# Tentukan apakah persentase ditampilkan (hanya jika memilih tahun spesifik, bukan "All")
-show_delta = (selected_year != 'All')
-
-# Tampilkan KPI Cards di placeholder (tanpa container tambahan)
-with kpi_placeholder.container():
-    kpi_cols = st.columns(4)
-    
-    with kpi_cols[0]:
-        if show_delta:
-            st.metric(
-                label="Harga Minimal",
-                value=format_currency(min_price_converted, selected_currency),
-                delta=f"{min_pct:+.1f}% vs tahun sebelumnya"
-            )
-        else:
-            st.metric(
-                label="Harga Minimal",
-                value=format_currency(min_price_converted, selected_currency)
-            )
-    
-    with kpi_cols[1]:
-        if show_delta:
-            st.metric(
-                label="Harga Maksimal",
-                value=format_currency(max_price_converted, selected_currency),
-                delta=f"{max_pct:+.1f}% vs tahun sebelumnya"
-            )
-        else:
-            st.metric(
-                label="Harga Maksimal",
-                value=format_currency(max_price_converted, selected_currency)
-            )
-    
-    with kpi_cols[2]:
-        if show_delta:
-            st.metric(
-                label="Harga Rata-rata",
-                value=format_currency(avg_price_converted, selected_currency),
-                delta=f"{avg_pct:+.1f}% vs tahun sebelumnya"
-            )
-        else:
-            st.metric(
-                label="Harga Rata-rata",
-                value=format_currency(avg_price_converted, selected_currency)
-            )
-    
-    with kpi_cols[3]:
-        if show_delta:
-            st.metric(
-                label="Prediksi Harga",
-                value=format_currency(predicted_price_converted, selected_currency),
-                delta=f"{pred_pct:+.1f}% vs harga saat ini"
-            )
-        else:
-            st.metric(
-                label="Prediksi Harga",
-                value=format_currency(predicted_price_converted, selected_currency)
-            )
+        st.info("📊 Tidak ada data aktual untuk analisis. Silakan sesuaikan filter.")
 
-# ========================================
-# BARIS 3: LINE CHART - RATA-RATA HARGA PER TAHUN
-# ========================================
-st.markdown('<div class="section-container">', unsafe_allow_html=True)
-st.markdown("### 📈 Tren Harga Mobil Per Tahun")
+    st.markdown('</div>', unsafe_allow_html=True)  # Tutup container analisis
 
-# Hitung rata-rata harga per tahun per model
-trend_data = filtered_df.groupby(['Year', 'Model'])['Price_USD'].mean().reset_index()
+    # ========================================
+    # BARIS 5: BAR CHART & TABLE
+    # ========================================
+    st.markdown('<div class="section-container">', unsafe_allow_html=True)
+    st.markdown("### 📊 Perbandingan Harga Per Model")
 
-# Konversi ke mata uang yang dipilih
-trend_data['Price_Converted'] = trend_data['Price_USD'].apply(
-    lambda x: convert_currency(x, selected_currency)
-)
+    chart_col, table_col = st.columns([1, 1])
 
-# Hitung persentase perubahan untuk setiap model
-trend_data = trend_data.sort_values(['Model', 'Year'])
-trend_data['Pct_Change'] = trend_data.groupby('Model')['Price_Converted'].pct_change() * 100
-trend_data['Pct_Change'] = trend_data['Pct_Change'].fillna(0)  # Tahun pertama = 0%
-
-# Tambahkan kolom warna untuk persentase
-def get_pct_color(pct):
-    if pct > 0:
-        return '#22c55e'  # Hijau untuk naik
-    elif pct < 0:
-        return '#ef4444'  # Merah untuk turun
-    else:
-        return '#6b7280'  # Abu-abu untuk 0%
-
-trend_data['Pct_Color'] = trend_data['Pct_Change'].apply(get_pct_color)
-
-# Format persentase dengan warna
-def format_pct_with_color(row):
-    pct = row['Pct_Change']
-    color = row['Pct_Color']
-    return f'<span style="color: {color}; font-weight: bold;">{pct:+.1f}%</span>'
-
-trend_data['Pct_Formatted'] = trend_data.apply(format_pct_with_color, axis=1)
-
-# Buat line chart dengan warna BMW blue
-# Palet warna BMW: biru, abu-abu gelap, putih
-bmw_colors = ['#1C69D4', '#0E4C92', '#00A1E4', '#6C757D', '#2C5F9E', '#4A90E2']
-
-fig_line = px.line(
-    trend_data,
-    x='Year',
-    y='Price_Converted',
-    color='Model',
-    markers=True,
-    labels={'Price_Converted': 'Harga Rata-rata', 'Year': 'Tahun'},
-    template='plotly_white',
-    color_discrete_sequence=bmw_colors,  # Warna BMW
-    custom_data=['Pct_Formatted']  # Tambahkan persentase terformat ke custom data
-)
+    with chart_col:
+        st.markdown("**Rata Rata Harga Per Model**")
 
-# Update traces dengan garis tajam (linear) dan custom hover template
-fig_line.update_traces(
-    line=dict(width=3),  # Garis lurus dengan lebar 3
-    marker=dict(size=8),
-    fill='tonexty',  # Fill area di bawah garis
-    fillcolor='rgba(28, 105, 212, 0.1)',  # Warna biru BMW dengan transparansi
-    hovertemplate='<b>%{fullData.name}</b><br>' +
-                  'Harga: ' + format_currency(1, selected_currency).replace('1', '%{y:,.0f}') + '<br>' +
-                  'Perubahan: %{customdata[0]}' +
-                  '<extra></extra>'
-)
+        # Rata-rata harga per model (urut naik)
+        profiler.enter('bar')
+        model_avg = engine.model_averages(filter_state, year_rates)
 
-# Set fill untuk trace pertama ke 'tozeroy'
-fig_line.data[0].fill = 'tozeroy'
-fig_line.data[0].fillcolor = 'rgba(28, 105, 212, 0.1)'
+        # Harga sudah dalam mata uang yang dipilih
+        model_avg = model_avg.rename(columns={price_col: 'Price_Converted'})
 
-# Jika hanya 1 model dipilih, tambahkan persentase di setiap titik (tanpa kotak dan arrow)
-if len(selected_models) == 1:
-    model_trend = trend_data[trend_data['Model'] == selected_models[0]].sort_values('Year')
-    
-    # Hitung persentase perubahan
-    annotations = []
-    for i in range(1, len(model_trend)):
-        prev_price = model_trend.iloc[i-1]['Price_Converted']
-        curr_price = model_trend.iloc[i]['Price_Converted']
-        pct_change = ((curr_price - prev_price) / prev_price * 100) if prev_price > 0 else 0
-        
-        # Warna berdasarkan naik/turun
-        color = '#22c55e' if pct_change > 0 else '#ef4444' if pct_change < 0 else '#6b7280'
-        
-        # Annotation tanpa kotak dan arrow - hanya text
-        annotations.append(
-            dict(
-                x=model_trend.iloc[i]['Year'],
-                y=curr_price,
-                text=f"{pct_change:+.1f}%",
-                showarrow=False,  # Hapus arrow
-                font=dict(size=12, color=color, family="Arial Black"),
-                yshift=15,  # Geser ke atas sedikit
-                xanchor='center'
-            )
+        # Bar chart horizontal (di-cache per isi data & mata uang)
+        fig_bar = figure_cache.get_or_compute(
+            ('bar', charts.frame_key(model_avg), selected_currency),
+            lambda: views.bar_figure(model_avg, currencies, selected_currency)
         )
-    
-    fig_line.update_layout(annotations=annotations)
-
-# Hitung range Y-axis yang optimal untuk menampilkan variasi data
-y_min = trend_data['Price_Converted'].min()
-y_max = trend_data['Price_Converted'].max()
-y_range = y_max - y_min
-# Tambahkan padding 10% di atas dan bawah agar grafik tidak terlalu mepet
-y_padding = y_range * 0.1
-y_axis_min = max(0, y_min - y_padding)  # Minimal 0
-y_axis_max = y_max + y_padding
-
-fig_line.update_layout(
-    hovermode='x unified',  # Kembali ke 'x unified' agar semua model muncul sekaligus
-    height=400,
-    font=dict(size=12),
-    legend=dict(
-        orientation="h",
-        yanchor="top",
-        y=-0.15,
-        xanchor="center",
-        x=0.5
-    ),
-    margin=dict(l=50, r=50, t=30, b=80),
-    showlegend=True,
-    plot_bgcolor='rgba(0,0,0,0)',  # Background transparan
-    paper_bgcolor='rgba(0,0,0,0)',
-    yaxis=dict(
-        range=[y_axis_min, y_axis_max],  # Set range Y-axis agar zoom in
-        gridcolor='rgba(200, 200, 200, 0.2)'  # Grid lebih subtle
-    ),
-    xaxis=dict(
-        gridcolor='rgba(200, 200, 200, 0.2)'
-    )
-)
-
-st.plotly_chart(fig_line, use_container_width=True)
-st.markdown('</div>', unsafe_allow_html=True)  # Tutup container grafik
 
+        profiler.enter('render')
+        st.plotly_chart(fig_bar, use_container_width=True)
 
-# ========================================
-# BARIS 4: ANALISIS PASAR & REKOMENDASI INVESTASI
-# ========================================
-st.markdown('<div class="section-container">', unsafe_allow_html=True)
-st.markdown("## 📖 Analisis Pasar & Rekomendasi Investasi")
-st.markdown("*Insight cerdas berdasarkan analisis data historis dan prediksi masa depan*")
-st.markdown("<br>", unsafe_allow_html=True)
-
-# Analisis data untuk storytelling
-actual_data = filtered_df[filtered_df['Type'] == 'Actual']
-forecast_data = filtered_df[filtered_df['Type'] == 'Forecast']
-
-if not actual_data.empty:
-    # Analisis per model
-    model_analysis = []
-    for model in filtered_df['Model'].unique():
-        model_data = actual_data[actual_data['Model'] == model]
-        model_forecast = forecast_data[forecast_data['Model'] == model]
-        
-        if len(model_data) >= 2:
-            # Hitung tren (bandingkan 3 tahun terakhir vs 3 tahun sebelumnya)
-            sorted_data = model_data.sort_values('Year')
-            recent_years = sorted_data.tail(3)['Price_USD'].mean()
-            older_years = sorted_data.head(max(3, len(sorted_data)-3))['Price_USD'].mean()
-            
-            trend_pct = ((recent_years - older_years) / older_years * 100) if older_years > 0 else 0
-            
-            # Prediksi masa depan
-            if not model_forecast.empty:
-                future_price = model_forecast['Price_USD'].mean()
-                current_price = recent_years
-                future_trend_pct = ((future_price - current_price) / current_price * 100) if current_price > 0 else 0
-            else:
-                future_trend_pct = 0
-            
-            # Volatilitas (standar deviasi)
-            volatility = model_data['Price_USD'].std()
-            
-            model_analysis.append({
-                'model': model,
-                'current_avg': recent_years,
-                'trend_pct': trend_pct,
-                'future_trend_pct': future_trend_pct,
-                'volatility': volatility
-            })
-    
-    if model_analysis:
-        # Urutkan berdasarkan tren terbaik
-        model_analysis.sort(key=lambda x: x['trend_pct'], reverse=True)
-        best_model = model_analysis[0]
-        worst_model = model_analysis[-1]
-        
-        # Cari model dengan future trend terbaik
-        model_analysis_future = sorted(model_analysis, key=lambda x: x['future_trend_pct'], reverse=True)
-        best_future_model = model_analysis_future[0]
-        
-        # Cari model paling stabil (volatilitas terendah)
-        model_analysis_stable = sorted(model_analysis, key=lambda x: x['volatility'])
-        most_stable_model = model_analysis_stable[0]
-        
-        # Layout 4 kolom untuk insight cards - format paragraf
-        insight_cols = st.columns(4)
-        
-        # Card 1: Model Terbaik
-        with insight_cols[0]:
-            if best_model['trend_pct'] > 5:
-                st.markdown(f"""
-                <div style='background: linear-gradient(135deg, #dcfce7 0%, #bbf7d0 100%); 
-                            padding: 20px; border-radius: 12px; 
-                            box-shadow: 0 2px 6px rgba(0,0,0,0.08);
-                            border-top: 4px solid #22c55e; height: 200px;'>
-                    <p style='color: #15803d; margin: 0 0 12px 0; font-size: 14px; font-weight: 600; text-align: center;'>
-                        📈 Model Terbaik
-                    </p>
-                    <p style='color: #166534; margin: 0; font-size: 14px; line-height: 1.7; text-align: justify;'>
-                        <strong style='font-size: 18px; display: block; text-align: center; margin-bottom: 8px;'>{best_model['model']}</strong>
-                        menunjukkan performa luar biasa dengan kenaikan <strong>{best_model['trend_pct']:.1f}%</strong> dalam beberapa tahun terakhir. 
-                        Sangat cocok untuk investasi jangka panjang dengan potensi keuntungan yang menjanjikan.
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            elif best_model['trend_pct'] > 0:
-                st.markdown(f"""
-                <div style='background: linear-gradient(135deg, #dbeafe 0%, #bfdbfe 100%); 
-                            padding: 20px; border-radius: 12px; 
-                            box-shadow: 0 2px 6px rgba(0,0,0,0.08);
-                            border-top: 4px solid #3b82f6; height: 200px;'>
-                    <p style='color: #1e40af; margin: 0 0 12px 0; font-size: 14px; font-weight: 600; text-align: center;'>
-                        📊 Model Stabil
-                    </p>
-                    <p style='color: #1e3a8a; margin: 0; font-size: 14px; line-height: 1.7; text-align: justify;'>
-                        <strong style='font-size: 18px; display: block; text-align: center; margin-bottom: 8px;'>{best_model['model']}</strong>
-                        menunjukkan pertumbuhan stabil dengan kenaikan <strong>{best_model['trend_pct']:.1f}%</strong>. 
-                        Pilihan yang aman dengan risiko rendah untuk investor yang mengutamakan stabilitas.
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        # Card 2: Prediksi Masa Depan
-        with insight_cols[1]:
-            if best_future_model['future_trend_pct'] > 3:
-                st.markdown(f"""
-                <div style='background: linear-gradient(135deg, #e0e7ff 0%, #c7d2fe 100%); 
-                            padding: 20px; border-radius: 12px; 
-                            box-shadow: 0 2px 6px rgba(0,0,0,0.08);
-                            border-top: 4px solid #6366f1; height: 200px;'>
-                    <p style='color: #3730a3; margin: 0 0 12px 0; font-size: 14px; font-weight: 600; text-align: center;'>
-                        🔮 Prediksi Terbaik
-                    </p>
-                    <p style='color: #312e81; margin: 0; font-size: 14px; line-height: 1.7; text-align: justify;'>
-                        <strong style='font-size: 18px; display: block; text-align: center; margin-bottom: 8px;'>{best_future_model['model']}</strong>
-                        diprediksi mengalami kenaikan harga sebesar <strong>+{best_future_model['future_trend_pct']:.1f}%</strong> di masa depan. 
-                        Ini adalah waktu yang tepat untuk membeli dengan potensi keuntungan tinggi.
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            elif best_future_model['future_trend_pct'] < -3:
-                st.markdown(f"""
-                <div style='background: linear-gradient(135deg, #fee2e2 0%, #fecaca 100%); 
-                            padding: 20px; border-radius: 12px; 
-                            box-shadow: 0 2px 6px rgba(0,0,0,0.08);
-                            border-top: 4px solid #ef4444; height: 200px;'>
-                    <p style='color: #991b1b; margin: 0 0 12px 0; font-size: 14px; font-weight: 600; text-align: center;'>
-                        ⚠️ Perhatian
-                    </p>
-                    <p style='color: #7f1d1d; margin: 0; font-size: 14px; line-height: 1.7; text-align: justify;'>
-                        <strong style='font-size: 18px; display: block; text-align: center; margin-bottom: 8px;'>{best_future_model['model']}</strong>
-                        diprediksi mengalami penurunan harga sekitar <strong>{best_future_model['future_trend_pct']:.1f}%</strong>. 
-                        Pertimbangkan untuk menjual sekarang sebelum harga turun lebih jauh.
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div style='background: linear-gradient(135deg, #e0e7ff 0%, #c7d2fe 100%); 
-                            padding: 20px; border-radius: 12px; 
-                            box-shadow: 0 2px 6px rgba(0,0,0,0.08);
-                            border-top: 4px solid #6366f1; height: 200px;'>
-                    <p style='color: #3730a3; margin: 0 0 12px 0; font-size: 14px; font-weight: 600; text-align: center;'>
-                        📊 Stabilitas Harga
-                    </p>
-                    <p style='color: #312e81; margin: 0; font-size: 14px; line-height: 1.7; text-align: justify;'>
-                        <strong style='font-size: 18px; display: block; text-align: center; margin-bottom: 8px;'>{best_future_model['model']}</strong>
-                        diprediksi akan mempertahankan harga yang relatif stabil dengan perubahan <strong>{best_future_model['future_trend_pct']:+.1f}%</strong>. 
-                        Cocok untuk strategi HOLD tanpa urgensi untuk membeli atau menjual.
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        # Card 3: Model Paling Stabil
-        with insight_cols[2]:
-            st.markdown(f"""
-            <div style='background: linear-gradient(135deg, #fef3c7 0%, #fde68a 100%); 
-                        padding: 20px; border-radius: 12px; 
-                        box-shadow: 0 2px 6px rgba(0,0,0,0.08);
-                        border-top: 4px solid #f59e0b; height: 200px;'>
-                <p style='color: #92400e; margin: 0 0 12px 0; font-size: 14px; font-weight: 600; text-align: center;'>
-                    🛡️ Paling Stabil
-                </p>
-                <p style='color: #78350f; margin: 0; font-size: 14px; line-height: 1.7; text-align: justify;'>
-                    <strong style='font-size: 18px; display: block; text-align: center; margin-bottom: 8px;'>{most_stable_model['model']}</strong>
-                    memiliki volatilitas harga terendah, artinya harga lebih konsisten dan dapat diprediksi. 
-                    Ideal untuk investor yang menghindari fluktuasi harga yang ekstrem.
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Card 4: Perbandingan Performa
-        with insight_cols[3]:
-            if len(model_analysis) > 1:
-                st.markdown(f"""
-                <div style='background: linear-gradient(135deg, #fce7f3 0%, #fbcfe8 100%); 
-                            padding: 20px; border-radius: 12px; 
-                            box-shadow: 0 2px 6px rgba(0,0,0,0.08);
-                            border-top: 4px solid #ec4899; height: 200px;'>
-                    <p style='color: #831843; margin: 0 0 12px 0; font-size: 14px; font-weight: 600; text-align: center;'>
-                        ⚖️ Perbandingan
-                    </p>
-                    <p style='color: #831843; margin: 0; font-size: 14px; line-height: 1.7; text-align: justify;'>
-                        Model terbaik <strong>{best_model['model']}</strong> tumbuh <strong style='color: #15803d;'>{best_model['trend_pct']:+.1f}%</strong>, 
-                        sementara <strong>{worst_model['model']}</strong> hanya <strong style='color: #991b1b;'>{worst_model['trend_pct']:+.1f}%</strong>. 
-                        Perbedaan performa yang signifikan menunjukkan pentingnya pemilihan model yang tepat.
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-    else:
-        st.info("📊 Tidak cukup data untuk analisis mendalam. Pilih lebih banyak model atau tahun.")
-else:
-    st.info("📊 Tidak ada data aktual untuk analisis. Silakan sesuaikan filter.")
-
-st.markdown('</div>', unsafe_allow_html=True)  # Tutup container analisis
+    with table_col:
+        st.markdown("**Model**")
 
-# ========================================
-# BARIS 5: BAR CHART & TABLE
-# ========================================
-st.markdown('<div class="section-container">', unsafe_allow_html=True)
-st.markdown("### 📊 Perbandingan Harga Per Model")
+        # Rata-rata, prediksi dan Total per model dalam satu agregasi
+        profiler.enter('table')
+        model_prices = engine.model_table(filter_state, year_rates)
 
-chart_col, table_col = st.columns([1, 1])
+        # Konversi & format mata uang per kolom (bukan per baris)
+        table_df = pd.DataFrame({
+            'Model': model_prices['Model'],
+            'Harga Rata-rata': currencies.format_column(model_prices['avg'], selected_currency),
+            'Prediksi Harga': currencies.format_column(model_prices['pred'], selected_currency)
+        })
 
-with chart_col:
-    st.markdown("**Rata Rata Harga Per Model**")
-    
-    # Hitung rata-rata harga per model
-    model_avg = filtered_df.groupby('Model')['Price_USD'].mean().reset_index()
-    model_avg = model_avg.sort_values('Price_USD', ascending=True)
-    
-    # Konversi ke mata uang yang dipilih
-    model_avg['Price_Converted'] = model_avg['Price_USD'].apply(
-        lambda x: convert_currency(x, selected_currency)
-    )
-    
-    # Buat bar chart horizontal
-    fig_bar = px.bar(
-        model_avg,
-        y='Model',
-        x='Price_Converted',
-        orientation='h',
-        labels={'Price_Converted': 'Harga Rata-rata', 'Model': 'Model'},
-        template='plotly_white',
-        color_discrete_sequence=['#3b82f6']
-    )
-    
-    fig_bar.update_layout(
-        height=400,
-        font=dict(size=11),
-        margin=dict(l=50, r=50, t=30, b=50),
-        showlegend=False
-    )
-    
-    st.plotly_chart(fig_bar, use_container_width=True)
+        # Styling untuk tabel
+        profiler.enter('render')
+        # Pilih baris -> drill-down listing model itu
+        table_event = st.dataframe(
+            table_df,
+            use_container_width=True,
+            height=400,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key="model_table"
+        )
 
-with table_col:
-    st.markdown("**Model**")
-    
-    # Buat tabel dengan rata-rata dan prediksi per model
-    table_data = []
-    
-    for model in sorted(filtered_df['Model'].unique()):
-        model_data = filtered_df[filtered_df['Model'] == model]
-        
-        # Harga rata-rata
-        avg = model_data['Price_USD'].mean()
-        
-        # Prediksi harga (dari data forecast)
-        forecast = model_data[model_data['Type'] == 'Forecast']
-        if not forecast.empty:
-            pred = forecast['Price_USD'].mean()
-        else:
-            pred = avg
-        
-        # Konversi ke mata uang yang dipilih
-        avg_converted = convert_currency(avg, selected_currency)
-        pred_converted = convert_currency(pred, selected_currency)
-        
-        table_data.append({
-            'Model': model,
-            'Harga Rata-rata': format_currency(avg_converted, selected_currency),
-            'Prediksi Harga': format_currency(pred_converted, selected_currency)
+    st.markdown('</div>', unsafe_allow_html=True)  # Tutup container bar chart & table
+
+    # ========================================
+    # BARIS 6: DRILL-DOWN LISTING (HALAMAN DARI SERVER)
+    # ========================================
+    # Target drill-down: titik grafik tren (model + tahun) atau baris tabel model
+    drill_state = None
+    trend_points = [
+        point for point in trend_event['selection']['points']
+        if fig_line.data[point['curve_number']].name  # lewati trace label persentase
+    ]
+    if trend_points:
+        point = trend_points[0]
+        drill_model = fig_line.data[point['curve_number']].name
+        drill_state = filter_state.drill(model=drill_model, year=int(point['x']))
+        drill_title = f"{drill_model} ({int(point['x'])})"
+    elif table_event['selection']['rows']:
+        drill_model = table_df['Model'].iloc[table_event['selection']['rows'][0]]
+        # Baris Total = semua model pada filter saat ini
+        drill_state = filter_state.drill(model=None if drill_model == 'Total' else drill_model)
+        drill_title = "Semua model" if drill_model == 'Total' else drill_model
+
+    if drill_state is not None:
+        st.markdown('<div class="section-container">', unsafe_allow_html=True)
+        st.markdown(f"### 🔎 Detail Listing: {drill_title}")
+
+        drill_sort_options = {
+            'Urutan data': None,
+            'Harga (USD)': 'Price_USD',
+            'Tahun': 'Year',
+            'Transmisi': 'Transmission',
+            'Region': 'Region',
+            'Bahan Bakar': 'Fuel_Type',
+            'Tipe': 'Type',
+        }
+        drill_cols = st.columns([2, 1, 1, 1])
+        with drill_cols[0]:
+            drill_sort = st.selectbox("Urutkan", list(drill_sort_options), key="drill_sort")
+        with drill_cols[1]:
+            drill_desc = st.toggle("Menurun", key="drill_desc")
+        with drill_cols[2]:
+            drill_page_size = st.selectbox("Baris/halaman", [25, 50, 100], index=1, key="drill_page_size")
+
+        # Hanya satu halaman yang diambil & dikirim ke browser
+        profiler.enter('drilldown')
+        drill_total = engine.row_total(drill_state)
+        drill_pages = max(1, -(-drill_total // drill_page_size))
+        with drill_cols[3]:
+            # Tanpa key: halaman kembali ke 1 saat target/jumlah halaman berubah
+            drill_page = st.number_input("Halaman", min_value=1, max_value=drill_pages, value=1, step=1)
+
+        page_rows, drill_total = engine.row_page(
+            drill_state,
+            offset=(drill_page - 1) * drill_page_size,
+            limit=drill_page_size,
+            sort_by=drill_sort_options[drill_sort],
+            descending=drill_desc
+        )
+        # Konversi mata uang hanya untuk baris di halaman ini (kurs per tahun)
+        page_prices = currencies.convert(
+            page_rows['Price_USD'].to_numpy(), selected_currency, page_rows['Year'].to_numpy()
+        )
+        page_df = pd.DataFrame({
+            'Tahun': page_rows['Year'],
+            'Model': page_rows['Model'],
+            'Transmisi': page_rows['Transmission'],
+            'Region': page_rows['Region'],
+            'Bahan Bakar': page_rows['Fuel_Type'],
+            'Tipe': page_rows['Type'],
+            'Harga': currencies.format_column(page_prices, selected_currency),
         })
-    
-    # Tampilkan sebagai dataframe
-    table_df = pd.DataFrame(table_data)
-    
-    # Tambahkan row "Total" di akhir
-    total_avg = convert_currency(filtered_df['Price_USD'].mean(), selected_currency)
-    total_pred = convert_currency(
-        filtered_df[filtered_df['Type'] == 'Forecast']['Price_USD'].mean() 
-        if not filtered_df[filtered_df['Type'] == 'Forecast'].empty 
-        else filtered_df['Price_USD'].mean(),
-        selected_currency
-    )
-    
-    total_row = pd.DataFrame([{
-        'Model': 'Total',
-        'Harga Rata-rata': format_currency(total_avg, selected_currency),
-        'Prediksi Harga': format_currency(total_pred, selected_currency)
-    }])
-    
-    table_df = pd.concat([table_df, total_row], ignore_index=True)
-    
-    # Styling untuk tabel
-    st.dataframe(
-        table_df,
-        use_container_width=True,
-        height=400,
-        hide_index=True
+
+        profiler.enter('render')
+        st.dataframe(page_df, use_container_width=True, hide_index=True)
+        st.caption(
+            f"{drill_total:,} listing · halaman {drill_page} dari {drill_pages} "
+            f"· {drill_page_size} baris per halaman"
+        )
+        st.markdown('</div>', unsafe_allow_html=True)  # Tutup container drill-down
+
+    # ========================================
+    # FOOTER
+    # ========================================
+    # Versi data yang dipakai rerun ini & info refresh background terakhir
+    data_info = (
+        f"🔄 Versi data {engine.version} · {engine.row_count():,} listing · "
+        f"diperbarui {time.strftime('%d-%m-%Y %H:%M:%S', time.localtime(refresher.refreshed_at))}"
     )
+    if refresher.duration is not None:
+        data_info += f" (refresh {refresher.duration:.2f} detik)"
+    if refresher.error:
+        data_info += f" · ⚠️ refresh gagal: {refresher.error}"
+
+    st.markdown(f"""
+        <div style='text-align: center; color: #666; padding: 30px 20px; margin-top: 20px;'>
+            <p>📊 Dashboard BMW Price Analysis | Dibuat dengan Streamlit & Plotly</p>
+            <p>🎓 Proyek Sains Data - Teknik Informatika Semester 7</p>
+            <p style='font-size: 12px;'>{data_info}</p>
+        </div>
+    """, unsafe_allow_html=True)
+
+    # ========================================
+    # PANEL DEBUG PROFILING
+    # ========================================
+    if profiler.enabled:
+        profiler.stop()
+        profile_store = load_profile_store()
+        profile_store.record(profiler.timings, rows=engine.row_count())
+        profile_summary = profile_store.summary()
+
+        with st.expander(f"⏱️ Profiling rerun ({profiler.total() * 1000:,.1f} ms)", expanded=False):
+            st.dataframe(
+                pd.DataFrame([
+                    {
+                        'Section': name,
+                        'Rerun ini (ms)': profiler.timings.get(name, 0.0) * 1000,
+                        'p50 (ms)': stats['p50'] * 1000,
+                        'p95 (ms)': stats['p95'] * 1000,
+                        'Sampel': stats['count']
+                    }
+                    for name, stats in profile_summary.items()
+                ]).round(2),
+                use_container_width=True,
+                hide_index=True
+            )
+            cache_stats = engine.cache_stats()
+            st.caption(
+                f"Cache panel engine: {cache_stats['hits']} hit / {cache_stats['misses']} miss "
+                f"(hit rate {cache_stats['hit_rate']:.0%}, {cache_stats['size']}/{cache_stats['maxsize']} entri)"
+            )
 
-st.markdown('</div>', unsafe_allow_html=True)  # Tutup container bar chart & table
 
-# ========================================
-# FOOTER
-# ========================================
-st.markdown("""
-    <div style='text-align: center; color: #666; padding: 30px 20px; margin-top: 20px;'>
-        <p>📊 Dashboard BMW Price Analysis | Dibuat dengan Streamlit & Plotly</p>
-        <p>🎓 Proyek Sains Data - Teknik Informatika Semester 7</p>
-    </div>
-""", unsafe_allow_html=True)
+render_dashboard()
@@ -0,0 +1 @@
+"""Lapisan data & analitik untuk Dashboard Pasar BMW."""
@@ -0,0 +1,288 @@
+"""Benchmark hot path dashboard dengan data sintetis.
+
+Generator membuat CSV dengan schema `bmw_pricing_data.csv` pada ukuran
+berapa pun (default 10k, 1M, 10M, 50M baris) dengan kardinalitas
+Year/Region/Model/Type yang realistis, lalu mengukur waktu load, filter,
+KPI, tren, insight dan tabel model secara terpisah beserta memori puncak.
+Setiap ukuran dijalankan di subprocess baru, sehingga RSS puncak per ukuran
+tidak tercampur ukuran sebelumnya; puncak alokasi per fase diukur dengan
+tracemalloc pada satu run tambahan di luar run yang diukur waktunya.
+Hasil ditulis sebagai JSON agar bisa dibandingkan antar run.
+
+Pemakaian:
+    python -m bmw_dashboard.benchmark --sizes 10k 1m --output bench.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from bmw_dashboard import storage
+from bmw_dashboard.engine import DashboardEngine, FilterState
+
+SIZES = {
+    '10k': 10_000,
+    '1m': 1_000_000,
+    '10m': 10_000_000,
+    '50m': 50_000_000,
+}
+
+# Kardinalitas mengikuti dataset asli
+YEARS = list(range(2010, 2028))
+LAST_ACTUAL_YEAR = 2024
+REGIONS = ['Africa', 'Asia', 'Europe', 'Middle East', 'North America', 'South America']
+FUEL_TYPES = ['Diesel', 'Electric', 'Hybrid', 'Petrol']
+TRANSMISSIONS = ['Automatic', 'Manual']
+MODELS = ['3 Series', '5 Series', '7 Series', 'M3', 'M5', 'X1', 'X3', 'X5', 'X6', 'i3', 'i8']
+
+GENERATE_CHUNK_ROWS = 1_000_000
+
+
+# ========================================
+# GENERATOR DATA SINTETIS
+# ========================================
+def model_names(n_models=None):
+    """Nama model; jika lebih dari 11, tambahkan varian (mis. "X5 v2")"""
+    if not n_models or n_models <= len(MODELS):
+        return MODELS[:n_models] if n_models else list(MODELS)
+    return [
+        MODELS[i % len(MODELS)] + ('' if i < len(MODELS) else f" v{i // len(MODELS) + 1}")
+        for i in range(n_models)
+    ]
+
+
+def generate_chunks(n_rows, n_models=None, seed=0, chunk_rows=GENERATE_CHUNK_ROWS):
+    """Iterasi frame sintetis (kolom sesuai CSV) sampai total n_rows baris"""
+    rng = np.random.default_rng(seed)
+    models = model_names(n_models)
+
+    # Profil harga per model: harga dasar & tren tahunan
+    base_price = rng.uniform(60_000, 90_000, len(models))
+    yearly_trend = rng.normal(0.0, 0.01, len(models))
+
+    remaining = n_rows
+    while remaining > 0:
+        size = min(chunk_rows, remaining)
+        remaining -= size
+
+        year_idx = rng.integers(0, len(YEARS), size)
+        model_idx = rng.integers(0, len(models), size)
+        years = np.asarray(YEARS, dtype=np.int16)[year_idx]
+
+        # Tahun setelah data aktual = forecast; tahun transisi campuran
+        forecast = years > LAST_ACTUAL_YEAR
+        forecast |= (years == LAST_ACTUAL_YEAR) & (rng.random(size) < 0.5)
+
+        drift = 1 + yearly_trend[model_idx] * (years - YEARS[0])
+        price = base_price[model_idx] * drift + rng.normal(0, 11_000, size)
+        price = np.clip(np.round(price), 2_000, None).astype(np.float32)
+
+        yield pd.DataFrame({
+            'Year': years,
+            'Region': pd.Categorical.from_codes(rng.integers(0, len(REGIONS), size), REGIONS),
+            'Fuel_Type': pd.Categorical.from_codes(rng.integers(0, len(FUEL_TYPES), size), FUEL_TYPES),
+            'Transmission': pd.Categorical.from_codes(
+                rng.integers(0, len(TRANSMISSIONS), size), TRANSMISSIONS
+            ),
+            'Model': pd.Categorical.from_codes(model_idx, models),
+            'Price_USD': price,
+            'Type': pd.Categorical.from_codes(forecast.astype(np.int8), ['Actual', 'Forecast']),
+        })
+
+
+def write_synthetic_csv(path, n_rows, n_models=None, seed=0):
+    """Tulis CSV sintetis ke `path` per chunk"""
+    with open(path, 'w', newline='') as f:
+        for i, chunk in enumerate(generate_chunks(n_rows, n_models, seed)):
+            chunk.to_csv(f, index=False, header=(i == 0), float_format='%.0f')
+    return path
+
+
+# ========================================
+# PENGUKURAN
+# ========================================
+def peak_rss_mb():
+    """Memori puncak (high-water mark) proses sejauh ini, dalam MB.
+
+    Nilai ini monoton sepanjang umur proses: hanya bermakna per ukuran karena
+    `run` menjalankan setiap ukuran di subprocess sendiri.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _time(fn, repeat):
+    """Jalankan fn sebanyak `repeat` kali; kembalikan daftar durasi (detik)"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def traced_peak_mb(fn):
+    """Puncak memori yang dialokasikan selama satu panggilan fn (tracemalloc), dalam MB.
+
+    Mencakup alokasi Python & numpy; buffer yang dialokasikan langsung oleh
+    pyarrow tidak terlacak.
+    """
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def _phase(fn, repeat):
+    """Ukur satu fase: durasi `repeat` run + puncak alokasi satu run terpisah"""
+    durations = _time(fn, repeat)
+    return {
+        'median_s': statistics.median(durations),
+        'min_s': min(durations),
+        'runs_s': durations,
+        # Run terpisah: overhead tracemalloc tidak ikut ke durasi
+        'peak_alloc_mb': traced_peak_mb(fn),
+    }
+
+
+def benchmark_states(engine):
+    """Kombinasi filter yang paling sering dibuka user"""
+    years = engine.years()
+    models = engine.models()
+    return {
+        'all': FilterState.from_selection(),
+        'latest_year': FilterState.from_selection(year=years[0]),
+        'automatic': FilterState.from_selection(transmissions=['Automatic']),
+        'single_model': FilterState.from_selection(models=models[:1]),
+    }
+
+
+def run_size(n_rows, workdir, repeat=3, n_models=None, mode='memory', seed=0):
+    """Benchmark satu ukuran dataset; kembalikan dict hasil"""
+    csv_path = os.path.join(workdir, f"synthetic_{n_rows}.csv")
+    parquet_path = os.path.join(workdir, f"synthetic_{n_rows}.parquet")
+
+    start = time.perf_counter()
+    write_synthetic_csv(csv_path, n_rows, n_models, seed)
+    result = {
+        'rows': n_rows,
+        'mode': mode,
+        'generate_s': time.perf_counter() - start,
+        'csv_mb': os.path.getsize(csv_path) / (1024 * 1024),
+        'phases': {},
+    }
+    phases = result['phases']
+
+    if mode == 'streaming':
+        loader = lambda: DashboardEngine.load_streaming(csv_path, cache_size=0)  # noqa: E731
+    else:
+        phases['convert'] = _phase(
+            lambda: storage.convert_csv_to_parquet(csv_path, parquet_path), 1
+        )
+        loader = lambda: DashboardEngine.load(csv_path, parquet_path, cache_size=0)  # noqa: E731
+
+    # Cache hasil dimatikan (cache_size=0) agar setiap panel benar-benar dihitung.
+    # Engine sebelumnya dilepas dulu: hanya satu engine hidup pada satu waktu
+    loaded = [None]
+
+    def load():
+        loaded[0] = None
+        loaded[0] = loader()
+
+    phases['load'] = _phase(load, repeat)
+    engine = loaded[0]
+
+    states = benchmark_states(engine)
+    panels = {
+        'filter': engine.filter,
+        'kpi': engine.kpis,
+        'trend': engine.trend,
+        'insights': engine.insights,
+        'model_table': engine.model_table,
+    }
+    for panel, fn in panels.items():
+        if panel in ('filter', 'insights') and engine.streaming:
+            continue
+        phases[panel] = _phase(lambda: [fn(state) for state in states.values()], repeat)
+        phases[panel]['states'] = list(states)
+
+    result['cube_cells'] = len(engine.cube)
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def run(sizes, repeat=3, n_models=None, mode='memory', workdir=None, seed=0):
+    """Benchmark beberapa ukuran; kembalikan dokumen JSON-able"""
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': repeat,
+        },
+        'results': [],
+    }
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for n_rows in sizes:
+            # Subprocess baru per ukuran (spawn): RSS puncak tidak terbawa antar ukuran
+            with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as pool:
+                result = pool.submit(run_size, n_rows, tmp, repeat, n_models, mode, seed).result()
+            report['results'].append(result)
+    return report
+
+
+def parse_size(value):
+    """"10k"/"1m"/"50m" atau angka biasa -> jumlah baris"""
+    key = value.lower()
+    if key in SIZES:
+        return SIZES[key]
+    return int(value.replace('_', ''))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark hot path Dashboard Pasar BMW")
+    parser.add_argument('--sizes', nargs='+', default=['10k', '1m'],
+                        help="ukuran dataset: 10k, 1m, 10m, 50m atau jumlah baris")
+    parser.add_argument('--repeat', type=int, default=3, help="jumlah pengulangan per fase")
+    parser.add_argument('--models', type=int, default=None,
+                        help="jumlah varian model (default 11 seperti dataset asli)")
+    parser.add_argument('--mode', choices=['memory', 'streaming'], default='memory')
+    parser.add_argument('--workdir', default=None, help="folder untuk file sintetis sementara")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="file JSON hasil (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = run(
+        [parse_size(size) for size in args.sizes],
+        repeat=args.repeat, n_models=args.models, mode=args.mode,
+        workdir=args.workdir, seed=args.seed,
+    )
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
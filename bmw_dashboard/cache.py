@@ -0,0 +1,76 @@
+"""Cache hasil per state filter dengan eviction LRU.
+
+Satu instance dipakai bersama oleh semua sesi di proses yang sama (engine
+disimpan via st.cache_resource), sehingga tampilan populer seperti "semua
+model" cukup dihitung sekali.
+"""
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 256
+
+
+class ResultCache:
+    """Cache LRU thread-safe dengan counter hit/miss/eviction"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, maxbytes=None):
+        self.maxsize = maxsize
+        # Batas total ukuran entri (atribut `nbytes`, mis. array numpy); None = tanpa batas
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute):
+        """Ambil hasil dari cache, atau hitung lalu simpan jika belum ada"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # Hitung di luar lock agar sesi lain tidak ikut menunggu
+        value = compute()
+        size = getattr(value, 'nbytes', 0)
+        if self.maxbytes is not None and size > self.maxbytes:
+            # Terlalu besar untuk disimpan: dipakai sekali saja
+            return value
+
+        with self._lock:
+            self.nbytes += size - self._sizes.get(key, 0)
+            self._data[key] = value
+            self._sizes[key] = size
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize or (
+                self.maxbytes is not None and self.nbytes > self.maxbytes
+            ):
+                old, _ = self._data.popitem(last=False)
+                self.nbytes -= self._sizes.pop(old)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        """Kosongkan cache (counter tetap dipertahankan)"""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """Ringkasan counter cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'nbytes': self.nbytes,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,114 @@
+"""Helper grafik untuk seri panjang: downsampling LTTB dan trace WebGL.
+
+Selama jumlah titik grafik tren kecil, dashboard memakai `px.line` biasa
+(SVG). Di atas ambang `webgl_points` setiap seri di-downsample dengan
+Largest-Triangle-Three-Buckets (LTTB) ke lebar piksel grafik, lalu digambar
+dengan `go.Scattergl` agar browser tidak me-render ribuan elemen SVG.
+
+`frame_key` memberi sidik isi data agregat sebuah grafik, dipakai sebagai
+key cache figure sehingga figure hanya dibangun ulang jika datanya berubah.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Total titik grafik tren di atas nilai ini -> mode WebGL + downsampling
+DEFAULT_WEBGL_POINTS = 5000
+# Lebar grafik (piksel): jumlah titik maksimum per seri setelah downsampling
+DEFAULT_CHART_WIDTH = 1200
+
+
+def frame_key(frame):
+    """Sidik (hash) isi DataFrame: kolom, dtype dan nilai, tanpa index"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(col, str(dtype)) for col, dtype in frame.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def lttb(x, y, n_out):
+    """Indeks titik terpilih LTTB (x harus terurut naik).
+
+    Titik pertama dan terakhir selalu dipertahankan; sisanya dibagi ke
+    `n_out - 2` bucket dan dari setiap bucket dipilih titik yang membentuk
+    segitiga terbesar dengan titik terpilih sebelumnya dan rata-rata bucket
+    berikutnya.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Batas bucket untuk titik ke-1 .. n-2; bucket terakhir diikuti titik akhir
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    edges = np.append(edges, n)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2]
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample(frame, x, y, by, n_out):
+    """Downsample setiap grup `by` ke maksimal `n_out` titik (urutan baris tetap)"""
+    positions = []
+    for rows in frame.groupby(by, observed=True, sort=False).indices.values():
+        group = frame.iloc[rows]
+        positions.append(rows[lttb(group[x].to_numpy(), group[y].to_numpy(), n_out)])
+    if not positions:
+        return frame
+    return frame.iloc[np.sort(np.concatenate(positions))]
+
+
+def line_figure_gl(frame, x, y, color, colors, custom_data=None, labels=None):
+    """Padanan `px.line(..., markers=True)` dengan trace Scattergl per grup"""
+    labels = labels or {}
+    fig = go.Figure()
+    for i, (name, group) in enumerate(frame.groupby(color, observed=True, sort=False)):
+        trace_color = colors[i % len(colors)]
+        fig.add_trace(go.Scattergl(
+            x=group[x].to_numpy(),
+            y=group[y].to_numpy(),
+            name=str(name),
+            legendgroup=str(name),
+            mode='lines+markers',
+            line=dict(color=trace_color),
+            marker=dict(color=trace_color),
+            customdata=group[custom_data].to_numpy() if custom_data else None,
+        ))
+    fig.update_layout(
+        template='plotly_white',
+        xaxis_title=labels.get(x, x),
+        yaxis_title=labels.get(y, y),
+        legend_title_text=labels.get(color, color),
+    )
+    return fig
+
+
+def point_labels(frame, x, y, text, color, webgl=False):
+    """Satu trace teks berisi label semua titik (pengganti annotation per titik)"""
+    trace = go.Scattergl if webgl else go.Scatter
+    return trace(
+        x=frame[x].to_numpy(),
+        y=frame[y].to_numpy(),
+        text=frame[text].to_numpy(),
+        mode='text',
+        textposition='top center',
+        textfont=dict(size=12, color=frame[color].to_numpy(), family='Arial Black'),
+        hoverinfo='skip',
+        showlegend=False,
+    )
@@ -0,0 +1,58 @@
+"""Konfigurasi runtime dashboard lewat environment variable."""
+import os
+
+# Mode load data: "memory" (default), "streaming" (out-of-core, hanya cube)
+# atau "duckdb" (query DuckDB langsung dari Parquet)
+LOAD_MODE_ENV = 'BMW_LOAD_MODE'
+# Jumlah thread scan DuckDB (default jumlah core)
+DUCKDB_THREADS_ENV = 'BMW_DUCKDB_THREADS'
+# Ukuran chunk (baris) untuk mode streaming
+CHUNK_ROWS_ENV = 'BMW_CHUNK_ROWS'
+# Folder spill baris mentah untuk mode streaming (kosong = tanpa spill)
+SPILL_DIR_ENV = 'BMW_SPILL_DIR'
+# Sumber forecast: "data" (baris Forecast di CSV, default) atau "model" (fit per seri)
+FORECAST_MODE_ENV = 'BMW_FORECAST'
+# File cache parameter forecast (default bmw_pricing_data.forecast.parquet)
+FORECAST_CACHE_ENV = 'BMW_FORECAST_CACHE'
+# Folder dataset bersama antar proses (mis. /dev/shm/bmw_dashboard); kosong = nonaktif
+SHARED_DIR_ENV = 'BMW_SHARED_DIR'
+# Interval (detik) thread refresh background yang memeriksa perubahan CSV; 0 = cek sinkron per rerun
+REFRESH_INTERVAL_ENV = 'BMW_REFRESH_INTERVAL'
+# Pra-komputasi insight semua kombinasi filter saat start (process pool)
+WARMUP_ENV = 'BMW_WARMUP'
+# Jumlah worker warm-up (default jumlah core)
+WARMUP_WORKERS_ENV = 'BMW_WARMUP_WORKERS'
+# File kurs lokal (mata uang tambahan & kurs per tahun), default exchange_rates.json
+RATES_FILE_ENV = 'BMW_RATES_FILE'
+# File histori kurs CSV (currency, rate, year/date), default exchange_rates.csv
+RATES_HISTORY_ENV = 'BMW_RATES_HISTORY'
+# Total titik grafik tren di atas nilai ini -> trace WebGL + downsampling LTTB
+WEBGL_POINTS_ENV = 'BMW_WEBGL_POINTS'
+# Lebar grafik (piksel) = jumlah titik maksimum per seri setelah downsampling
+CHART_WIDTH_ENV = 'BMW_CHART_WIDTH'
+# Aktifkan profiling per rerun (panel debug timing per section)
+PROFILE_ENV = 'BMW_PROFILE'
+# File JSON-lines untuk log timing setiap rerun (opsional)
+PROFILE_LOG_ENV = 'BMW_PROFILE_LOG'
+# File teks format Prometheus untuk agregat p50/p95 (opsional)
+PROFILE_PROMETHEUS_ENV = 'BMW_PROFILE_PROMETHEUS'
+
+
+def env_str(name, default=None):
+    """Nilai string env var (kosong dianggap tidak di-set)"""
+    value = os.environ.get(name, '').strip()
+    return value or default
+
+
+def env_int(name, default=None):
+    """Nilai integer env var"""
+    value = env_str(name)
+    return int(value) if value is not None else default
+
+
+def env_flag(name, default=False):
+    """Nilai boolean env var ("1", "true", "yes", "on")"""
+    value = env_str(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
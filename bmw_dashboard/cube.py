@@ -0,0 +1,181 @@
+"""Cube OLAP pra-agregasi untuk angka-angka dashboard.
+
+Cube menyimpan count/sum/sumsq/min/max Price_USD per kombinasi
+(Year, Model, Transmission, Region, Fuel_Type, Type). Semua KPI, data tren,
+bar chart dan tabel model di-rollup dari cube ini, sehingga biaya per rerun
+sebanding dengan jumlah kombinasi unik, bukan jumlah listing.
+
+Tabel year-over-year (`yoy_table`) menyandingkan min/max/mean setiap tahun
+dengan nilai tahun sebelumnya per (Model, Transmission, Region, Fuel_Type),
+sehingga KPI beserta delta-nya cukup berupa satu slice + gabungan.
+"""
+import numpy as np
+import pandas as pd
+
+CUBE_DIMENSIONS = ['Year', 'Model', 'Transmission', 'Region', 'Fuel_Type', 'Type']
+MEASURES = ['count', 'sum', 'sumsq', 'min', 'max']
+
+# Kunci tabel year-over-year (selain Year)
+YOY_KEYS = ['Model', 'Transmission', 'Region', 'Fuel_Type']
+YOY_MEASURES = ['count', 'sum', 'min', 'max']
+
+# Cara menggabungkan setiap measure saat rollup
+_ROLLUP_AGG = {'count': 'sum', 'sum': 'sum', 'sumsq': 'sum', 'min': 'min', 'max': 'max'}
+
+
+# ========================================
+# BUILD CUBE
+# ========================================
+def build_cube(df, dimensions=CUBE_DIMENSIONS):
+    """Agregasi baris mentah menjadi cube (dihitung dalam float64)"""
+    price = df['Price_USD'].astype('float64')
+    frame = df[dimensions].assign(_price=price, _price_sq=price * price)
+
+    cube = frame.groupby(dimensions, observed=True, sort=True).agg(
+        count=('_price', 'size'),
+        sum=('_price', 'sum'),
+        sumsq=('_price_sq', 'sum'),
+        min=('_price', 'min'),
+        max=('_price', 'max'),
+    ).reset_index()
+    cube['count'] = cube['count'].astype('int64')
+    return cube
+
+
+def merge_cubes(cube, other):
+    """Gabungkan dua cube (mis. cube lama + cube dari baris append)"""
+    if other.empty:
+        return cube
+    dimensions = [col for col in cube.columns if col not in MEASURES]
+    merged = pd.concat([cube, other], ignore_index=True)
+    merged = merged.groupby(dimensions, observed=True, sort=True)[MEASURES].agg(_ROLLUP_AGG)
+    return merged.reset_index()
+
+
+def convert_cube(cube, year_rates):
+    """Konversi measure harga cube dengan kurs per Year (Series ber-index Year).
+
+    Satu join pada Year: sum/min/max dikali kurs, sumsq dikali kuadratnya
+    (kurs positif sehingga urutan min/max tidak berubah).
+    """
+    factor = cube['Year'].map(year_rates).to_numpy(dtype=float)
+    converted = cube.copy()
+    for measure in ('sum', 'min', 'max'):
+        converted[measure] = cube[measure].to_numpy() * factor
+    converted['sumsq'] = cube['sumsq'].to_numpy() * factor * factor
+    return converted
+
+
+# ========================================
+# SLICE & ROLLUP
+# ========================================
+def slice_cube(cube, **selections):
+    """Sel cube yang lolos filter (None = kolom tidak difilter)"""
+    mask = np.ones(len(cube), dtype=bool)
+    for col, values in selections.items():
+        if values is None:
+            continue
+        mask &= cube[col].isin(values).to_numpy()
+    if mask.all():
+        return cube
+    return cube[mask]
+
+
+def _finalize(agg):
+    """Tambahkan kolom mean & std (ddof=1, sama seperti pandas)"""
+    agg['mean'] = agg['sum'] / agg['count']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = (agg['sumsq'] - agg['sum'] ** 2 / agg['count']) / (agg['count'] - 1)
+    agg['std'] = np.sqrt(var.clip(lower=0)).where(agg['count'] > 1)
+    return agg
+
+
+def rollup(cube, by):
+    """Rollup cube ke dimensi `by` dengan kolom count/sum/.../mean/std"""
+    agg = cube.groupby(by, observed=True, sort=True)[MEASURES].agg(_ROLLUP_AGG).reset_index()
+    return _finalize(agg)
+
+
+def summary(cube):
+    """Rollup total (semua sel) sebagai dict; None jika cube kosong"""
+    if cube.empty or cube['count'].sum() == 0:
+        return None
+    total = {measure: cube[measure].agg(how) for measure, how in _ROLLUP_AGG.items()}
+    total = _finalize(pd.DataFrame([total])).iloc[0]
+    return total.to_dict()
+
+
+def model_table(cube):
+    """Rata-rata & prediksi harga per model plus baris Total dalam satu agregasi.
+
+    Mengembalikan frame dengan kolom Model, avg dan pred (USD). Prediksi
+    memakai sel Forecast; jika model tidak punya forecast, dipakai rata-ratanya.
+    """
+    by_type = cube.groupby(['Model', 'Type'], observed=True, sort=True)[['count', 'sum']].sum()
+    counts = by_type['count'].unstack('Type', fill_value=0)
+    sums = by_type['sum'].unstack('Type', fill_value=0.0)
+
+    if 'Forecast' in counts:
+        forecast_count, forecast_sum = counts['Forecast'], sums['Forecast']
+    else:
+        forecast_count = pd.Series(0, index=counts.index)
+        forecast_sum = pd.Series(0.0, index=counts.index)
+
+    # Baris per model + baris Total dari jumlahan yang sama
+    count = pd.concat([counts.sum(axis=1), pd.Series({'Total': counts.to_numpy().sum()})])
+    total = pd.concat([sums.sum(axis=1), pd.Series({'Total': sums.to_numpy().sum()})])
+    fc_count = pd.concat([forecast_count, pd.Series({'Total': forecast_count.sum()})])
+    fc_sum = pd.concat([forecast_sum, pd.Series({'Total': forecast_sum.sum()})])
+
+    avg = total / count
+    pred = (fc_sum / fc_count.where(fc_count > 0)).fillna(avg)
+    table = pd.DataFrame({'avg': avg, 'pred': pred}).rename_axis('Model').reset_index()
+    table['Model'] = table['Model'].astype(str)
+    return table
+
+
+# ========================================
+# YEAR-OVER-YEAR
+# ========================================
+def yoy_table(cube, keys=YOY_KEYS):
+    """Measure Actual per (kunci, Year) berdampingan dengan measure tahun sebelumnya.
+
+    Kolom count/sum/min/max/mean untuk tahun itu, kolom *_prev untuk Year - 1,
+    plus persentase perubahan min_pct/max_pct/mean_pct per kunci. Outer join:
+    kunci yang hanya ada di tahun sebelumnya tetap punya baris (count 0),
+    sehingga slice per tahun/rentang memuat seluruh data pembandingnya.
+    """
+    by = keys + ['Year']
+    actual = cube[cube['Type'] == 'Actual']
+    current = actual.groupby(by, observed=True, sort=True)[YOY_MEASURES].agg(
+        {measure: _ROLLUP_AGG[measure] for measure in YOY_MEASURES}
+    ).reset_index()
+    previous = current.assign(Year=current['Year'] + 1)
+
+    table = current.merge(previous, on=by, how='outer', suffixes=('', '_prev'), sort=True)
+    for suffix in ('', '_prev'):
+        table['count' + suffix] = table['count' + suffix].fillna(0).astype('int64')
+        table['sum' + suffix] = table['sum' + suffix].fillna(0.0)
+        table['mean' + suffix] = table['sum' + suffix] / table['count' + suffix].where(
+            table['count' + suffix] > 0
+        )
+    for stat in ('min', 'max', 'mean'):
+        table[f"{stat}_pct"] = (table[stat] - table[f"{stat}_prev"]) / table[f"{stat}_prev"] * 100
+    return table
+
+
+def yoy_by_year(table):
+    """Baris tabel YoY terpilih di-rollup per Year menjadi (saat ini, sebelumnya).
+
+    Frame kedua memuat measure tahun sebelumnya dengan Year = tahun itu
+    sendiri (Year - 1), sehingga kurs per Year bisa diterapkan pada keduanya.
+    """
+    result = []
+    for suffix, shift in (('', 0), ('_prev', 1)):
+        by_year = table.groupby('Year', observed=True, sort=True).agg(
+            count=('count' + suffix, 'sum'), sum=('sum' + suffix, 'sum'),
+            min=('min' + suffix, 'min'), max=('max' + suffix, 'max'),
+        ).reset_index()
+        by_year['Year'] = by_year['Year'] - shift
+        result.append(by_year[by_year['count'] > 0])
+    return tuple(result)
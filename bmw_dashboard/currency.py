@@ -0,0 +1,220 @@
+"""Konversi & format mata uang secara vektor.
+
+Harga di dataset selalu dalam USD. `CurrencyTable` menyimpan kurs per mata
+uang (dan opsional kurs per `Year`) sebagai vektor, sehingga satu kolom
+dikonversi dengan satu perkalian array tanpa pemanggilan Python per baris.
+Format angka mengikuti locale asal mata uang (mis. "$12,345", "12.345 €",
+"Rp 12.345").
+
+Mata uang tambahan dan kurs per tahun bisa dimuat dari file JSON lokal:
+
+    {
+      "currencies": [
+        {"code": "GBP", "label": "Pound Sterling", "symbol": "£", "rate": 0.79}
+      ],
+      "rates": [
+        {"currency": "EUR", "year": 2015, "rate": 0.90}
+      ]
+    }
+
+Histori kurs (`exchange_rates.csv`, kolom currency, rate dan year atau date)
+diterapkan dengan as-of join terhadap `Year`: setiap tahun memakai kurs
+periode terakhir yang sudah berlaku (kurs bertanggal dirata-rata per tahun).
+Tahun sebelum histori dimulai memakai kurs histori paling awal.
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+RATES_PATH = 'exchange_rates.json'
+HISTORY_PATH = 'exchange_rates.csv'
+
+# Mata uang dasar dataset (harga di Price_USD)
+BASE_CURRENCY = 'USD'
+
+
+@dataclass(frozen=True)
+class Currency:
+    """Definisi mata uang: kurs default terhadap USD dan aturan format locale"""
+    code: str
+    label: str
+    rate: float
+    symbol: str
+    symbol_first: bool = True
+    space: bool = False
+    thousands: str = ','
+    decimal: str = '.'
+
+    def affix(self, number):
+        """Tempelkan simbol ke angka yang sudah diformat"""
+        sep = ' ' if self.space else ''
+        if self.symbol_first:
+            return f"{self.symbol}{sep}{number}"
+        return f"{number}{sep}{self.symbol}"
+
+
+@dataclass(frozen=True)
+class YearRates:
+    """Kurs satu mata uang per Year (hashable, dipakai sebagai key cache engine)"""
+    code: str
+    years: tuple
+    rates: tuple
+
+    def series(self):
+        """Kurs sebagai Series ber-index Year"""
+        return pd.Series(self.rates, index=pd.Index(self.years, name='Year'), dtype=float)
+
+
+DEFAULT_CURRENCIES = (
+    Currency('USD', 'US Dollar', 1.0, '$'),
+    Currency('EUR', 'Euro', 0.92, '€', symbol_first=False, space=True, thousands='.', decimal=','),
+    Currency('IDR', 'Rupiah', 15800.0, 'Rp', space=True, thousands='.', decimal=','),
+)
+
+
+class CurrencyTable:
+    """Kurs (statis & histori per tahun) dan formatter untuk semua mata uang"""
+
+    def __init__(self, currencies=DEFAULT_CURRENCIES, history=None):
+        self.currencies = {c.code: c for c in currencies}
+        # Histori kurs: kolom currency, Year, rate (urut Year); kosong = kurs statis
+        if history is None:
+            history = pd.DataFrame({'currency': [], 'Year': [], 'rate': []})
+        self.history = {
+            code: rates.set_index('Year')['rate'].sort_index()
+            for code, rates in history.groupby('currency', sort=False)
+        }
+        self._asof_cache = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=None, history_path=None):
+        """Mata uang default + tambahan dari file JSON + histori kurs CSV (jika ada)"""
+        path = path or RATES_PATH
+        history_path = history_path or HISTORY_PATH
+
+        currencies = {c.code: c for c in DEFAULT_CURRENCIES}
+        entries = []
+        if os.path.exists(path):
+            with open(path) as f:
+                spec = json.load(f)
+            for entry in spec.get('currencies', []):
+                currency = Currency(**entry)
+                currencies[currency.code] = currency
+            entries.extend(spec.get('rates', []))
+
+        frames = [pd.DataFrame(entries)] if entries else []
+        if os.path.exists(history_path):
+            frames.append(pd.read_csv(history_path, comment='#', skipinitialspace=True))
+
+        history = None
+        if frames:
+            history = _annual_rates(pd.concat(frames, ignore_index=True))
+            unknown = set(history['currency']) - set(currencies)
+            if unknown:
+                raise ValueError(f"Kurs untuk mata uang tidak dikenal: {sorted(unknown)}")
+        return cls(currencies.values(), history)
+
+    # ---- Lookup ----
+    def codes(self):
+        """Kode mata uang sesuai urutan definisi"""
+        return list(self.currencies)
+
+    def get(self, code):
+        """Definisi mata uang berdasarkan kode"""
+        return self.currencies[code]
+
+    # ---- Kurs per tahun ----
+    def year_rates(self, code, years):
+        """Kurs `code` untuk setiap tahun di `years` (as-of join, di-cache).
+
+        Mengembalikan None untuk mata uang dasar (USD) karena tidak perlu konversi.
+        """
+        if code == BASE_CURRENCY and code not in self.history:
+            return None
+        key = (code, tuple(sorted(set(int(y) for y in years))))
+        with self._lock:
+            cached = self._asof_cache.get(key)
+        if cached is None:
+            cached = YearRates(code, key[1], tuple(self._asof(code, key[1]).tolist()))
+            with self._lock:
+                self._asof_cache[key] = cached
+        return cached
+
+    def _asof(self, code, years):
+        history = self.history.get(code)
+        if history is None:
+            return np.full(len(years), self.currencies[code].rate)
+        merged = pd.merge_asof(
+            pd.DataFrame({'Year': np.asarray(years, dtype='int64')}),
+            history.rename('rate').reset_index(),
+            on='Year', direction='backward'
+        )
+        # Tahun sebelum histori dimulai -> kurs histori paling awal
+        return merged['rate'].fillna(history.iloc[0]).to_numpy(dtype=float)
+
+    def rate_vector(self, code, years):
+        """Kurs per elemen `years` (satu join ke tabel kurs per tahun)"""
+        years = np.asarray(years)
+        rates = self.year_rates(code, np.unique(years))
+        if rates is None:
+            return np.ones(len(years))
+        return rates.series().reindex(years).to_numpy()
+
+    # ---- Konversi ----
+    def convert(self, amounts, code, years=None):
+        """Konversi USD ke `code`; dengan `years`, tiap elemen memakai kurs tahunnya"""
+        if years is None:
+            return amounts * self.currencies[code].rate
+        return amounts * self.rate_vector(code, years)
+
+    # ---- Format ----
+    def format(self, amount, code):
+        """Format satu nilai sesuai locale mata uang"""
+        currency = self.currencies[code]
+        return currency.affix(self._localize(f"{amount:,.0f}", currency))
+
+    def format_column(self, amounts, code):
+        """Format satu kolom angka sekaligus"""
+        currency = self.currencies[code]
+        numbers = pd.Series(amounts).map('{:,.0f}'.format)
+        if currency.thousands != ',' or currency.decimal != '.':
+            numbers = numbers.str.translate(self._separator_table(currency))
+        sep = ' ' if currency.space else ''
+        if currency.symbol_first:
+            return currency.symbol + sep + numbers
+        return numbers + sep + currency.symbol
+
+    def hover_format(self, code, placeholder):
+        """Template hover Plotly (mis. '%{y:,.0f}') dengan simbol mata uang"""
+        return self.currencies[code].affix(placeholder)
+
+    def plotly_separators(self, code):
+        """Nilai `layout.separators` Plotly: desimal lalu ribuan"""
+        currency = self.currencies[code]
+        return currency.decimal + currency.thousands
+
+    @staticmethod
+    def _separator_table(currency):
+        return str.maketrans({',': currency.thousands, '.': currency.decimal})
+
+    def _localize(self, number, currency):
+        if currency.thousands == ',' and currency.decimal == '.':
+            return number
+        return number.translate(self._separator_table(currency))
+
+
+def _annual_rates(rates):
+    """Normalisasi entri kurs (kolom year atau date) menjadi currency, Year, rate"""
+    rates = rates.copy()
+    if 'date' in rates:
+        from_date = pd.to_datetime(rates['date']).dt.year
+        rates['year'] = rates['year'].fillna(from_date) if 'year' in rates else from_date
+    # Kurs bertanggal dalam satu tahun dirata-rata menjadi kurs tahunan
+    annual = rates.groupby(['currency', 'year'], sort=True)['rate'].mean().reset_index()
+    annual['year'] = annual['year'].astype('int64')
+    return annual.rename(columns={'year': 'Year'})
@@ -0,0 +1,183 @@
+"""Backend query DuckDB (embedded, in-process) di atas file Parquet dataset.
+
+Pada mode `duckdb` engine tidak memuat baris mentah ke pandas. Cube agregasi
+dibangun dengan satu GROUP BY di DuckDB, dan statistik insight per model
+(yang butuh urutan baris) dihitung dengan window function; filter
+FilterState diterjemahkan menjadi klausa WHERE sehingga hanya hasil agregat
+yang sampai ke Python. DuckDB memindai Parquet secara paralel (multithread)
+dan tidak membutuhkan jaringan: autoload/autoinstall extension dimatikan.
+
+Daftar file sumber dibekukan per backend: baris yang di-append ke CSV
+setelah load ditulis sebagai part file Parquet baru (lihat
+`storage.write_spill_part`) dan menghasilkan backend baru lewat `with_part`,
+sehingga engine versi lama tetap membaca file versinya sendiri.
+"""
+import copy
+import threading
+
+import duckdb
+import pandas as pd
+
+from bmw_dashboard.cube import CUBE_DIMENSIONS
+from bmw_dashboard.insights import RECENT_ROWS
+
+# Konfigurasi koneksi: tanpa unduh/muat extension (berjalan offline)
+OFFLINE_CONFIG = {
+    'autoinstall_known_extensions': False,
+    'autoload_known_extensions': False,
+}
+
+# Jarak posisi antar file sumber (nomor baris per file < 2^40)
+_FILE_STRIDE = 1 << 40
+
+# Kolom teks yang dikembalikan sebagai kategori (kategori terurut, seperti storage)
+_CATEGORICAL = ['Region', 'Fuel_Type', 'Transmission', 'Model', 'Type']
+
+
+def _quote(col):
+    return '"' + col.replace('"', '""') + '"'
+
+
+class DuckDBBackend:
+    """Query agregat & baris mentah langsung dari file Parquet lewat DuckDB"""
+
+    def __init__(self, sources, threads=None):
+        self._sources = tuple(sources)
+        config = dict(OFFLINE_CONFIG)
+        if threads:
+            config['threads'] = int(threads)
+        self._conn = duckdb.connect(database=':memory:', config=config)
+        self._lock = threading.Lock()
+
+    def sources(self):
+        """File Parquet yang dibaca: file utama lalu part append (urut)"""
+        return list(self._sources)
+
+    def with_part(self, path):
+        """Backend baru (koneksi yang sama) yang juga membaca part file `path`"""
+        backend = copy.copy(self)
+        backend._sources = self._sources + (path,)
+        return backend
+
+    def _query(self, sql, params=None):
+        """Jalankan query di cursor sendiri (aman dipakai beberapa thread sesi)"""
+        with self._lock:
+            cursor = self._conn.cursor()
+        try:
+            return cursor.execute(sql, params or []).df()
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _where(selections, extra=None):
+        """Klausa WHERE + parameter dari selections FilterState (None = tanpa filter)"""
+        clauses, params = [], []
+        for col, values in selections.items():
+            if values is None:
+                continue
+            clauses.append(f"{_quote(col)} IN ({', '.join('?' * len(values))})")
+            params.extend(int(v) if col == 'Year' else str(v) for v in values)
+        if extra:
+            clauses.append(extra)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    # ---- Agregat ----
+    def cube(self):
+        """Cube (lihat `cube.build_cube`) dihitung dengan GROUP BY di DuckDB"""
+        dims = ', '.join(_quote(col) for col in CUBE_DIMENSIONS)
+        sql = f"""
+            SELECT {dims},
+                   COUNT(*) AS "count",
+                   SUM(p) AS "sum",
+                   SUM(p * p) AS "sumsq",
+                   MIN(p) AS "min",
+                   MAX(p) AS "max"
+            FROM (SELECT *, CAST(Price_USD AS DOUBLE) AS p FROM read_parquet(?))
+            GROUP BY {dims}
+            ORDER BY {dims}
+        """
+        cube = self._query(sql, [self.sources()])
+        cube['count'] = cube['count'].astype('int64')
+        return _with_dtypes(cube)
+
+    def insight_stats(self, selections):
+        """Statistik actual per model untuk `insights.insights_from_stats`.
+
+        Sama seperti `model_insights`: baris diurutkan per Year (stabil terhadap
+        urutan file), rata-rata 3 baris terakhir vs baris sebelumnya (minimal 3
+        baris pertama) dan standar deviasi sampel. Index = Model, urut
+        kemunculan pertama.
+        """
+        where, params = self._where(selections, "Type = 'Actual'")
+        sql = f"""
+            WITH actual AS (
+                SELECT Model, Year, CAST(Price_USD AS DOUBLE) AS p,
+                       -- Posisi global: urutan file sumber lalu nomor baris di file
+                       list_position(?::VARCHAR[], filename) * {_FILE_STRIDE} + file_row_number AS row_pos
+                FROM read_parquet(?, filename=true, file_row_number=true){where}
+            ), ranked AS (
+                SELECT *,
+                       ROW_NUMBER() OVER (PARTITION BY Model ORDER BY Year, row_pos) - 1 AS pos,
+                       COUNT(*) OVER (PARTITION BY Model) AS size
+                FROM actual
+            )
+            SELECT Model AS model,
+                   COUNT(*) AS "count",
+                   AVG(p) FILTER (WHERE pos >= size - {RECENT_ROWS}) AS current_avg,
+                   AVG(p) FILTER (WHERE pos < GREATEST({RECENT_ROWS}, size - {RECENT_ROWS})) AS older_avg,
+                   STDDEV_SAMP(p) AS volatility
+            FROM ranked
+            GROUP BY Model
+            ORDER BY MIN(row_pos)
+        """
+        sources = self.sources()
+        stats = self._query(sql, [sources, sources] + params)
+        return stats.set_index('model')
+
+    # ---- Baris mentah ----
+    def rows(self, selections, columns):
+        """Baris mentah yang lolos filter (hanya kolom `columns`)"""
+        where, params = self._where(selections)
+        cols = ', '.join(_quote(col) for col in columns)
+        rows = self._query(f"SELECT {cols} FROM read_parquet(?){where}", [self.sources()] + params)
+        return _with_dtypes(rows)
+
+    def count(self, selections):
+        """Jumlah baris yang lolos filter"""
+        where, params = self._where(selections)
+        result = self._query(f"SELECT COUNT(*) AS n FROM read_parquet(?){where}", [self.sources()] + params)
+        return int(result['n'].iloc[0])
+
+    def row_page(self, selections, columns, offset, limit, sort_by=None, descending=False):
+        """Satu halaman baris: ORDER BY + LIMIT/OFFSET dievaluasi di DuckDB.
+
+        Urutan file sumber dipakai sebagai tie-break agar halaman stabil
+        (sama dengan sort stabil di mode memori).
+        """
+        where, params = self._where(selections)
+        cols = ', '.join(_quote(col) for col in columns)
+        direction = 'DESC' if descending else 'ASC'
+        order = [f"{_quote(sort_by)} {direction}"] if sort_by else []
+        tie_break = 'ASC' if sort_by else direction
+        order += [f"list_position(?::VARCHAR[], filename) {tie_break}", f"file_row_number {tie_break}"]
+        sql = f"""
+            SELECT {cols}
+            FROM read_parquet(?, filename=true, file_row_number=true){where}
+            ORDER BY {', '.join(order)}
+            LIMIT ? OFFSET ?
+        """
+        sources = self.sources()
+        rows = self._query(sql, [sources] + params + [sources, int(limit), int(offset)])
+        return _with_dtypes(rows)
+
+
+def _with_dtypes(frame):
+    """Samakan dtype hasil DuckDB dengan storage (kategori terurut, Year int16)"""
+    for col in _CATEGORICAL:
+        if col in frame:
+            frame[col] = frame[col].astype(
+                pd.CategoricalDtype(sorted(frame[col].dropna().unique()))
+            )
+    if 'Year' in frame:
+        frame['Year'] = frame['Year'].astype('int16')
+    return frame
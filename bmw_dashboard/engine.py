@@ -0,0 +1,715 @@
+"""Engine analitik headless untuk Dashboard Pasar BMW.
+
+Semua perhitungan dashboard (filter, KPI, tren, tabel model dan insight)
+tersedia di sini sebagai Python murni tanpa Streamlit, sehingga bisa
+di-memoize, diprofil dan dipanggil dari batch job. Nilai harga dikembalikan
+dalam USD, kecuali panel dipanggil dengan `rates` (kurs per Year): cube
+dikonversi sekali per mata uang (satu join pada Year) sehingga setiap tahun
+memakai kurs periodenya sendiri.
+
+KPI beserta delta year-over-year dibaca dari tabel YoY (dihitung saat load
+dari cube): nilai tahun/rentang terpilih dan tahun sebelumnya per kunci
+cukup di-slice sekali lalu digabung.
+
+Hasil setiap panel di-cache per FilterState (LRU) dalam USD sebagai measure
+per Year; kurs tiap tahun diterapkan setelah lookup (beberapa baris per
+tahun), sehingga ganti mata uang atau kembali ke tampilan yang sama cukup
+berupa cache hit. Hasil yang dikembalikan dipakai bersama antar sesi dan
+tidak boleh dimodifikasi.
+
+Baris yang di-append ke CSV di-ingest lewat `refresh()`: hanya byte baru yang
+di-parse, lalu digabung ke baris mentah, indeks dan cube tanpa rebuild penuh.
+`refreshed()` melakukan hal yang sama pada salinan engine (engine lama tidak
+diubah), dipakai refresher background untuk swap atomik (lihat `refresher.py`).
+
+Mode streaming (`load_streaming`) hanya menyimpan cube di memori; baris
+mentah untuk insight dibaca dari folder spill Parquet jika tersedia.
+
+`warm_up()` memprakomputasi statistik insight semua model untuk setiap
+kombinasi transmisi/tahun di process pool, sehingga insight per klik cukup
+berupa lookup (berlaku sampai data berubah).
+
+Mode shared (`attach_shared`) memakai array kolom & indeks yang di-publish
+satu proses loader ke file memory-mapped (lihat `shared.py`); `refresh()`
+berpindah ke versi baru begitu loader mem-publish ulang.
+
+Mode DuckDB (`load_duckdb`) juga tidak memuat baris mentah: cube dibangun
+dengan GROUP BY di DuckDB langsung dari file Parquet, dan insight serta
+baris mentah di-query dengan filter yang di-push down (lihat
+`duckdb_backend.py`).
+
+Dengan `forecast_mode='model'`, sel Forecast dari CSV diganti prediksi model
+per seri (lihat `forecast.py`), termasuk setelah ada baris baru di-ingest.
+"""
+import copy
+import os
+import threading
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from bmw_dashboard import shared, storage
+from bmw_dashboard.cache import DEFAULT_MAXSIZE, ResultCache
+from bmw_dashboard.cube import (
+    MEASURES, build_cube, convert_cube, merge_cubes, rollup, slice_cube,
+    yoy_by_year, yoy_table
+)
+from bmw_dashboard.cube import model_table as cube_model_table
+from bmw_dashboard.forecast import CACHE_PATH as FORECAST_CACHE_PATH
+from bmw_dashboard.forecast import with_model_forecast
+from bmw_dashboard.index import FilterIndex
+from bmw_dashboard.insights import insights_from_stats, model_insights, rank_models
+from bmw_dashboard.streaming import stream_cube
+from bmw_dashboard.warmup import build_insight_table
+
+# Kolom baris mentah yang dibutuhkan engine (proyeksi kolom saat load)
+ROW_COLUMNS = ['Year', 'Transmission', 'Model', 'Region', 'Fuel_Type', 'Price_USD', 'Type']
+
+# Jumlah baris per halaman drill-down
+DEFAULT_PAGE_SIZE = 50
+
+# Urutan baris drill-down (array posisi seukuran slice) di-cache terpisah dari
+# cache panel, dibatasi total byte; urutan yang lebih besar dihitung per halaman
+ROW_ORDER_CACHE_SLOTS = 8
+ROW_ORDER_CACHE_BYTES = 64 * 1024 ** 2
+
+# Jumlah tabel YoY per mata uang yang disimpan (selain USD)
+YOY_CURRENCY_SLOTS = 8
+
+
+# ========================================
+# STATE FILTER
+# ========================================
+@dataclass(frozen=True)
+class FilterState:
+    """Pilihan filter yang sudah dinormalisasi (None = tidak difilter)"""
+    transmissions: tuple = None
+    year: int = None
+    models: tuple = None
+    regions: tuple = None
+    fuel_types: tuple = None
+    # Rentang tahun (awal, akhir) inklusif; dipakai jika `year` tidak diisi
+    year_range: tuple = None
+
+    @classmethod
+    def from_selection(cls, transmissions=None, year='All', models=None,
+                       regions=None, fuel_types=None, year_range=None):
+        """Normalisasi pilihan widget: kosong/"All" berarti tanpa filter"""
+        year = int(year) if year not in (None, 'All') else None
+        if year is None and year_range:
+            start, end = sorted(int(y) for y in year_range)
+            # Rentang satu tahun sama dengan memilih tahun itu
+            if start == end:
+                year, year_range = start, None
+            else:
+                year_range = (start, end)
+        else:
+            year_range = None
+        return cls(
+            transmissions=tuple(sorted(transmissions)) if transmissions else None,
+            year=year,
+            models=tuple(sorted(models)) if models else None,
+            regions=tuple(sorted(regions)) if regions else None,
+            fuel_types=tuple(sorted(fuel_types)) if fuel_types else None,
+            year_range=year_range,
+        )
+
+    def years(self):
+        """Tahun terpilih sebagai list, atau None jika semua tahun"""
+        if self.year is not None:
+            return [self.year]
+        if self.year_range is not None:
+            return list(range(self.year_range[0], self.year_range[1] + 1))
+        return None
+
+    def drill(self, model=None, year=None):
+        """State drill-down: dipersempit ke satu model dan/atau satu tahun"""
+        return replace(
+            self,
+            models=(model,) if model is not None else self.models,
+            year=int(year) if year is not None else self.year,
+            year_range=None if year is not None else self.year_range,
+        )
+
+    def selections(self):
+        """Argumen filter per kolom untuk FilterIndex / slice_cube"""
+        return {
+            'Transmission': list(self.transmissions) if self.transmissions else None,
+            'Year': self.years(),
+            'Model': list(self.models) if self.models else None,
+            'Region': list(self.regions) if self.regions else None,
+            'Fuel_Type': list(self.fuel_types) if self.fuel_types else None,
+        }
+
+
+def price_column(rates):
+    """Nama kolom harga hasil panel sesuai mata uang"""
+    return 'Price_USD' if rates is None else f"Price_{rates.code}"
+
+
+def _year_summary(by_year, rates=None):
+    """min/max/mean (dict) dari measure per Year setelah kurs tahunnya; None jika kosong"""
+    count = int(by_year['count'].sum())
+    if count == 0:
+        return None
+    factor = 1.0
+    if rates is not None:
+        factor = by_year['Year'].map(rates.series()).to_numpy(dtype=float)
+    return {
+        'count': count,
+        'min': (by_year['min'].to_numpy() * factor).min(),
+        'max': (by_year['max'].to_numpy() * factor).max(),
+        'mean': (by_year['sum'].to_numpy() * factor).sum() / count,
+    }
+
+
+def _pct(new, base):
+    """Persentase perubahan, 0 jika base tidak positif"""
+    return ((new - base) / base * 100) if base > 0 else 0
+
+
+# ========================================
+# ENGINE
+# ========================================
+class DashboardEngine:
+    """Perhitungan dashboard di atas dataset yang sudah dimuat"""
+
+    def __init__(self, df, cube=None, index=None, cache_size=DEFAULT_MAXSIZE,
+                 csv_path=None, parquet_path=None, source_offset=0,
+                 spill_dir=None, chunk_rows=None, forecast_mode='data',
+                 forecast_cache=FORECAST_CACHE_PATH, shared_dir=None, shared_version=None,
+                 backend=None, spill_generation=None):
+        # df None = mode streaming/DuckDB (hanya cube di memori)
+        self.df = df
+        if index is None and df is not None:
+            index = FilterIndex(df)
+        self.index = index
+        self.forecast_mode = forecast_mode
+        self.forecast_cache = forecast_cache
+        self.cube = self._with_forecast(cube if cube is not None else build_cube(df))
+        self.cache = ResultCache(cache_size)
+        self.order_cache = ResultCache(ROW_ORDER_CACHE_SLOTS, ROW_ORDER_CACHE_BYTES)
+        # Statistik insight pra-komputasi (warm_up), berlaku untuk satu versi data
+        self.insight_table = None
+
+        # Sumber data & watermark (offset byte CSV yang sudah di-ingest)
+        self.csv_path = csv_path
+        self.parquet_path = parquet_path
+        self.source_offset = source_offset
+        self.spill_dir = spill_dir
+        # Folder part file versi ini & daftar part yang dibaca (dibekukan:
+        # append menambah part baru, reload memakai generasi folder baru)
+        self.spill_generation = spill_generation
+        self.spill_parts = tuple(storage.spill_parts(spill_generation.path)) if spill_generation else ()
+        self.chunk_rows = chunk_rows
+        # Folder & versi dataset bersama (mode shared)
+        self.shared_dir = shared_dir
+        self.shared_version = shared_version
+        # Backend query untuk baris mentah & insight (mode DuckDB)
+        self.backend = backend
+        self.version = 0
+        self._refresh_lock = threading.Lock()
+        # Tabel YoY untuk KPI dihitung saat load dan setiap kali cube berubah
+        self._yoy_lock = threading.Lock()
+        self._build_yoy()
+
+    @classmethod
+    def load(cls, csv_path=storage.CSV_PATH, parquet_path=storage.PARQUET_PATH,
+             cache_size=DEFAULT_MAXSIZE, **options):
+        """Load baris mentah (kolom seperlunya) dan bangun indeks & cube"""
+        # ROW_COLUMNS mencakup semua dimensi cube: cube dibangun dari df (sekali baca)
+        df = storage.load_dataset(ROW_COLUMNS, csv_path, parquet_path)
+        return cls(
+            df, cache_size=cache_size,
+            csv_path=csv_path, parquet_path=parquet_path,
+            source_offset=storage.read_csv_offset(parquet_path), **options,
+        )
+
+    @classmethod
+    def load_streaming(cls, csv_path=storage.CSV_PATH, chunk_rows=storage.DEFAULT_CHUNK_ROWS,
+                       spill_dir=None, cache_size=DEFAULT_MAXSIZE, **options):
+        """Mode out-of-core: baca CSV per chunk, simpan hanya cube (+ spill opsional)"""
+        # Folder spill milik engine ini (dihapus saat tidak dipakai engine mana pun)
+        generation = storage.SpillGeneration(spill_dir) if spill_dir else None
+        cube, offset = stream_cube(csv_path, chunk_rows, generation.path if generation else None)
+        return cls(
+            None, cube=cube, cache_size=cache_size,
+            csv_path=csv_path, source_offset=offset,
+            spill_dir=spill_dir, chunk_rows=chunk_rows,
+            spill_generation=generation, **options,
+        )
+
+    @classmethod
+    def load_duckdb(cls, csv_path=storage.CSV_PATH, parquet_path=storage.PARQUET_PATH,
+                    threads=None, cache_size=DEFAULT_MAXSIZE, **options):
+        """Mode DuckDB: cube & insight di-query dari Parquet, baris mentah tidak dimuat"""
+        # Import di sini: duckdb hanya dibutuhkan pada mode ini
+        from bmw_dashboard.duckdb_backend import DuckDBBackend
+
+        storage.ensure_parquet(csv_path, parquet_path)
+        # Baris yang di-append setelah konversi ditulis sebagai part di folder
+        # generasi ini; Parquet utama di-link ke sana agar konversi ulang
+        # (reload) tidak mengubah file yang dibaca versi ini
+        append_dir = f"{parquet_path}{storage.APPEND_DIR_SUFFIX}"
+        generation = storage.SpillGeneration(append_dir)
+        base = storage.snapshot_file(parquet_path, generation.path)
+        backend = DuckDBBackend([base], threads)
+        return cls(
+            None, cube=backend.cube(), cache_size=cache_size,
+            csv_path=csv_path, parquet_path=parquet_path,
+            source_offset=storage.read_csv_offset(base),
+            spill_dir=append_dir, backend=backend,
+            spill_generation=generation, **options,
+        )
+
+    def _options(self):
+        """Opsi engine yang dipertahankan saat reload"""
+        return {'forecast_mode': self.forecast_mode, 'forecast_cache': self.forecast_cache}
+
+    def _with_forecast(self, cube):
+        """Sel Forecast dari CSV ('data') atau dari model per seri ('model')"""
+        if self.forecast_mode == 'model':
+            return with_model_forecast(cube, self.forecast_cache)
+        return cube
+
+    @classmethod
+    def attach_shared(cls, shared_dir, csv_path=storage.CSV_PATH,
+                      parquet_path=storage.PARQUET_PATH, cache_size=DEFAULT_MAXSIZE, **options):
+        """Attach dataset bersama (zero-copy, read-only) dari `shared_dir`.
+
+        Jika belum ada yang di-publish, proses ini load dari CSV/Parquet dan
+        mem-publish-nya terlebih dahulu.
+        """
+        if shared.current_version(shared_dir) is None:
+            loaded = cls.load(csv_path, parquet_path, cache_size=0)
+            shared.publish(shared_dir, loaded.df, loaded.index, loaded.source_offset)
+            del loaded
+        version, df, index, offset = shared.attach(shared_dir)
+        return cls(
+            df, index=index, cache_size=cache_size, source_offset=offset,
+            shared_dir=shared_dir, shared_version=version, **options,
+        )
+
+    @property
+    def streaming(self):
+        """True jika baris mentah tidak disimpan di memori"""
+        return self.df is None
+
+    def row_count(self):
+        """Jumlah listing di dataset"""
+        return int(self.cube['count'].sum())
+
+    def _cached(self, panel, state, compute):
+        """Hasil panel untuk state ini dari cache (dihitung jika belum ada)"""
+        key = (panel, self.version, state)
+        return self.cache.get_or_compute(key, lambda: compute(state))
+
+    def _by_year(self, state, by):
+        """Rollup USD sel yang lolos filter per `by` + Year (di-cache, tanpa kurs)"""
+        return self._cached(
+            ('by_year',) + tuple(by), state, lambda s: rollup(self.slice(s), by + ['Year'])
+        )
+
+    def _by_year_in(self, state, by, rates=None):
+        """Rollup per `by` + Year dalam mata uang `rates` (kurs diterapkan setelah lookup)"""
+        by_year = self._by_year(state, by)
+        if rates is None:
+            return by_year
+        return convert_cube(by_year, rates.series())
+
+    def cube_in(self, rates=None):
+        """Cube dengan measure harga dikonversi per Year (None = USD)"""
+        if rates is None:
+            return self.cube
+        key = ('cube', self.version, rates)
+        return self.cache.get_or_compute(key, lambda: convert_cube(self.cube, rates.series()))
+
+    def _build_yoy(self, yoy=None):
+        """Tabel YoY (USD) untuk cube saat ini; salinan per mata uang dikosongkan"""
+        self.yoy = yoy if yoy is not None else yoy_table(self.cube)
+        self._yoy_converted = {}
+
+    def yoy_in(self, rates=None):
+        """Tabel year-over-year (lihat `yoy_table`) dalam mata uang `rates`.
+
+        Disimpan di engine (bukan di cache hasil LRU) agar tidak pernah
+        di-evict; salinan per mata uang dibatasi YOY_CURRENCY_SLOTS.
+        """
+        if rates is None:
+            return self.yoy
+        with self._yoy_lock:
+            table = self._yoy_converted.get(rates)
+        if table is None:
+            table = yoy_table(self.cube_in(rates))
+            with self._yoy_lock:
+                if len(self._yoy_converted) >= YOY_CURRENCY_SLOTS:
+                    # Buang mata uang yang paling lama disimpan
+                    del self._yoy_converted[next(iter(self._yoy_converted))]
+                self._yoy_converted[rates] = table
+        return table
+
+    def cache_stats(self):
+        """Counter hit/miss/eviction cache hasil"""
+        return self.cache.stats()
+
+    def warm_up(self, workers=None):
+        """Pra-komputasi insight semua kombinasi filter; False jika mode streaming"""
+        if self.streaming:
+            return False
+        self.insight_table = build_insight_table(self.df, self.cube, self.version, workers)
+        return True
+
+    # ---- Ingest inkremental ----
+    def refresh(self):
+        """Ingest baris yang di-append ke CSV sejak load; return jumlah baris baru"""
+        if self.shared_dir:
+            return self._refresh_shared()
+        if self.csv_path is None:
+            return 0
+        with self._refresh_lock:
+            try:
+                new_rows, offset = storage.read_appended(self.csv_path, self.source_offset)
+            except storage.SourceRewrittenError:
+                # CSV ditulis ulang -> watermark tidak berlaku, reload penuh
+                self._reload()
+                return self.row_count()
+            self.source_offset = offset
+            if new_rows.empty:
+                return 0
+            self.append(new_rows)
+            return len(new_rows)
+
+    def source_signature(self):
+        """Sidik sumber data: (mtime, ukuran) CSV atau versi dataset bersama"""
+        if self.shared_dir:
+            return shared.current_version(self.shared_dir)
+        if self.csv_path is None:
+            return None
+        try:
+            stat = os.stat(self.csv_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def refreshed(self):
+        """Engine baru berisi data terbaru tanpa mengubah engine ini.
+
+        Data (baris, indeks, cube) dipakai bersama dengan salinan; ingest dan
+        reload selalu mengganti objek, bukan memodifikasinya. Mengembalikan
+        engine ini sendiri jika tidak ada perubahan.
+        """
+        fresh = copy.copy(self)
+        fresh.cache = ResultCache(self.cache.maxsize)
+        fresh.order_cache = ResultCache(ROW_ORDER_CACHE_SLOTS, ROW_ORDER_CACHE_BYTES)
+        fresh._refresh_lock = threading.Lock()
+        fresh._yoy_lock = threading.Lock()
+        fresh._yoy_converted = {}
+        # Ingest/reload juga membangun ulang tabel YoY (di luar request)
+        fresh.refresh()
+        if fresh.version == self.version:
+            return self
+        return fresh
+
+    def append(self, new_rows):
+        """Gabungkan baris baru ke baris mentah, indeks & cube tanpa rebuild penuh"""
+        new_rows = storage.align_categories(new_rows, self.cube)
+
+        if self.streaming:
+            df, index = None, None
+            if self.spill_generation:
+                path = storage.write_spill_part(self.spill_generation.path, new_rows)
+                # Tuple baru (bukan ditambah di tempat): salinan lama tetap utuh
+                self.spill_parts = self.spill_parts + (path,)
+                if self.backend is not None:
+                    self.backend = self.backend.with_part(path)
+        else:
+            # Kategori data lama disamakan agar concat tetap bertipe kategori
+            df = storage.with_categories(self.df, new_rows)
+            df = pd.concat([df, new_rows[df.columns]], ignore_index=True)
+            index = self.index.extended(new_rows)
+
+        dimensions = [col for col in self.cube.columns if col not in MEASURES]
+        cube = merge_cubes(
+            storage.with_categories(self.cube, new_rows), build_cube(new_rows, dimensions)
+        )
+        cube = self._with_forecast(cube)
+
+        self.df, self.index, self.cube = df, index, cube
+        self._build_yoy()
+        self.version += 1
+        self.cache.clear()
+        self.order_cache.clear()
+
+    def _refresh_shared(self):
+        """Pindah ke versi dataset bersama terbaru jika loader sudah publish ulang"""
+        with self._refresh_lock:
+            version = shared.current_version(self.shared_dir)
+            if version is None or version == self.shared_version:
+                return 0
+            version, df, index, offset = shared.attach(self.shared_dir, version)
+            n_before = len(self.df)
+            self.df, self.index = df, index
+            self.cube = self._with_forecast(build_cube(df))
+            self._build_yoy()
+            self.source_offset = offset
+            self.shared_version = version
+            self.version += 1
+            self.cache.clear()
+            self.order_cache.clear()
+            return len(df) - n_before
+
+    def _reload(self):
+        """Reload penuh dari CSV (konversi ulang Parquet / streaming ulang)"""
+        if self.backend is not None:
+            storage.convert_csv_to_parquet(self.csv_path, self.parquet_path)
+            fresh = type(self).load_duckdb(
+                self.csv_path, self.parquet_path, cache_size=self.cache.maxsize,
+                **self._options()
+            )
+            self.backend = fresh.backend
+        elif self.streaming:
+            fresh = type(self).load_streaming(
+                self.csv_path, self.chunk_rows, self.spill_dir, self.cache.maxsize,
+                **self._options()
+            )
+        else:
+            storage.convert_csv_to_parquet(self.csv_path, self.parquet_path)
+            fresh = type(self).load(
+                self.csv_path, self.parquet_path, self.cache.maxsize, **self._options()
+            )
+        self.df, self.index, self.cube = fresh.df, fresh.index, fresh.cube
+        self.spill_generation, self.spill_parts = fresh.spill_generation, fresh.spill_parts
+        self._build_yoy(fresh.yoy)
+        self.source_offset = fresh.source_offset
+        self.version += 1
+        self.cache.clear()
+        self.order_cache.clear()
+
+    # ---- Opsi filter ----
+    def years(self):
+        """Daftar tahun yang tersedia (terbaru dulu)"""
+        return sorted(self.cube['Year'].unique().tolist(), reverse=True)
+
+    def models(self):
+        """Daftar model yang tersedia"""
+        return sorted(self.cube['Model'].unique().tolist())
+
+    def transmissions(self):
+        """Daftar jenis transmisi yang tersedia"""
+        return sorted(self.cube['Transmission'].unique().tolist())
+
+    def regions(self):
+        """Daftar region yang tersedia"""
+        return sorted(self.cube['Region'].unique().tolist())
+
+    def fuel_types(self):
+        """Daftar jenis bahan bakar yang tersedia"""
+        return sorted(self.cube['Fuel_Type'].unique().tolist())
+
+    # ---- Filter ----
+    def filter(self, state):
+        """Baris mentah yang lolos filter (Price_USD dalam float64)"""
+        if self.backend is not None:
+            # Mode DuckDB: filter di-push down ke scan Parquet
+            rows = self.backend.rows(state.selections(), ROW_COLUMNS)
+            return rows.astype({'Price_USD': 'float64'})
+        if self.streaming:
+            # Mode streaming: baris mentah hanya tersedia dari spill (jika ada)
+            if not self.spill_generation:
+                return pd.DataFrame({col: [] for col in ROW_COLUMNS})
+            rows = storage.read_spill(self.spill_parts, ROW_COLUMNS, **state.selections())
+            return rows.astype({'Price_USD': 'float64'})
+        rows = self.index.take(self.df, **state.selections())
+        # Agregasi dihitung dalam float64 (penyimpanan tetap float32 agar hemat memori)
+        return rows.astype({'Price_USD': 'float64'})
+
+    def slice(self, state, rates=None):
+        """Sel cube yang lolos filter (dalam mata uang `rates`, default USD)"""
+        return slice_cube(self.cube_in(rates), **state.selections())
+
+    def is_empty(self, state):
+        """True jika tidak ada data yang sesuai filter"""
+        return self._cached('empty', state, lambda s: self.slice(s).empty)
+
+    # ---- Drill-down baris mentah ----
+    def row_page(self, state, offset=0, limit=DEFAULT_PAGE_SIZE, sort_by=None, descending=False):
+        """Satu halaman baris mentah yang lolos filter, diurutkan di engine.
+
+        Hanya jendela [offset, offset + limit) yang dibentuk menjadi frame,
+        sehingga ukuran hasil tetap per halaman berapa pun besar slice-nya.
+        Mengembalikan (baris_halaman, total_baris).
+        """
+        if sort_by is not None and sort_by not in ROW_COLUMNS:
+            raise ValueError(f"Kolom urut tidak dikenal: {sort_by}")
+
+        if self.backend is not None:
+            # Mode DuckDB: ORDER BY + LIMIT/OFFSET di-push down ke scan Parquet
+            rows = self.backend.row_page(
+                state.selections(), ROW_COLUMNS, offset, limit, sort_by, descending
+            )
+            total = self.row_total(state)
+        elif self.streaming:
+            # Mode streaming: jendela halaman dibaca dari spill (jika ada) lewat
+            # pyarrow; hanya baris halaman yang dikonversi ke pandas
+            total = self.row_total(state)
+            rows = storage.read_spill_page(
+                self.spill_parts, ROW_COLUMNS, offset, limit, sort_by, descending, total,
+                **state.selections()
+            )
+        else:
+            # Urutan posisi baris di-cache per (state, urutan) selama muat di
+            # batas byte order_cache; halaman = satu take
+            order = self.order_cache.get_or_compute(
+                (self.version, state, sort_by, descending),
+                lambda: self._row_order(state, sort_by, descending)
+            )
+            total = len(order)
+            rows = self.df.take(order[offset:offset + limit])
+        return rows.astype({'Price_USD': 'float64'}).reset_index(drop=True), total
+
+    def row_total(self, state):
+        """Jumlah baris mentah yang lolos filter (untuk jumlah halaman drill-down)"""
+        if self.backend is not None:
+            return self._cached('row_total', state, lambda s: self.backend.count(s.selections()))
+        if self.streaming:
+            return self._cached(
+                'row_total', state,
+                lambda s: storage.count_spill(self.spill_parts, **s.selections())
+            )
+        return self._cached('row_total', state, lambda s: len(self._row_order(s, None, False)))
+
+    def _row_order(self, state, sort_by, descending):
+        """Posisi baris yang lolos filter, urut `sort_by` (stabil; None = urutan data)"""
+        rows = self.index.rows(**state.selections())
+        if rows is None:
+            rows = np.arange(len(self.df))
+        if sort_by is None:
+            return rows[::-1] if descending else rows
+        column = self.df[sort_by]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Kategori terurut -> urutan kode sama dengan urutan nilai
+            keys = column.cat.codes.to_numpy()
+        else:
+            keys = column.to_numpy()
+        keys = keys[rows].astype('float64')
+        return rows[np.argsort(-keys if descending else keys, kind='stable')]
+
+    # ---- Panel ----
+    def kpis(self, state, rates=None):
+        """Nilai & persentase perubahan untuk 4 kartu KPI"""
+        parts = self._cached('kpis', state, self._kpi_parts)
+
+        if not parts['has_actual']:
+            # Fallback jika tidak ada data actual
+            total = _year_summary(parts['total'], rates)
+            return {
+                'has_actual': False,
+                'min': total['min'], 'max': total['max'],
+                'avg': total['mean'], 'predicted': total['mean'],
+                'min_pct': 0, 'max_pct': 0, 'avg_pct': 0, 'pred_pct': 0,
+            }
+
+        current_year, prev_year = parts['current_year'], parts['prev_year']
+        current = _year_summary(parts['current'], rates)
+        prev = _year_summary(parts['prev'], rates)
+
+        min_price = current['min'] if current else 0
+        max_price = current['max'] if current else 0
+        avg_price = current['mean'] if current else 0
+
+        min_prev = prev['min'] if prev else min_price
+        max_prev = prev['max'] if prev else max_price
+        avg_prev = prev['mean'] if prev else avg_price
+
+        forecast = _year_summary(parts['forecast'], rates)
+        predicted = forecast['mean'] if forecast else avg_price
+
+        return {
+            'has_actual': True,
+            'current_year': int(current_year),
+            'prev_year': int(prev_year),
+            'min': min_price, 'max': max_price,
+            'avg': avg_price, 'predicted': predicted,
+            'min_pct': _pct(min_price, min_prev),
+            'max_pct': _pct(max_price, max_prev),
+            'avg_pct': _pct(avg_price, avg_prev),
+            'pred_pct': _pct(predicted, avg_price) if forecast else 0,
+        }
+
+    def _kpi_parts(self, state):
+        """Measure KPI per Year dalam USD (kurs diterapkan di `kpis` setelah lookup)"""
+        filtered_cube = self.slice(state)
+        actual_cube = filtered_cube[filtered_cube['Type'] == 'Actual']
+        forecast_cube = filtered_cube[filtered_cube['Type'] == 'Forecast']
+
+        if actual_cube.empty:
+            return {'has_actual': False, 'total': rollup(filtered_cube, ['Year'])}
+
+        selected_years = state.years()
+        if selected_years is not None:
+            # Tahun/rentang spesifik: lookup tabel YoY, setiap baris sudah memuat
+            # nilai tahun sebelumnya (rentang dibandingkan dengan rentang mundur 1 tahun)
+            current_year = selected_years[-1]
+            prev_year = current_year - 1
+            current, prev = yoy_by_year(slice_cube(self.yoy, **state.selections()))
+        else:
+            # "All": ambil tahun terbaru dan sebelumnya
+            by_year = rollup(actual_cube, ['Year'])
+            available_years = by_year['Year'].tolist()
+            current_year = available_years[-1]
+            prev_year = available_years[-2] if len(available_years) >= 2 else current_year - 1
+            current = by_year[by_year['Year'] == current_year]
+            prev = by_year[by_year['Year'] == prev_year]
+
+        return {
+            'has_actual': True,
+            'current_year': int(current_year),
+            'prev_year': int(prev_year),
+            'current': current,
+            'prev': prev,
+            'forecast': rollup(forecast_cube, ['Year']),
+        }
+
+    def trend(self, state, rates=None):
+        """Rata-rata harga per (Year, Model) dengan kolom Year, Model, Price.
+
+        Kolom harga bernama Price_USD, atau Price_<kode> jika `rates` diisi.
+        """
+        trend_data = rollup(self._by_year_in(state, ['Model'], rates), ['Year', 'Model'])
+        trend_data = trend_data[['Year', 'Model', 'mean']]
+        return trend_data.rename(columns={'mean': price_column(rates)})
+
+    def model_averages(self, state, rates=None):
+        """Rata-rata harga per model (urut naik) untuk bar chart"""
+        price = price_column(rates)
+        model_avg = rollup(self._by_year_in(state, ['Model'], rates), ['Model'])[['Model', 'mean']]
+        model_avg = model_avg.rename(columns={'mean': price})
+        return model_avg.sort_values(price, ascending=True)
+
+    def model_table(self, state, rates=None):
+        """Rata-rata, prediksi & Total per model"""
+        return cube_model_table(self._by_year_in(state, ['Model', 'Type'], rates))
+
+    def insights(self, state):
+        """Ranking insight per model, atau None jika data tidak cukup"""
+        return self._cached('insights', state, self._compute_insights)
+
+    def _compute_insights(self, state):
+        table = self.insight_table
+        if table is not None and table.version == self.version and table.covers(state):
+            return table.ranking(state)
+
+        # Rata-rata forecast per model dari cube (forecast CSV maupun model)
+        forecast_cube = slice_cube(self.slice(state), Type=['Forecast'])
+        forecast = rollup(forecast_cube, ['Model'])[['Model', 'mean']]
+        forecast = forecast.rename(columns={'mean': 'Price_USD'})
+
+        if self.backend is not None:
+            # Statistik actual per model dihitung di DuckDB (hanya hasil agregat ke Python)
+            stats = self.backend.insight_stats(state.selections())
+            return rank_models(insights_from_stats(stats, forecast))
+
+        filtered_df = self.filter(state)
+        actual = filtered_df[filtered_df['Type'] == 'Actual']
+        return rank_models(model_insights(actual, forecast))
@@ -0,0 +1,301 @@
+"""Forecast harga per seri dari data Actual.
+
+Setiap seri (Model, Region, Fuel_Type, Transmission) dibentuk dari sel cube
+bertipe Actual menjadi satu baris matriks seri x tahun. Tiga model di-fit
+sekaligus untuk semua seri dengan operasi array (tanpa loop per seri):
+
+- tren linear (weighted least squares, bobot = jumlah listing),
+- tren log-linear (pertumbuhan persentase konstan),
+- Holt exponential smoothing (grid alpha/beta dievaluasi serentak).
+
+Model per seri dipilih berdasarkan galat holdout tahun actual terakhir.
+Untuk jumlah seri besar, fitting dibagi per blok ke process pool. Parameter
+hasil fit disimpan ke Parquet dengan fingerprint data actual, sehingga
+start berikutnya tanpa perubahan data tidak melakukan fitting ulang.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from bmw_dashboard.cube import MEASURES
+
+SERIES_KEYS = ['Model', 'Region', 'Fuel_Type', 'Transmission']
+METHODS = ('linear', 'log', 'holt')
+
+CACHE_PATH = 'bmw_pricing_data.forecast.parquet'
+# Key metadata Parquet untuk fingerprint data actual yang di-fit
+FINGERPRINT_KEY = b'bmw_dashboard.forecast_fingerprint'
+# Naikkan jika cara fitting berubah agar cache lama tidak dipakai
+FORECAST_VERSION = 1
+
+# Jumlah tahun setelah tahun actual terakhir yang diprediksi
+DEFAULT_HORIZON = 3
+
+# Grid parameter Holt (dievaluasi serentak untuk semua seri)
+HOLT_ALPHAS = np.array([0.1, 0.2, 0.3, 0.5, 0.7, 0.9])
+HOLT_BETAS = np.array([0.05, 0.1, 0.3, 0.5])
+
+# Di atas jumlah seri ini fitting dibagi ke process pool
+POOL_MIN_SERIES = 50_000
+
+
+def pool_context():
+    """Konteks process pool tanpa fork langsung dari proses ini.
+
+    Fitting bisa dipanggil dari server Streamlit atau thread refresher; fork
+    dari proses multithread bisa deadlock pada lock yang sedang dipegang
+    thread lain. Worker dibuat lewat forkserver (atau spawn) dan hanya
+    menerima array blok seri.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+# ========================================
+# MATRIKS SERI
+# ========================================
+def series_matrix(cube):
+    """Susun sel Actual menjadi matriks seri x tahun.
+
+    Mengembalikan (keys, years, values, weights): `keys` frame kunci seri,
+    `years` array tahun, `values` rata-rata harga (NaN jika kosong) dan
+    `weights` jumlah listing per sel.
+    """
+    actual = cube[cube['Type'] == 'Actual']
+    cells = actual.groupby(SERIES_KEYS + ['Year'], observed=True, sort=True)[['count', 'sum']].sum()
+    cells = cells[cells['count'] > 0].reset_index()
+
+    series_id = cells.groupby(SERIES_KEYS, observed=True, sort=True).ngroup().to_numpy()
+    keys = cells[SERIES_KEYS].drop_duplicates().reset_index(drop=True)
+    years = np.sort(cells['Year'].unique()).astype('int64')
+    year_pos = np.searchsorted(years, cells['Year'].to_numpy())
+
+    values = np.full((len(keys), len(years)), np.nan)
+    weights = np.zeros((len(keys), len(years)))
+    values[series_id, year_pos] = cells['sum'].to_numpy() / cells['count'].to_numpy()
+    weights[series_id, year_pos] = cells['count'].to_numpy()
+    return keys, years, values, weights
+
+
+# ========================================
+# FITTING (VEKTOR UNTUK SEMUA SERI)
+# ========================================
+def fit_trend(t, values, weights):
+    """Weighted least squares y = intercept + slope * t untuk setiap baris"""
+    w = np.where(np.isnan(values), 0.0, weights)
+    y = np.nan_to_num(values)
+    sw = w.sum(axis=1)
+    st = w @ t
+    sy = (w * y).sum(axis=1)
+    stt = w @ (t * t)
+    sty = (w * y) @ t
+
+    denom = sw * stt - st * st
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = np.where(denom > 0, (sw * sty - st * sy) / denom, 0.0)
+        intercept = (sy - slope * st) / sw
+    return intercept, slope
+
+
+def fit_holt(values):
+    """Holt exponential smoothing dengan grid alpha/beta untuk semua seri.
+
+    Tahun kosong melanjutkan level + tren tanpa update. Mengembalikan
+    (level, trend, alpha, beta) di tahun terakhir matriks, dengan alpha/beta
+    per seri yang meminimalkan galat one-step-ahead.
+    """
+    alpha, beta = np.meshgrid(HOLT_ALPHAS, HOLT_BETAS, indexing='ij')
+    alpha = alpha.reshape(-1, 1)
+    beta = beta.reshape(-1, 1)
+    shape = (len(alpha), values.shape[0])
+
+    level = np.full(shape, np.nan)
+    trend = np.zeros(shape)
+    sse = np.zeros(shape)
+    for y in values.T:
+        observed = ~np.isnan(y)
+        started = ~np.isnan(level)
+        update = observed & started
+        predicted = level + trend
+
+        error = np.where(update, y - predicted, 0.0)
+        sse += error * error
+
+        new_level = alpha * y + (1 - alpha) * predicted
+        new_trend = beta * (new_level - level) + (1 - beta) * trend
+        trend = np.where(update, new_trend, trend)
+        # Belum mulai -> inisialisasi dengan observasi pertama; kosong -> lanjutkan tren
+        carried = np.where(started, predicted, np.where(observed, y, np.nan))
+        level = np.where(update, new_level, carried)
+
+    best = sse.argmin(axis=0)
+    columns = np.arange(values.shape[0])
+    return (
+        level[best, columns], trend[best, columns],
+        alpha[best, 0], beta[best, 0],
+    )
+
+
+def _fit_methods(years, values, weights):
+    """Parameter ketiga model untuk semua seri (frame, satu baris per seri)"""
+    t = (years - years[0]).astype(float)
+    lin_intercept, lin_slope = fit_trend(t, values, weights)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        log_values = np.log(np.where(values > 0, values, np.nan))
+    log_intercept, log_slope = fit_trend(t, log_values, weights)
+    level, trend, alpha, beta = fit_holt(values)
+
+    observed = weights > 0
+    return pd.DataFrame({
+        'first_year': years[0],
+        'last_year': years[-1],
+        'weight': weights.sum(axis=1) / np.maximum(observed.sum(axis=1), 1),
+        'lin_intercept': lin_intercept, 'lin_slope': lin_slope,
+        'log_intercept': log_intercept, 'log_slope': log_slope,
+        'holt_level': level, 'holt_trend': trend,
+        'holt_alpha': alpha, 'holt_beta': beta,
+    })
+
+
+def _method_predictions(params, year):
+    """Prediksi ketiga model untuk satu tahun (array per seri per model)"""
+    t = year - params['first_year'].to_numpy()
+    return {
+        'linear': params['lin_intercept'].to_numpy() + params['lin_slope'].to_numpy() * t,
+        'log': np.exp(params['log_intercept'].to_numpy() + params['log_slope'].to_numpy() * t),
+        'holt': params['holt_level'].to_numpy()
+                + params['holt_trend'].to_numpy() * (year - params['last_year'].to_numpy()),
+    }
+
+
+def _fit_block(block):
+    """Fit satu blok seri: pilih model via holdout, lalu fit ulang dengan data penuh"""
+    years, values, weights = block
+    params = _fit_methods(years, values, weights)
+    params['method'] = 'linear'
+
+    if len(years) >= 3:
+        # Holdout: fit tanpa tahun terakhir, pilih model dengan galat terkecil
+        holdout = _fit_methods(years[:-1], values[:, :-1], weights[:, :-1])
+        predictions = _method_predictions(holdout, years[-1])
+        errors = np.vstack([np.abs(predictions[m] - values[:, -1]) for m in METHODS])
+        errors = np.where(np.isnan(errors), np.inf, errors)
+        has_holdout = ~np.isnan(values[:, -1])
+        params['method'] = np.where(
+            has_holdout, np.asarray(METHODS)[errors.argmin(axis=0)], 'linear'
+        )
+    return params
+
+
+def fit_series(cube, workers=None):
+    """Fit semua seri dari cube; kembalikan frame kunci seri + parameter"""
+    keys, years, values, weights = series_matrix(cube)
+    if keys.empty:
+        return pd.DataFrame(columns=SERIES_KEYS)
+
+    if len(keys) >= POOL_MIN_SERIES and workers != 1:
+        # Seri independen -> fitting per blok di process pool
+        n_blocks = workers or os.cpu_count() or 1
+        blocks = [
+            (years, values[rows], weights[rows])
+            for rows in np.array_split(np.arange(len(keys)), n_blocks) if len(rows)
+        ]
+        with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context()) as pool:
+            params = pd.concat(pool.map(_fit_block, blocks), ignore_index=True)
+    else:
+        params = _fit_block((years, values, weights))
+
+    return pd.concat([keys, params], axis=1)
+
+
+# ========================================
+# PREDIKSI
+# ========================================
+def predict(params, years):
+    """Prediksi harga untuk setiap seri x tahun (frame kunci seri, Year, Price_USD, weight)"""
+    frames = []
+    methods = params['method'].to_numpy()
+    for year in years:
+        predictions = _method_predictions(params, year)
+        price = np.select([methods == m for m in METHODS], [predictions[m] for m in METHODS])
+        frames.append(params[SERIES_KEYS + ['weight']].assign(Year=year, Price_USD=price))
+    if not frames:
+        return pd.DataFrame(columns=SERIES_KEYS + ['weight', 'Year', 'Price_USD'])
+    result = pd.concat(frames, ignore_index=True)
+    # Harga tidak boleh negatif (tren linear yang turun tajam)
+    result['Price_USD'] = result['Price_USD'].clip(lower=0)
+    return result
+
+
+def forecast_years(cube, horizon=DEFAULT_HORIZON):
+    """Tahun yang diprediksi: `horizon` tahun setelah tahun actual terakhir"""
+    actual_years = cube.loc[cube['Type'] == 'Actual', 'Year']
+    if actual_years.empty:
+        return []
+    last = int(actual_years.max())
+    return list(range(last + 1, last + 1 + horizon))
+
+
+def forecast_cube(cube, params, horizon=DEFAULT_HORIZON):
+    """Sel cube bertipe Forecast dari hasil prediksi (kategori sama dengan `cube`)"""
+    predicted = predict(params, forecast_years(cube, horizon))
+    count = np.maximum(np.rint(predicted['weight'].to_numpy()), 1).astype('int64')
+    price = predicted['Price_USD'].to_numpy()
+
+    cells = pd.DataFrame({
+        'Year': predicted['Year'].astype(cube['Year'].dtype).to_numpy(),
+        **{key: predicted[key].astype(cube[key].dtype) for key in SERIES_KEYS},
+        'Type': pd.Categorical(['Forecast'] * len(predicted), dtype=cube['Type'].dtype),
+        'count': count,
+        'sum': price * count,
+        'sumsq': price * price * count,
+        'min': price,
+        'max': price,
+    })
+    return cells[list(cube.columns)]
+
+
+def with_model_forecast(cube, cache_path=CACHE_PATH, horizon=DEFAULT_HORIZON, workers=None):
+    """Ganti sel Forecast dari CSV dengan forecast hasil model (parameter dari cache disk)"""
+    params = fit_cached(cube, cache_path, workers)
+    actual = cube[cube['Type'] == 'Actual']
+    if params.empty:
+        return actual.reset_index(drop=True)
+    combined = pd.concat([actual, forecast_cube(cube, params, horizon)], ignore_index=True)
+    dimensions = [col for col in cube.columns if col not in MEASURES]
+    return combined.sort_values(dimensions, ignore_index=True)
+
+
+# ========================================
+# CACHE PARAMETER DI DISK
+# ========================================
+def fingerprint(cube):
+    """Hash sel Actual cube; berubah jika data actual berubah"""
+    actual = cube.loc[cube['Type'] == 'Actual', SERIES_KEYS + ['Year', 'count', 'sum']]
+    hashed = pd.util.hash_pandas_object(actual.astype({k: str for k in SERIES_KEYS}), index=False)
+    return f"{FORECAST_VERSION}:{len(actual)}:{int(hashed.sum()) & 0xFFFFFFFFFFFFFFFF:x}"
+
+
+def fit_cached(cube, cache_path=CACHE_PATH, workers=None):
+    """Parameter fit dari cache disk jika fingerprint cocok, selain itu fit & simpan"""
+    key = fingerprint(cube)
+    if cache_path and os.path.exists(cache_path):
+        metadata = pq.read_schema(cache_path).metadata or {}
+        if metadata.get(FINGERPRINT_KEY) == key.encode():
+            return pd.read_parquet(cache_path)
+
+    params = fit_series(cube, workers)
+    if cache_path and not params.empty:
+        table = pa.Table.from_pandas(params, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}), FINGERPRINT_KEY: key.encode()
+        })
+        tmp_path = f"{cache_path}.tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, cache_path)
+    return params
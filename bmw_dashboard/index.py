@@ -0,0 +1,190 @@
+"""Indeks filter yang dibangun sekali saat load data.
+
+Untuk setiap kolom filter disimpan daftar row-id terurut per nilai (posting
+list). Kombinasi filter dijawab dengan mengambil posting list terkecil lalu
+memeriksa kode kategori kolom lain hanya untuk baris kandidat tersebut,
+sehingga tidak ada scan penuh maupun salinan frame perantara.
+
+Baris yang di-append bisa digabungkan lewat `extended()` tanpa mengurutkan
+ulang seluruh indeks: row-id baru selalu lebih besar dari row-id lama, jadi
+cukup disisipkan di akhir posting list nilainya masing-masing.
+"""
+import numpy as np
+import pandas as pd
+
+INDEXED_COLUMNS = ('Transmission', 'Year', 'Model', 'Region', 'Fuel_Type', 'Type')
+
+
+def _as_categorical(series):
+    """Representasi Categorical dari kolom (tanpa salinan jika sudah kategori)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.array
+    return pd.Categorical(series)
+
+
+def _row_dtype(n_rows):
+    """Dtype row-id terkecil yang cukup untuk n_rows"""
+    return np.int32 if n_rows < np.iinfo(np.int32).max else np.int64
+
+
+def _code_dtype(codes, n_categories):
+    """Dtype kode (bertanda, -1 = kosong) yang cukup untuk n_categories kategori"""
+    return np.promote_types(codes.dtype, np.result_type(np.int8, np.min_scalar_type(n_categories)))
+
+
+class ColumnPostings:
+    """Posting list (row-id terurut) per nilai untuk satu kolom"""
+
+    def __init__(self, series):
+        categorical = _as_categorical(series)
+        self.categories = categorical.categories
+        self.codes = np.asarray(categorical.codes)
+
+        # Sort stabil -> row-id di dalam setiap nilai tetap berurutan
+        self.order = np.argsort(self.codes, kind='stable').astype(_row_dtype(len(series)))
+        counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.categories))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        # Baris dengan nilai kosong (kode -1) berada di awal urutan
+        self.offsets += int((self.codes < 0).sum())
+
+    @classmethod
+    def from_arrays(cls, categories, codes, order, offsets):
+        """Posting list dari array yang sudah ada (mis. memory-mapped), tanpa sort ulang"""
+        postings = object.__new__(cls)
+        postings.categories = categories
+        postings.codes = codes
+        postings.order = order
+        postings.offsets = offsets
+        return postings
+
+    def extended(self, series):
+        """Posting list baru yang mencakup baris `series` yang di-append"""
+        categorical = _as_categorical(series)
+        missing = categorical.categories.difference(self.categories)
+        categories = self.categories.append(missing) if len(missing) else self.categories
+
+        # Petakan kode baris baru ke kategori gabungan
+        # (elemen terakhir -1 agar kode kosong tetap -1)
+        mapping = np.append(categories.get_indexer(categorical.categories), -1)
+        new_codes = mapping[np.asarray(categorical.codes)]
+
+        # Bucket 0 = nilai kosong, bucket c+1 = kode c
+        n_buckets = len(categories) + 1
+        old_counts = np.diff(np.concatenate([[0], self.offsets]))
+        old_counts = np.pad(old_counts, (0, n_buckets - len(old_counts)))
+        new_buckets = new_codes + 1
+        new_counts = np.bincount(new_buckets, minlength=n_buckets)
+        old_starts = np.concatenate([[0], np.cumsum(old_counts)[:-1]])
+        new_starts = np.concatenate([[0], np.cumsum(new_counts)[:-1]])
+        starts = old_starts + new_starts
+
+        n_old = len(self.codes)
+        order = np.empty(n_old + len(new_codes), dtype=_row_dtype(n_old + len(new_codes)))
+
+        # Posting lama bergeser sebanyak baris baru di bucket sebelumnya
+        old_buckets = np.repeat(np.arange(n_buckets), old_counts)
+        order[np.arange(n_old) + (starts - old_starts)[old_buckets]] = self.order
+
+        # Posting baru ditempatkan setelah posting lama di bucket yang sama
+        new_order = np.argsort(new_buckets, kind='stable')
+        sorted_buckets = new_buckets[new_order]
+        within = np.arange(len(new_codes)) - new_starts[sorted_buckets]
+        order[starts[sorted_buckets] + old_counts[sorted_buckets] + within] = new_order + n_old
+
+        postings = object.__new__(ColumnPostings)
+        postings.categories = categories
+        # Kategori baru bisa melewati batas dtype kode lama (mis. int8 > 127 kategori)
+        code_dtype = _code_dtype(self.codes, len(categories))
+        postings.codes = np.concatenate([self.codes.astype(code_dtype, copy=False), new_codes.astype(code_dtype)])
+        postings.order = order
+        postings.offsets = np.cumsum(old_counts + new_counts)
+        return postings
+
+    def lookup_codes(self, values):
+        """Kode kategori untuk nilai yang dipilih (nilai tak dikenal diabaikan)"""
+        codes = self.categories.get_indexer(pd.Index(list(values)))
+        return np.unique(codes[codes >= 0])
+
+    def count(self, codes):
+        """Jumlah baris yang cocok dengan kode-kode tersebut"""
+        return int((self.offsets[codes + 1] - self.offsets[codes]).sum())
+
+    def rows(self, codes):
+        """Row-id terurut untuk kode-kode tersebut"""
+        if len(codes) == 0:
+            return self.order[:0]
+        if len(codes) == 1:
+            code = codes[0]
+            return self.order[self.offsets[code]:self.offsets[code + 1]]
+        parts = [self.order[self.offsets[c]:self.offsets[c + 1]] for c in codes]
+        return np.sort(np.concatenate(parts))
+
+    def member_mask(self, rows, codes):
+        """Mask boolean: apakah baris kandidat memiliki salah satu kode"""
+        lut = np.zeros(len(self.categories), dtype=bool)
+        lut[codes] = True
+        row_codes = self.codes[rows]
+        return (row_codes >= 0) & lut[row_codes]
+
+
+class FilterIndex:
+    """Indeks row-id untuk kombinasi filter Transmission/Year/Model/Region/Fuel_Type/Type"""
+
+    def __init__(self, df, columns=INDEXED_COLUMNS):
+        self.n_rows = len(df)
+        self.columns = {col: ColumnPostings(df[col]) for col in columns}
+
+    @classmethod
+    def from_postings(cls, columns, n_rows):
+        """Indeks dari posting list per kolom yang sudah jadi"""
+        index = object.__new__(cls)
+        index.n_rows = n_rows
+        index.columns = dict(columns)
+        return index
+
+    def extended(self, new_rows):
+        """Indeks baru yang mencakup baris append `new_rows` (indeks lama tidak diubah)"""
+        index = object.__new__(FilterIndex)
+        index.n_rows = self.n_rows + len(new_rows)
+        index.columns = {
+            col: postings.extended(new_rows[col]) for col, postings in self.columns.items()
+        }
+        return index
+
+    def rows(self, **selections):
+        """Row-id terurut yang lolos semua filter.
+
+        Setiap argumen berupa daftar nilai yang diizinkan untuk kolom itu;
+        None berarti kolom tidak difilter. Mengembalikan None jika tidak ada
+        filter yang aktif (semua baris lolos).
+        """
+        constraints = []
+        for col, values in selections.items():
+            if values is None:
+                continue
+            postings = self.columns[col]
+            codes = postings.lookup_codes(values)
+            # Semua nilai dipilih -> kolom ini tidak membatasi apa pun
+            if len(codes) == len(postings.categories) and postings.offsets[0] == 0:
+                continue
+            constraints.append((postings.count(codes), postings, codes))
+
+        if not constraints:
+            return None
+
+        # Mulai dari posting list terkecil, lalu saring dengan kolom lain
+        constraints.sort(key=lambda item: item[0])
+        _, postings, codes = constraints[0]
+        rows = postings.rows(codes)
+        for _, postings, codes in constraints[1:]:
+            if len(rows) == 0:
+                break
+            rows = rows[postings.member_mask(rows, codes)]
+        return rows
+
+    def take(self, df, **selections):
+        """Ambil baris df yang lolos filter dengan satu kali `take`"""
+        rows = self.rows(**selections)
+        if rows is None:
+            return df
+        return df.take(rows)
@@ -0,0 +1,114 @@
+"""Analisis pasar per model untuk kartu "Analisis Pasar & Rekomendasi Investasi".
+
+Semua statistik per model (rata-rata terkini, tren, tren masa depan dan
+volatilitas) dihitung dengan beberapa reduksi grouped atas seluruh baris,
+bukan satu mask boolean per model.
+"""
+import numpy as np
+import pandas as pd
+
+INSIGHT_COLUMNS = ['model', 'current_avg', 'trend_pct', 'future_trend_pct', 'volatility']
+
+# Jumlah baris terakhir yang dianggap "harga saat ini"
+RECENT_ROWS = 3
+
+
+def _pct_change(new, base):
+    """Persentase perubahan, 0 jika base tidak positif"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pct = (new - base) / base * 100
+    return pct.where(base > 0, 0.0)
+
+
+def model_insights(actual, forecast):
+    """Statistik insight untuk setiap model sekaligus.
+
+    `actual` dan `forecast` adalah baris bertipe Actual dan Forecast dengan
+    kolom Model, Year dan Price_USD. Hanya model dengan minimal 2 baris
+    actual yang dianalisis; urutan baris mengikuti kemunculan pertama model.
+    """
+    if actual.empty:
+        return pd.DataFrame(columns=INSIGHT_COLUMNS)
+
+    # Urutkan per tahun (stabil) lalu tandai posisi baris di dalam tiap model
+    ordered = actual[['Model', 'Year', 'Price_USD']].sort_values('Year', kind='stable')
+    models = ordered['Model']
+    price = ordered['Price_USD'].astype('float64')
+    grouped = price.groupby(models, observed=True, sort=False)
+
+    position = grouped.cumcount().to_numpy()
+    size = grouped.transform('size').to_numpy()
+
+    # 3 baris terakhir vs baris sebelumnya (minimal 3 baris pertama)
+    recent_mask = position >= size - RECENT_ROWS
+    older_mask = position < np.maximum(RECENT_ROWS, size - RECENT_ROWS)
+    recent_avg = price.where(recent_mask).groupby(models, observed=True).mean()
+    older_avg = price.where(older_mask).groupby(models, observed=True).mean()
+
+    stats = pd.DataFrame({
+        'count': grouped.size(),
+        'current_avg': recent_avg,
+        'older_avg': older_avg,
+        'volatility': grouped.std(),
+    })
+
+    # Urutan model mengikuti kemunculan pertama di data actual
+    order = pd.Index(actual['Model'].unique())
+    return insights_from_stats(stats.reindex(order), forecast)
+
+
+def insights_from_stats(stats, forecast):
+    """Lengkapi statistik actual per model menjadi kolom INSIGHT_COLUMNS.
+
+    `stats` ber-index Model (urut kemunculan pertama) dengan kolom count,
+    current_avg, older_avg dan volatility, dari pandas (`model_insights`)
+    maupun dari backend query lain (mis. DuckDB).
+    """
+    if stats.empty:
+        return pd.DataFrame(columns=INSIGHT_COLUMNS)
+
+    future_avg = (
+        forecast['Price_USD'].astype('float64')
+        .groupby(forecast['Model'].astype(str))
+        .mean()
+    )
+    stats = stats.assign(future_avg=future_avg.reindex(stats.index.astype(str)).to_numpy())
+    stats = stats[stats['count'] >= 2]
+
+    stats['trend_pct'] = _pct_change(stats['current_avg'], stats['older_avg'])
+    stats['future_trend_pct'] = _pct_change(stats['future_avg'], stats['current_avg'])
+    stats['future_trend_pct'] = stats['future_trend_pct'].fillna(0.0)
+
+    stats = stats.rename_axis('model').reset_index()
+    stats['model'] = stats['model'].astype(str)
+    return stats[INSIGHT_COLUMNS].reset_index(drop=True)
+
+
+def rank_models(analysis):
+    """Ranking insight: model terbaik, terburuk, prediksi terbaik & paling stabil.
+
+    Mengembalikan dict berisi record (dict) per peran, atau None jika
+    `analysis` kosong.
+    """
+    if analysis.empty:
+        return None
+
+    by_trend = analysis.sort_values('trend_pct', ascending=False, kind='stable')
+    # Diurutkan dari ranking tren (stabil): jika seri, model dengan tren terbaik menang
+    by_future = by_trend.sort_values('future_trend_pct', ascending=False, kind='stable')
+    by_volatility = by_trend.sort_values('volatility', kind='stable')
+
+    return {
+        'best': by_trend.iloc[0].to_dict(),
+        'worst': by_trend.iloc[-1].to_dict(),
+        'best_future': by_future.iloc[0].to_dict(),
+        'most_stable': by_volatility.iloc[0].to_dict(),
+        'count': len(analysis),
+    }
+
+
+def insight_ranking(df):
+    """Shortcut: analisis & ranking langsung dari frame dengan kolom Type"""
+    actual = df[df['Type'] == 'Actual']
+    forecast = df[df['Type'] == 'Forecast']
+    return rank_models(model_insights(actual, forecast))
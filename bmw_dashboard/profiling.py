@@ -0,0 +1,135 @@
+"""Instrumentasi waktu per section untuk setiap rerun dashboard (opt-in).
+
+`RerunProfiler` mengukur durasi section bernama (load, filter, kpi, trend,
+insights, bar, table, drilldown, render) dalam satu rerun. `ProfileStore` dipakai
+bersama oleh semua sesi di proses, menyimpan sampel terakhir per section
+untuk agregat p50/p95, dan bisa mengekspor ke file JSON-lines maupun file
+teks format Prometheus (untuk textfile collector).
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+SECTIONS = ('load', 'filter', 'kpi', 'trend', 'insights', 'bar', 'table', 'drilldown', 'render')
+
+# Jumlah sampel terakhir per section untuk perhitungan persentil
+DEFAULT_WINDOW = 1000
+
+PROMETHEUS_METRIC = 'bmw_dashboard_section_seconds'
+
+
+class RerunProfiler:
+    """Stopwatch per section untuk satu rerun.
+
+    `enter(name)` menutup section yang sedang berjalan dan membuka section
+    baru; section yang dimasuki berulang kali dijumlahkan. Jika profiler
+    tidak aktif, semua pemanggilan tidak melakukan apa pun.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.timings = {}
+        self._current = None
+        self._started = None
+
+    def enter(self, name):
+        """Mulai section `name` (menutup section sebelumnya)"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._close(now)
+        self._current = name
+        self._started = now
+
+    def stop(self):
+        """Tutup section yang sedang berjalan"""
+        if self.enabled:
+            self._close(time.perf_counter())
+
+    def _close(self, now):
+        if self._current is not None:
+            elapsed = now - self._started
+            self.timings[self._current] = self.timings.get(self._current, 0.0) + elapsed
+            self._current = None
+
+    def total(self):
+        """Total durasi semua section (detik)"""
+        return sum(self.timings.values())
+
+
+class ProfileStore:
+    """Agregat timing lintas sesi + ekspor JSON-lines / Prometheus"""
+
+    def __init__(self, window=DEFAULT_WINDOW, jsonl_path=None, prometheus_path=None):
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self.window = window
+        self._samples = {name: deque(maxlen=window) for name in SECTIONS}
+        self._sums = dict.fromkeys(SECTIONS, 0.0)
+        self._counts = dict.fromkeys(SECTIONS, 0)
+        self._lock = threading.Lock()
+
+    def record(self, timings, **labels):
+        """Simpan timing satu rerun dan perbarui file ekspor"""
+        with self._lock:
+            for name, seconds in timings.items():
+                if name not in self._samples:
+                    self._samples[name] = deque(maxlen=self.window)
+                    self._sums[name] = 0.0
+                    self._counts[name] = 0
+                self._samples[name].append(seconds)
+                self._sums[name] += seconds
+                self._counts[name] += 1
+
+            if self.jsonl_path:
+                entry = {'ts': time.time(), **labels, 'sections': timings}
+                with open(self.jsonl_path, 'a') as f:
+                    f.write(json.dumps(entry) + '\n')
+
+            if self.prometheus_path:
+                tmp_path = f"{self.prometheus_path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    f.write(self._prometheus_text())
+                os.replace(tmp_path, self.prometheus_path)
+
+    def summary(self):
+        """p50/p95/jumlah sampel per section (detik)"""
+        with self._lock:
+            return self._summary()
+
+    def _summary(self):
+        result = {}
+        for name, samples in self._samples.items():
+            if not samples:
+                continue
+            values = np.fromiter(samples, dtype=float)
+            p50, p95 = np.percentile(values, [50, 95])
+            result[name] = {
+                'count': self._counts[name],
+                'p50': float(p50),
+                'p95': float(p95),
+                'sum': self._sums[name],
+            }
+        return result
+
+    def prometheus_text(self):
+        """Agregat dalam format teks eksposisi Prometheus"""
+        with self._lock:
+            return self._prometheus_text()
+
+    def _prometheus_text(self):
+        lines = [
+            f"# HELP {PROMETHEUS_METRIC} Durasi section dashboard per rerun.",
+            f"# TYPE {PROMETHEUS_METRIC} summary",
+        ]
+        for name, stats in self._summary().items():
+            label = f'section="{name}"'
+            lines.append(f'{PROMETHEUS_METRIC}{{{label},quantile="0.5"}} {stats["p50"]:.6f}')
+            lines.append(f'{PROMETHEUS_METRIC}{{{label},quantile="0.95"}} {stats["p95"]:.6f}')
+            lines.append(f'{PROMETHEUS_METRIC}_sum{{{label}}} {stats["sum"]:.6f}')
+            lines.append(f'{PROMETHEUS_METRIC}_count{{{label}}} {stats["count"]}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,88 @@
+"""Refresh data di background (stale-while-revalidate).
+
+Thread daemon memeriksa sidik sumber data (mtime & ukuran CSV, atau versi
+dataset bersama) setiap `interval` detik. Jika berubah, engine baru
+dibangun di thread itu (`DashboardEngine.refreshed`: ingest baris baru atau
+reload penuh, plus struktur turunan) lalu ditukar dengan satu assignment.
+
+Selama rebuild, rerun tetap dilayani dari versi lama. Rerun yang sedang
+berjalan memakai engine (snapshot) yang diambilnya di awal sampai selesai;
+rerun berikutnya melihat versi baru. Jika rebuild gagal, versi lama tetap
+dipakai dan rebuild dicoba lagi pada pemeriksaan berikutnya.
+"""
+import threading
+import time
+
+# Interval pemeriksaan sumber data (detik)
+DEFAULT_INTERVAL = 5
+
+
+class DataRefresher:
+    """Pemegang engine aktif + thread yang menukarnya saat sumber data berubah"""
+
+    def __init__(self, engine, interval=DEFAULT_INTERVAL, prepare=None):
+        self.engine = engine
+        self.interval = interval
+        # Dipanggil pada engine baru sebelum di-swap (mis. warm-up insight)
+        self.prepare = prepare
+        self.signature = engine.source_signature()
+        # Info refresh terakhir (untuk footer)
+        self.refreshed_at = time.time()
+        self.duration = None
+        self.error = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        """True jika thread background aktif"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Mulai thread background (interval <= 0 = tanpa thread)"""
+        if self.interval and self.interval > 0 and not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='bmw-data-refresher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Hentikan thread background"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def current(self):
+        """Engine aktif untuk satu rerun (tanpa thread: diperiksa sinkron dulu)"""
+        if not self.running:
+            self.check()
+        return self.engine
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                # Versi lama tetap dilayani; dicoba lagi pada interval berikutnya
+                self.error = f"{type(e).__name__}: {e}"
+
+    def check(self):
+        """Rebuild & swap engine jika sumber data berubah; True jika di-swap"""
+        with self._lock:
+            signature = self.engine.source_signature()
+            if signature == self.signature:
+                return False
+            start = time.perf_counter()
+            fresh = self.engine.refreshed()
+            if fresh is not self.engine and self.prepare is not None:
+                self.prepare(fresh)
+            self.duration = time.perf_counter() - start
+            self.refreshed_at = time.time()
+            self.signature = signature
+            self.error = None
+            swapped = fresh is not self.engine
+            # Swap atomik: rerun berikutnya membaca engine baru
+            self.engine = fresh
+            return swapped
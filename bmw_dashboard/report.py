@@ -0,0 +1,360 @@
+"""Generator laporan statis (headless) untuk banyak kombinasi filter.
+
+Setiap kombinasi filter (mis. setiap Region x Model) menghasilkan satu file
+HTML berisi kartu KPI, grafik tren, kartu insight dan tabel model yang sama
+dengan dashboard (lihat `views`), tanpa Streamlit. Gambar PNG/SVG grafik
+bersifat opsional dan membutuhkan exporter lokal `kaleido`.
+
+Data di-load sekali di proses induk. Worker process pool dibuat dengan
+`fork` sehingga engine (array kolom, indeks, cube) diwarisi copy-on-write
+tanpa di-pickle. Setiap worker langsung menulis laporannya ke disk (atomik:
+file sementara lalu `os.replace`) begitu selesai, dan induk menambahkan satu
+baris ke `manifest.jsonl` per laporan; `index.html` ditulis di akhir.
+
+Pemakaian:
+    python -m bmw_dashboard.report reports/ --by Region Model
+    python -m bmw_dashboard.report reports/ --by Region --year 2022 --currency EUR --image png
+"""
+import argparse
+import html
+import importlib.util
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+from plotly.offline import get_plotlyjs
+
+from bmw_dashboard import config, forecast, storage, views
+from bmw_dashboard.currency import CurrencyTable
+from bmw_dashboard.engine import DashboardEngine, FilterState, price_column
+
+# Dimensi yang bisa dipecah menjadi satu laporan per nilai
+SPLIT_DIMENSIONS = {
+    'Region': 'regions',
+    'Model': 'models',
+    'Fuel_Type': 'fuel_types',
+    'Transmission': 'transmissions',
+}
+IMAGE_FORMATS = ['png', 'svg']
+MANIFEST_FILE = 'manifest.jsonl'
+INDEX_FILE = 'index.html'
+PLOTLYJS_FILE = 'plotly.min.js'
+
+PAGE_STYLE = """
+body { font-family: Arial, sans-serif; background: #f8f9fa; color: #1f2937; margin: 0; padding: 24px; }
+h1 { color: #1C69D4; margin: 0 0 4px 0; }
+.subtitle { color: #6b7280; margin: 0 0 24px 0; }
+.section { background: #ffffff; border-radius: 12px; padding: 20px; margin-bottom: 24px;
+           box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1); }
+.row { display: flex; gap: 16px; }
+.row > div { flex: 1; }
+.metric { border-top: 4px solid #1C69D4; border-radius: 8px; padding: 12px 16px; background: #ffffff;
+          box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1); }
+.metric-label { color: #6b7280; font-size: 14px; }
+.metric-value { color: #1C69D4; font-size: 26px; font-weight: 700; }
+.metric-delta { font-size: 13px; }
+table { border-collapse: collapse; width: 100%; }
+th, td { text-align: left; padding: 6px 10px; border-bottom: 1px solid #e5e7eb; }
+"""
+
+
+# ========================================
+# KOMBINASI FILTER
+# ========================================
+def report_combinations(engine, by):
+    """Semua kombinasi nilai dimensi `by` (list dict kolom -> nilai)"""
+    values = [getattr(engine, SPLIT_DIMENSIONS[col])() for col in by]
+    return [dict(zip(by, combo)) for combo in itertools.product(*values)]
+
+
+def combination_name(combo):
+    """Nama file laporan untuk satu kombinasi (mis. region-europe__model-x5)"""
+    if not combo:
+        return 'all'
+    parts = []
+    for col, value in combo.items():
+        slug = re.sub(r'[^a-z0-9]+', '-', str(value).lower()).strip('-')
+        parts.append(f"{col.lower().replace('_', '-')}-{slug}")
+    return '__'.join(parts)
+
+
+def combination_state(combo, year=None, year_range=None):
+    """FilterState untuk satu kombinasi (dimensi lain tanpa filter)"""
+    return FilterState.from_selection(
+        transmissions=[combo['Transmission']] if 'Transmission' in combo else None,
+        year=year if year is not None else 'All',
+        models=[combo['Model']] if 'Model' in combo else None,
+        regions=[combo['Region']] if 'Region' in combo else None,
+        fuel_types=[combo['Fuel_Type']] if 'Fuel_Type' in combo else None,
+        year_range=year_range,
+    )
+
+
+# ========================================
+# RENDER SATU LAPORAN
+# ========================================
+def _metric_html(card):
+    delta = ''
+    if card['delta'] is not None:
+        color = '#ef4444' if card['delta'].startswith('-') else '#22c55e'
+        delta = f"<div class='metric-delta' style='color: {color};'>{html.escape(card['delta'])}</div>"
+    return (
+        f"<div class='metric'><div class='metric-label'>{html.escape(card['label'])}</div>"
+        f"<div class='metric-value'>{html.escape(card['value'])}</div>{delta}</div>"
+    )
+
+
+def render_report(engine, currencies, combo, currency='USD', year=None, year_range=None,
+                  plotlyjs='directory'):
+    """Bangun satu laporan: (html, figures) atau None jika filter kosong"""
+    state = combination_state(combo, year, year_range)
+    if engine.is_empty(state):
+        return None
+    year_rates = currencies.year_rates(currency, engine.years())
+    price_col = price_column(year_rates)
+
+    # KPI
+    kpis = engine.kpis(state, year_rates)
+    metrics = ''.join(
+        f"<div>{_metric_html(card)}</div>"
+        for card in views.kpi_metrics(kpis, state, currencies, currency)
+    )
+
+    # Grafik tren & bar (logika figure sama dengan dashboard)
+    trend_data = engine.trend(state, year_rates).copy()
+    trend_data = trend_data.rename(columns={price_col: 'Price_Converted'})
+    models = trend_data['Model'].nunique()
+    figures = {
+        'trend': views.trend_figure(trend_data, currencies, currency, show_point_labels=models == 1),
+        'bar': views.bar_figure(
+            engine.model_averages(state, year_rates).rename(columns={price_col: 'Price_Converted'}),
+            currencies, currency
+        ),
+    }
+    # plotly.js disertakan sekali per halaman, di figure pertama
+    trend_html = figures['trend'].to_html(
+        full_html=False, include_plotlyjs=True if plotlyjs == 'inline' else plotlyjs
+    )
+    bar_html = figures['bar'].to_html(full_html=False, include_plotlyjs=False)
+
+    # Kartu insight
+    ranking = engine.insights(state) if kpis['has_actual'] else None
+    if ranking:
+        insights = ''.join(
+            f"<div>{card}</div>" for card in views.insight_cards(ranking) if card is not None
+        )
+    else:
+        insights = "<p>📊 Tidak cukup data untuk analisis mendalam.</p>"
+
+    # Tabel model (format mata uang per kolom)
+    model_prices = engine.model_table(state, year_rates)
+    table_html = pd.DataFrame({
+        'Model': model_prices['Model'],
+        'Harga Rata-rata': currencies.format_column(model_prices['avg'], currency),
+        'Prediksi Harga': currencies.format_column(model_prices['pred'], currency),
+    }).to_html(index=False, border=0)
+
+    filters = ', '.join(f"{col}: {value}" for col, value in combo.items()) or 'Semua data'
+    years = state.years()
+    period = f"{years[0]}–{years[-1]}" if years and len(years) > 1 else (str(years[0]) if years else 'Semua tahun')
+    page = f"""<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<title>BMW Price Report — {html.escape(filters)}</title>
+<style>{PAGE_STYLE}</style>
+</head>
+<body>
+<h1>🚗 BMW Price Report</h1>
+<p class="subtitle">{html.escape(filters)} · {period} · {currency}</p>
+<div class="section"><div class="row">{metrics}</div></div>
+<div class="section"><h2>📈 Tren Harga Mobil Per Tahun</h2>{trend_html}</div>
+<div class="section"><h2>📖 Analisis Pasar & Rekomendasi Investasi</h2><div class="row">{insights}</div></div>
+<div class="section"><h2>📊 Perbandingan Harga Per Model</h2>
+<div class="row"><div>{bar_html}</div><div>{table_html}</div></div></div>
+</body>
+</html>
+"""
+    return page, figures
+
+
+def _write_atomic(path, data):
+    """Tulis file lewat file sementara + os.replace (pembaca tidak melihat file setengah jadi)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    mode = 'wb' if isinstance(data, bytes) else 'w'
+    with open(tmp_path, mode, **({} if mode == 'wb' else {'encoding': 'utf-8'})) as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_report(engine, currencies, combo, out_dir, images=(), **options):
+    """Render & tulis satu laporan (HTML + gambar opsional), kembalikan entri manifest"""
+    name = combination_name(combo)
+    start = time.perf_counter()
+    report = render_report(engine, currencies, combo, **options)
+    entry = {'name': name, 'filters': combo, 'files': []}
+    if report is None:
+        entry['status'] = 'empty'
+    else:
+        page, figures = report
+        _write_atomic(os.path.join(out_dir, f"{name}.html"), page)
+        entry['files'].append(f"{name}.html")
+        for fmt in images:
+            for key, fig in figures.items():
+                filename = f"{name}.{key}.{fmt}"
+                _write_atomic(os.path.join(out_dir, filename), fig.to_image(format=fmt))
+                entry['files'].append(filename)
+        entry['status'] = 'ok'
+    entry['seconds'] = round(time.perf_counter() - start, 3)
+    return entry
+
+
+# ========================================
+# PROCESS POOL
+# ========================================
+# Engine & opsi milik worker (diwarisi lewat fork, bukan di-pickle)
+_WORKER = {}
+
+
+def _init_worker(engine, currencies, out_dir, images, options):
+    _WORKER.update(engine=engine, currencies=currencies, out_dir=out_dir,
+                   images=images, options=options)
+
+
+def _worker_report(combo):
+    return write_report(
+        _WORKER['engine'], _WORKER['currencies'], combo, _WORKER['out_dir'],
+        _WORKER['images'], **_WORKER['options']
+    )
+
+
+def generate_reports(engine, currencies, combos, out_dir, images=(), workers=None,
+                     skip_existing=False, on_report=None, **options):
+    """Tulis laporan semua kombinasi; `on_report(entry)` dipanggil per laporan selesai"""
+    os.makedirs(out_dir, exist_ok=True)
+    if options.get('plotlyjs', 'directory') == 'directory':
+        path = os.path.join(out_dir, PLOTLYJS_FILE)
+        if not os.path.exists(path):
+            _write_atomic(path, get_plotlyjs())
+    if skip_existing:
+        combos = [
+            combo for combo in combos
+            if not os.path.exists(os.path.join(out_dir, f"{combination_name(combo)}.html"))
+        ]
+
+    entries = []
+    workers = min(workers or os.cpu_count() or 1, len(combos))
+    # Tanpa fork engine harus di-pickle ke setiap worker: render di proses ini saja
+    if workers <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        for combo in combos:
+            entry = write_report(engine, currencies, combo, out_dir, images, **options)
+            entries.append(entry)
+            if on_report:
+                on_report(entry)
+        return entries
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('fork'),
+        initializer=_init_worker,
+        initargs=(engine, currencies, out_dir, tuple(images), options),
+    ) as pool:
+        futures = [pool.submit(_worker_report, combo) for combo in combos]
+        for future in as_completed(futures):
+            entry = future.result()
+            entries.append(entry)
+            if on_report:
+                on_report(entry)
+    return entries
+
+
+def write_index(out_dir, entries):
+    """index.html berisi tautan ke semua laporan (urut nama)"""
+    items = ''.join(
+        f"<li><a href='{html.escape(entry['files'][0])}'>"
+        f"{html.escape(', '.join(f'{col}: {value}' for col, value in entry['filters'].items()) or 'Semua data')}"
+        f"</a></li>"
+        for entry in sorted(entries, key=lambda entry: entry['name'])
+        if entry['status'] == 'ok'
+    )
+    _write_atomic(os.path.join(out_dir, INDEX_FILE), f"""<!DOCTYPE html>
+<html lang="id">
+<head><meta charset="utf-8"><title>BMW Price Reports</title><style>{PAGE_STYLE}</style></head>
+<body><h1>🚗 BMW Price Reports</h1><div class="section"><ul>{items}</ul></div></body>
+</html>
+""")
+
+
+# ========================================
+# CLI
+# ========================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate laporan HTML statis per kombinasi filter")
+    parser.add_argument('out_dir', help="folder output laporan")
+    parser.add_argument('--by', nargs='*', default=['Region', 'Model'], choices=list(SPLIT_DIMENSIONS),
+                        help="dimensi yang dipecah per nilai (default Region Model; kosong = satu laporan)")
+    parser.add_argument('--year', type=int, default=None)
+    parser.add_argument('--year-range', type=int, nargs=2, default=None, metavar=('AWAL', 'AKHIR'))
+    parser.add_argument('--currency', default='USD')
+    parser.add_argument('--image', nargs='+', default=[], choices=IMAGE_FORMATS,
+                        help="ekspor grafik ke gambar (butuh paket kaleido)")
+    parser.add_argument('--plotlyjs', default='directory', choices=['directory', 'cdn', 'inline'],
+                        help="plotly.js: satu file di folder output, CDN, atau inline per laporan")
+    parser.add_argument('--workers', type=int, default=None, help="jumlah proses (default jumlah core)")
+    parser.add_argument('--skip-existing', action='store_true', help="lewati laporan yang sudah ada")
+    parser.add_argument('--csv', default=storage.CSV_PATH)
+    parser.add_argument('--parquet', default=storage.PARQUET_PATH)
+    args = parser.parse_args(argv)
+
+    if args.image and importlib.util.find_spec('kaleido') is None:
+        parser.error("ekspor gambar membutuhkan paket kaleido (pip install kaleido)")
+
+    currencies = CurrencyTable.load(
+        config.env_str(config.RATES_FILE_ENV),
+        config.env_str(config.RATES_HISTORY_ENV)
+    )
+    if args.currency not in currencies.codes():
+        parser.error(f"mata uang tidak dikenal: {args.currency}")
+
+    # Data di-load sekali; worker mewarisinya lewat fork
+    start = time.perf_counter()
+    engine = DashboardEngine.load(
+        args.csv, args.parquet,
+        forecast_mode=config.env_str(config.FORECAST_MODE_ENV, 'data'),
+        forecast_cache=config.env_str(config.FORECAST_CACHE_ENV, forecast.CACHE_PATH),
+    )
+    combos = report_combinations(engine, args.by)
+    print(f"load {time.perf_counter() - start:.2f}s, {len(combos):,} kombinasi")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    manifest_path = os.path.join(args.out_dir, MANIFEST_FILE)
+    mode = 'a' if args.skip_existing else 'w'
+    with open(manifest_path, mode, encoding='utf-8') as manifest:
+        def on_report(entry):
+            # Manifest ditulis per laporan selesai (bukan di akhir)
+            manifest.write(json.dumps(entry) + '\n')
+            manifest.flush()
+            print(f"{entry['status']:>5}  {entry['seconds']:6.2f}s  {entry['name']}")
+
+        start = time.perf_counter()
+        generate_reports(
+            engine, currencies, combos, args.out_dir,
+            images=args.image, workers=args.workers, skip_existing=args.skip_existing,
+            on_report=on_report, currency=args.currency, year=args.year,
+            year_range=args.year_range, plotlyjs=args.plotlyjs,
+        )
+
+    # Index dari manifest (termasuk laporan run sebelumnya saat --skip-existing)
+    with open(manifest_path, encoding='utf-8') as f:
+        entries = {entry['name']: entry for entry in map(json.loads, f)}
+    write_index(args.out_dir, entries.values())
+    print(f"selesai {time.perf_counter() - start:.2f}s -> {args.out_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""Dataset bersama (memory-mapped) untuk beberapa proses server Streamlit.
+
+Satu proses loader mem-publish array kolom (kode kategori, Year int16,
+Price_USD float32) beserta posting list indeks filter ke folder versi di
+`shared_dir` (mis. di /dev/shm). Setiap proses app meng-attach array
+tersebut dengan `np.load(mmap_mode='r')`: zero-copy dan read-only, sehingga
+page cache dipakai bersama dan memori tidak berlipat dengan jumlah worker.
+
+Versi aktif ditunjuk oleh file `CURRENT` yang diganti secara atomik
+(`os.replace`) setelah folder versi baru selesai ditulis. Proses yang masih
+memetakan versi lama tetap aman: file lama hanya di-unlink, mapping yang
+sudah terbuka tetap valid sampai proses itu attach ulang.
+
+Pemakaian loader:
+    python -m bmw_dashboard.shared /dev/shm/bmw_dashboard --watch 30
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from bmw_dashboard import storage
+from bmw_dashboard.index import ColumnPostings, FilterIndex
+
+CURRENT_FILE = 'CURRENT'
+META_FILE = 'meta.json'
+# Jumlah versi terakhir yang disimpan (aktif + sebelumnya)
+KEEP_VERSIONS = 2
+
+
+def _column_file(version_dir, col, part):
+    return os.path.join(version_dir, f"{col}.{part}.npy")
+
+
+# ========================================
+# PUBLISH
+# ========================================
+def publish(shared_dir, df, index, source_offset=0):
+    """Tulis array kolom & indeks ke folder versi baru lalu aktifkan secara atomik"""
+    os.makedirs(shared_dir, exist_ok=True)
+    version = f"v{time.time_ns()}-{os.getpid()}"
+    tmp_dir = os.path.join(shared_dir, f".{version}.tmp")
+    os.makedirs(tmp_dir)
+
+    meta = {'version': version, 'rows': len(df), 'source_offset': source_offset,
+            'columns': {}, 'index': {}}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            np.save(_column_file(tmp_dir, col, 'codes'), np.asarray(series.array.codes))
+            meta['columns'][col] = {'categories': series.cat.categories.tolist()}
+        else:
+            np.save(_column_file(tmp_dir, col, 'values'), series.to_numpy())
+            meta['columns'][col] = {}
+
+    for col, postings in index.columns.items():
+        np.save(_column_file(tmp_dir, col, 'order'), postings.order)
+        np.save(_column_file(tmp_dir, col, 'offsets'), postings.offsets)
+        meta['index'][col] = {}
+        df_categories = meta['columns'][col].get('categories')
+        if df_categories is None or not postings.categories.equals(pd.Index(df_categories)):
+            # Kategori indeks berbeda dari kolom df (kolom non-kategori seperti Year, atau
+            # kategori baru dari append yang ditambahkan di akhir indeks sedangkan df
+            # mengurutkannya ulang): simpan kode & kategori milik indeks sendiri
+            np.save(_column_file(tmp_dir, col, 'postcodes'), postings.codes)
+            meta['index'][col] = {'categories': postings.categories.tolist()}
+
+    with open(os.path.join(tmp_dir, META_FILE), 'w') as f:
+        json.dump(meta, f)
+
+    # Folder versi lengkap -> pindahkan, lalu tukar pointer CURRENT
+    os.replace(tmp_dir, os.path.join(shared_dir, version))
+    pointer_tmp = os.path.join(shared_dir, f".{CURRENT_FILE}.{version}.tmp")
+    with open(pointer_tmp, 'w') as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(shared_dir, CURRENT_FILE))
+
+    _remove_old_versions(shared_dir)
+    return version
+
+
+def _remove_old_versions(shared_dir, keep=KEEP_VERSIONS):
+    """Hapus folder versi lama (mapping yang masih terbuka tetap valid di POSIX).
+
+    Versi sebelumnya tetap disimpan agar proses yang baru membaca CURRENT
+    lama masih bisa attach.
+    """
+    versions = sorted(
+        name for name in os.listdir(shared_dir)
+        if name.startswith('v') and os.path.isdir(os.path.join(shared_dir, name))
+    )
+    for name in versions[:-keep]:
+        shutil.rmtree(os.path.join(shared_dir, name), ignore_errors=True)
+
+
+# ========================================
+# ATTACH
+# ========================================
+def current_version(shared_dir):
+    """Versi aktif, atau None jika belum ada yang di-publish"""
+    try:
+        with open(os.path.join(shared_dir, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def attach(shared_dir, version=None):
+    """Attach versi aktif (zero-copy, read-only).
+
+    Mengembalikan (version, df, index, source_offset).
+    """
+    version = version or current_version(shared_dir)
+    if version is None:
+        raise FileNotFoundError(f"Belum ada dataset yang di-publish di {shared_dir}")
+    version_dir = os.path.join(shared_dir, version)
+    with open(os.path.join(version_dir, META_FILE)) as f:
+        meta = json.load(f)
+
+    columns = {}
+    codes = {}
+    for col, spec in meta['columns'].items():
+        if 'categories' in spec:
+            codes[col] = np.load(_column_file(version_dir, col, 'codes'), mmap_mode='r')
+            dtype = pd.CategoricalDtype(spec['categories'])
+            columns[col] = pd.Categorical.from_codes(codes[col], dtype=dtype, validate=False)
+        else:
+            values = np.load(_column_file(version_dir, col, 'values'), mmap_mode='r')
+            columns[col] = pd.Series(values, copy=False)
+    df = pd.DataFrame(columns, copy=False)
+
+    postings = {}
+    for col, spec in meta['index'].items():
+        if 'categories' in spec:
+            categories = pd.Index(spec['categories'])
+            col_codes = np.load(_column_file(version_dir, col, 'postcodes'), mmap_mode='r')
+        else:
+            categories, col_codes = df[col].cat.categories, codes[col]
+        postings[col] = ColumnPostings.from_arrays(
+            categories,
+            col_codes,
+            np.load(_column_file(version_dir, col, 'order'), mmap_mode='r'),
+            np.load(_column_file(version_dir, col, 'offsets'), mmap_mode='r'),
+        )
+    index = FilterIndex.from_postings(postings, meta['rows'])
+    return version, df, index, meta['source_offset']
+
+
+# ========================================
+# LOADER CLI
+# ========================================
+def main(argv=None):
+    # Import di sini: engine mengimpor modul ini
+    from bmw_dashboard.engine import DashboardEngine
+
+    parser = argparse.ArgumentParser(description="Publish dataset BMW ke shared memory")
+    parser.add_argument('shared_dir', help="folder shared (mis. /dev/shm/bmw_dashboard)")
+    parser.add_argument('--csv', default=storage.CSV_PATH)
+    parser.add_argument('--parquet', default=storage.PARQUET_PATH)
+    parser.add_argument('--watch', type=float, default=None,
+                        help="interval detik untuk ingest baris baru & publish ulang")
+    args = parser.parse_args(argv)
+
+    engine = DashboardEngine.load(args.csv, args.parquet, cache_size=0)
+    version = publish(args.shared_dir, engine.df, engine.index, engine.source_offset)
+    print(f"published {version} ({len(engine.df):,} baris)")
+
+    while args.watch:
+        time.sleep(args.watch)
+        data_version = engine.version
+        engine.refresh()
+        if engine.version != data_version:
+            version = publish(args.shared_dir, engine.df, engine.index, engine.source_offset)
+            print(f"published {version} ({len(engine.df):,} baris)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,378 @@
+"""Penyimpanan kolumnar (Parquet) untuk dataset harga BMW.
+
+CSV hanya di-parse sekali lalu disimpan sebagai Parquet dengan dtype ringkas
+(kategori untuk kolom teks, int16 untuk Year, float32 untuk Price_USD).
+Setiap start berikutnya membaca file Parquet secara memory-mapped dan hanya
+kolom yang dibutuhkan.
+
+File Parquet mencatat offset byte CSV yang sudah dikonversi, sehingga baris
+yang kemudian di-append ke CSV bisa di-parse tanpa membaca ulang seluruh file.
+Konversi berjalan per chunk sehingga memori puncak dibatasi ukuran chunk.
+"""
+import io
+import os
+import shutil
+import tempfile
+import weakref
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+CSV_PATH = 'bmw_pricing_data.csv'
+PARQUET_PATH = 'bmw_pricing_data.parquet'
+
+# Urutan kolom sesuai file CSV
+COLUMNS = ['Year', 'Region', 'Fuel_Type', 'Transmission', 'Model', 'Price_USD', 'Type']
+CATEGORICAL_COLUMNS = ['Region', 'Fuel_Type', 'Transmission', 'Model', 'Type']
+
+COLUMN_DTYPES = {
+    'Year': 'int16',
+    'Price_USD': 'float32',
+    **{col: 'category' for col in CATEGORICAL_COLUMNS},
+}
+
+# Schema Arrow tetap agar setiap chunk/part file kompatibel satu sama lain
+ARROW_SCHEMA = pa.schema([
+    ('Year', pa.int16()),
+    *[(col, pa.dictionary(pa.int32(), pa.string())) for col in COLUMNS[1:5]],
+    ('Price_USD', pa.float32()),
+    ('Type', pa.dictionary(pa.int32(), pa.string())),
+])
+
+# Jumlah baris per chunk saat membaca CSV secara streaming
+DEFAULT_CHUNK_ROWS = 500_000
+
+# Folder part file baris append (mode DuckDB): <parquet_path> + suffix ini
+APPEND_DIR_SUFFIX = '.appended'
+
+# Key metadata Parquet untuk offset byte CSV yang sudah dikonversi
+CSV_OFFSET_KEY = b'bmw_dashboard.csv_offset'
+
+
+class SourceRewrittenError(Exception):
+    """CSV tidak lagi sekadar di-append (dipotong/ditulis ulang) -> perlu reload penuh"""
+
+
+# ========================================
+# KONVERSI CSV -> PARQUET
+# ========================================
+class _BoundedReader(io.RawIOBase):
+    """File reader yang berhenti di offset byte tertentu"""
+
+    def __init__(self, f, remaining):
+        self._f = f
+        self._remaining = remaining
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = min(len(buffer), self._remaining)
+        if n <= 0:
+            return 0
+        data = self._f.read(n)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+
+def read_csv(csv_path=CSV_PATH, **kwargs):
+    """Baca CSV langsung ke dtype kolumnar"""
+    return pd.read_csv(csv_path, dtype=COLUMN_DTYPES, **kwargs)
+
+
+def complete_end(csv_path=CSV_PATH, block_size=64 * 1024):
+    """Offset byte setelah newline terakhir: baris terakhir yang belum diakhiri
+    newline (sedang ditulis) tidak ikut, sama seperti `read_appended`"""
+    with open(csv_path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        while pos > 0:
+            start = max(pos - block_size, 0)
+            f.seek(start)
+            newline = f.read(pos - start).rfind(b'\n')
+            if newline >= 0:
+                return start + newline + 1
+            pos = start
+    return 0
+
+
+def iter_csv_chunks(csv_path=CSV_PATH, chunk_rows=DEFAULT_CHUNK_ROWS, end=None):
+    """Iterasi CSV per chunk `chunk_rows` baris, berhenti di offset byte `end`"""
+    end = os.path.getsize(csv_path) if end is None else end
+    with open(csv_path, 'rb') as f:
+        reader = io.BufferedReader(_BoundedReader(f, end))
+        yield from read_csv(reader, chunksize=chunk_rows)
+
+
+def to_arrow(df):
+    """Frame (kolom CSV lengkap) -> tabel Arrow dengan ARROW_SCHEMA"""
+    return pa.Table.from_pandas(df[COLUMNS], schema=ARROW_SCHEMA, preserve_index=False)
+
+
+def convert_csv_to_parquet(csv_path=CSV_PATH, parquet_path=PARQUET_PATH,
+                           chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Konversi CSV ke Parquet per chunk (ditulis atomik lewat file sementara)"""
+    # Offset dicatat di awal; hanya byte sampai offset ini (baris lengkap) yang di-parse
+    end = complete_end(csv_path)
+    schema = ARROW_SCHEMA.with_metadata({CSV_OFFSET_KEY: str(end).encode()})
+
+    # Tanpa kompresi agar halaman kolom bisa dibaca langsung dari memory map
+    tmp_path = f"{parquet_path}.tmp"
+    with pq.ParquetWriter(tmp_path, schema, compression='none') as writer:
+        for chunk in iter_csv_chunks(csv_path, chunk_rows, end=end):
+            writer.write_table(to_arrow(chunk))
+    os.replace(tmp_path, parquet_path)
+    return parquet_path
+
+
+def is_stale(csv_path=CSV_PATH, parquet_path=PARQUET_PATH):
+    """True jika file Parquet belum ada atau lebih tua dari CSV"""
+    if not os.path.exists(parquet_path):
+        return True
+    if not os.path.exists(csv_path):
+        return False
+    return os.path.getmtime(parquet_path) < os.path.getmtime(csv_path)
+
+
+def ensure_parquet(csv_path=CSV_PATH, parquet_path=PARQUET_PATH):
+    """Pastikan file Parquet tersedia dan up-to-date"""
+    if is_stale(csv_path, parquet_path):
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(csv_path)
+        convert_csv_to_parquet(csv_path, parquet_path)
+    return parquet_path
+
+
+# ========================================
+# LOAD DATASET
+# ========================================
+def load_dataset(columns=None, csv_path=CSV_PATH, parquet_path=PARQUET_PATH):
+    """Load dataset dari Parquet (memory-mapped) dengan proyeksi kolom"""
+    ensure_parquet(csv_path, parquet_path)
+    table = pq.read_table(parquet_path, columns=columns, memory_map=True)
+    return sort_categories(table.to_pandas())
+
+
+def sort_categories(df):
+    """Urutkan kategori (dictionary tiap chunk digabung sesuai urutan kemunculan)"""
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            categories = df[col].cat.categories
+            if not categories.is_monotonic_increasing:
+                df[col] = df[col].cat.reorder_categories(categories.sort_values())
+    return df
+
+
+def read_csv_offset(parquet_path=PARQUET_PATH):
+    """Offset byte CSV yang sudah tercakup di file Parquet"""
+    metadata = pq.read_schema(parquet_path).metadata or {}
+    return int(metadata.get(CSV_OFFSET_KEY, b'0'))
+
+
+# ========================================
+# INGEST INKREMENTAL (APPEND)
+# ========================================
+def read_appended(csv_path=CSV_PATH, offset=0):
+    """Parse hanya baris yang di-append setelah `offset`.
+
+    Mengembalikan (frame_baru, offset_baru). Baris terakhir yang belum diakhiri
+    newline (sedang ditulis) ditunda ke pemanggilan berikutnya. Jika file
+    menyusut atau byte sebelum offset bukan akhir baris, CSV dianggap ditulis
+    ulang dan SourceRewrittenError dilempar.
+    """
+    size = os.path.getsize(csv_path)
+    if size < offset:
+        raise SourceRewrittenError(csv_path)
+
+    with open(csv_path, 'rb') as f:
+        if offset > 0:
+            f.seek(offset - 1)
+            if f.read(1) != b'\n':
+                raise SourceRewrittenError(csv_path)
+        data = f.read(size - offset)
+
+    # Hanya baris yang sudah lengkap
+    end = data.rfind(b'\n') + 1
+    data = data[:end]
+    if not data.strip():
+        return read_csv(io.BytesIO(b''), names=COLUMNS, header=None), offset + end
+
+    new_rows = read_csv(io.BytesIO(data), names=COLUMNS, header=None)
+    return new_rows, offset + end
+
+
+def align_categories(df, reference):
+    """Samakan kategori kolom df dengan `reference` plus nilai barunya (tetap terurut)"""
+    aligned = {}
+    for col in CATEGORICAL_COLUMNS:
+        if col not in df or col not in reference:
+            continue
+        known = reference[col].cat.categories
+        values = df[col].astype(object) if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col]
+        missing = pd.Index(pd.unique(values.dropna())).difference(known)
+        categories = known.append(missing).sort_values() if len(missing) else known
+        aligned[col] = pd.Categorical(values, categories=categories)
+    return df.assign(**aligned)
+
+
+def with_categories(frame, reference):
+    """Samakan kategori kolom `frame` dengan `reference` (hanya saat ada kategori baru)"""
+    for col in frame.columns:
+        if not isinstance(frame[col].dtype, pd.CategoricalDtype) or col not in reference:
+            continue
+        categories = reference[col].cat.categories
+        if not frame[col].cat.categories.equals(categories):
+            frame = frame.assign(**{col: frame[col].cat.set_categories(categories)})
+    return frame
+
+
+# ========================================
+# SPILL BARIS MENTAH (MODE STREAMING)
+# ========================================
+class SpillGeneration:
+    """Folder part file milik satu load/reload engine di dalam `spill_dir`.
+
+    Setiap load/reload (di proses mana pun) mendapat folder baru dengan nama
+    unik, sehingga part file yang dibaca engine lain tidak pernah ditimpa.
+    Folder dihapus saat objek ini tidak lagi dirujuk engine mana pun
+    (salinan `DashboardEngine.refreshed` berbagi objek yang sama) atau saat
+    proses keluar; folder lain di `spill_dir` tidak pernah disentuh.
+    """
+
+    def __init__(self, spill_dir):
+        os.makedirs(spill_dir, exist_ok=True)
+        self.path = tempfile.mkdtemp(prefix=f"g{os.getpid()}-", dir=spill_dir)
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.path, True)
+
+    def remove(self):
+        """Hapus folder sekarang (tanpa menunggu garbage collection)"""
+        self._finalizer()
+
+
+def snapshot_file(path, directory):
+    """Salinan `path` di `directory` yang tidak ikut berubah saat `path` diganti.
+
+    Memakai hard link (tanpa menyalin data) jika didukung filesystem; konversi
+    ulang mengganti `path` dengan `os.replace`, sehingga link tetap menunjuk
+    ke isi lama.
+    """
+    target = os.path.join(directory, os.path.basename(path))
+    try:
+        os.link(path, target)
+    except OSError:
+        shutil.copy2(path, target)
+    return target
+
+
+def spill_parts(spill_dir):
+    """Part file spill di `spill_dir` (urut penulisan)"""
+    if not spill_dir or not os.path.isdir(spill_dir):
+        return []
+    return sorted(
+        os.path.join(spill_dir, name) for name in os.listdir(spill_dir)
+        if name.startswith('part-') and name.endswith('.parquet')
+    )
+
+
+def write_spill_part(spill_dir, df):
+    """Tulis baris mentah sebagai part file Parquet baru di `spill_dir`"""
+    os.makedirs(spill_dir, exist_ok=True)
+    part = len(spill_parts(spill_dir))
+    while True:
+        # Nama dipesan dengan O_EXCL: dua engine yang berbagi folder tidak
+        # pernah menulis ke part yang sama
+        path = os.path.join(spill_dir, f"part-{part:05d}.parquet")
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            part += 1
+    pq.write_table(to_arrow(df), f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+    return path
+
+
+def read_spill(parts, columns=None, **selections):
+    """Baca baris dari part file spill `parts` yang lolos filter (di-push down ke Parquet)"""
+    if not parts:
+        table = ARROW_SCHEMA.empty_table()
+        return sort_categories(table.select(columns or ARROW_SCHEMA.names).to_pandas())
+    filters = [
+        (col, 'in', list(values)) for col, values in selections.items() if values is not None
+    ]
+    table = pq.read_table(
+        list(parts), columns=columns, filters=filters or None, schema=ARROW_SCHEMA
+    )
+    return sort_categories(table.to_pandas())
+
+
+def _spill_filter(selections):
+    """Ekspresi filter dataset Arrow dari selections FilterState (None = tanpa filter)"""
+    expression = None
+    for col, values in selections.items():
+        if values is None:
+            continue
+        clause = pc.field(col).isin(list(values))
+        expression = clause if expression is None else expression & clause
+    return expression
+
+
+def count_spill(parts, **selections):
+    """Jumlah baris spill yang lolos filter (tanpa membentuk frame)"""
+    if not parts:
+        return 0
+    dataset = ds.dataset(list(parts), schema=ARROW_SCHEMA)
+    return dataset.count_rows(filter=_spill_filter(selections))
+
+
+def _scan_window(dataset, columns, expression, start, stop):
+    """Baris [start, stop) hasil filter, dipindai per batch (urut part file)"""
+    batches, seen = [], 0
+    for fragment in dataset.get_fragments():
+        for batch in fragment.to_batches(columns=columns, filter=expression, schema=ARROW_SCHEMA):
+            if seen + batch.num_rows > start:
+                first = max(start - seen, 0)
+                batches.append(batch.slice(first, min(stop, seen + batch.num_rows) - seen - first))
+            seen += batch.num_rows
+            if seen >= stop:
+                return batches
+    return batches
+
+
+def read_spill_page(parts, columns, offset, limit, sort_by=None, descending=False,
+                    total=None, **selections):
+    """Satu halaman baris spill yang lolos filter; hanya halaman yang menjadi frame.
+
+    Tanpa `sort_by` part file dipindai per batch sampai jendela halaman
+    terpenuhi (`descending` = baris terakhir dulu, butuh `total`). Dengan
+    `sort_by`, slice diurutkan (stabil) sebagai tabel Arrow lalu hanya
+    jendela [offset, offset + limit) yang dikonversi ke pandas.
+    """
+    schema = pa.schema([ARROW_SCHEMA.field(col) for col in columns])
+    if not parts:
+        return sort_categories(schema.empty_table().to_pandas())
+    dataset = ds.dataset(list(parts), schema=ARROW_SCHEMA)
+    expression = _spill_filter(selections)
+
+    if sort_by is None:
+        if descending:
+            if total is None:
+                total = dataset.count_rows(filter=expression)
+            start, stop = max(total - offset - limit, 0), max(total - offset, 0)
+        else:
+            start, stop = offset, offset + limit
+        table = pa.Table.from_batches(_scan_window(dataset, columns, expression, start, stop), schema)
+        if descending:
+            table = table.take(pa.array(range(table.num_rows - 1, -1, -1), pa.int64()))
+    else:
+        table = dataset.to_table(columns=columns, filter=expression)
+        keys = table[sort_by]
+        if pa.types.is_dictionary(keys.type):
+            # Urutan nilai (kategori storage terurut alfabetis)
+            keys = keys.cast(pa.string())
+        order = pc.sort_indices(keys, sort_keys=[('', 'descending' if descending else 'ascending')])
+        table = table.take(order.slice(offset, limit))
+    return sort_categories(table.to_pandas())
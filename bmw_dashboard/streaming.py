@@ -0,0 +1,37 @@
+"""Loader out-of-core: CSV dibaca per chunk dan hanya cube yang disimpan di memori.
+
+Untuk histori yang tidak muat di RAM worker, setiap chunk langsung dilipat ke
+cube agregasi (Year, Model, Transmission, Region, Fuel_Type, Type) lalu
+dibuang. Memori puncak dibatasi oleh `chunk_rows`. Baris mentah bisa
+di-spill ke folder Parquet lokal untuk drill-down (mis. analisis insight).
+"""
+from bmw_dashboard import storage
+from bmw_dashboard.cube import build_cube, merge_cubes
+
+
+def stream_cube(csv_path=storage.CSV_PATH, chunk_rows=storage.DEFAULT_CHUNK_ROWS,
+                spill_dir=None):
+    """Bangun cube dari CSV per chunk.
+
+    Mengembalikan (cube, offset_byte_csv). Jika `spill_dir` diisi, setiap
+    chunk juga ditulis sebagai part file Parquet di folder tersebut (folder
+    generasi baru dari `storage.SpillGeneration`, bukan dibersihkan).
+    """
+    # Baris terakhir yang belum lengkap ditunda ke refresh berikutnya
+    end = storage.complete_end(csv_path)
+    cube = None
+    for chunk in storage.iter_csv_chunks(csv_path, chunk_rows, end=end):
+        if cube is not None:
+            # Kategori tiap chunk disamakan agar cube tetap bertipe kategori
+            chunk = storage.align_categories(chunk, cube)
+            cube = storage.with_categories(cube, chunk)
+
+        chunk_cube = build_cube(chunk)
+        cube = chunk_cube if cube is None else merge_cubes(cube, chunk_cube)
+
+        if spill_dir:
+            storage.write_spill_part(spill_dir, chunk)
+
+    if cube is None:
+        cube = build_cube(storage.read_csv(csv_path))
+    return cube, end
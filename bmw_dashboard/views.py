@@ -0,0 +1,307 @@
+"""Komponen tampilan dashboard: kartu KPI, grafik tren & bar, kartu insight.
+
+Dipakai bersama oleh app Streamlit dan generator laporan headless
+(`bmw_dashboard.report`), sehingga laporan statis menampilkan angka, teks
+dan grafik yang sama persis dengan dashboard.
+"""
+import numpy as np
+import plotly.express as px
+
+from bmw_dashboard import charts
+
+# Palet warna BMW: biru, abu-abu gelap, putih
+BMW_COLORS = ['#1C69D4', '#0E4C92', '#00A1E4', '#6C757D', '#2C5F9E', '#4A90E2']
+
+
+# ========================================
+# KPI
+# ========================================
+def kpi_metrics(kpis, state, currencies, currency):
+    """Empat kartu KPI: list dict (label, value, delta; delta None = tanpa delta)"""
+    # Persentase hanya ditampilkan jika memilih tahun/rentang spesifik, bukan "All"
+    show_delta = state.years() is not None
+    delta_label = "vs tahun sebelumnya" if state.year_range is None else "vs rentang setahun sebelumnya"
+    metrics = [
+        ("Harga Minimal", kpis['min'], f"{kpis['min_pct']:+.1f}% {delta_label}"),
+        ("Harga Maksimal", kpis['max'], f"{kpis['max_pct']:+.1f}% {delta_label}"),
+        ("Harga Rata-rata", kpis['avg'], f"{kpis['avg_pct']:+.1f}% {delta_label}"),
+        ("Prediksi Harga", kpis['predicted'], f"{kpis['pred_pct']:+.1f}% vs harga saat ini"),
+    ]
+    return [
+        {
+            'label': label,
+            'value': currencies.format(value, currency),
+            'delta': delta if show_delta else None,
+        }
+        for label, value, delta in metrics
+    ]
+
+
+# ========================================
+# GRAFIK
+# ========================================
+def trend_figure(trend_data, currencies, currency, show_point_labels=False,
+                 webgl_points=charts.DEFAULT_WEBGL_POINTS, chart_width=charts.DEFAULT_CHART_WIDTH):
+    """Figure tren rata-rata harga per tahun per model (kolom Price_Converted)"""
+    # Hitung persentase perubahan untuk setiap model
+    trend_data = trend_data.sort_values(['Model', 'Year'])
+    trend_data['Pct_Change'] = trend_data.groupby('Model', observed=True)['Price_Converted'].pct_change() * 100
+    trend_data['Pct_Change'] = trend_data['Pct_Change'].fillna(0)  # Tahun pertama = 0%
+
+    # Warna & label persentase per titik (operasi kolom, tanpa apply per baris)
+    pct = trend_data['Pct_Change'].to_numpy()
+    trend_data['Pct_Color'] = np.select(
+        [pct > 0, pct < 0],
+        ['#22c55e', '#ef4444'],  # Hijau untuk naik, merah untuk turun
+        '#6b7280'  # Abu-abu untuk 0%
+    )
+    trend_data['Pct_Text'] = np.char.mod('%+.1f%%', pct)
+
+    # Format persentase dengan warna (untuk hover)
+    trend_data['Pct_Formatted'] = (
+        '<span style="color: ' + trend_data['Pct_Color']
+        + '; font-weight: bold;">' + trend_data['Pct_Text'] + '</span>'
+    )
+
+    if len(trend_data) > webgl_points:
+        # Seri panjang: downsample LTTB ke lebar grafik, lalu gambar dengan WebGL
+        trend_plot = charts.downsample(trend_data, 'Year', 'Price_Converted', 'Model', chart_width)
+        fig_line = charts.line_figure_gl(
+            trend_plot,
+            x='Year',
+            y='Price_Converted',
+            color='Model',
+            colors=BMW_COLORS,
+            custom_data=['Pct_Formatted'],
+            labels={'Price_Converted': 'Harga Rata-rata', 'Year': 'Tahun'}
+        )
+    else:
+        trend_plot = trend_data
+        fig_line = px.line(
+            trend_data,
+            x='Year',
+            y='Price_Converted',
+            color='Model',
+            markers=True,
+            labels={'Price_Converted': 'Harga Rata-rata', 'Year': 'Tahun'},
+            template='plotly_white',
+            color_discrete_sequence=BMW_COLORS,  # Warna BMW
+            custom_data=['Pct_Formatted']  # Tambahkan persentase terformat ke custom data
+        )
+
+    # Update traces dengan garis tajam (linear) dan custom hover template
+    fig_line.update_traces(
+        line=dict(width=3),  # Garis lurus dengan lebar 3
+        marker=dict(size=8),
+        fill='tonexty',  # Fill area di bawah garis
+        fillcolor='rgba(28, 105, 212, 0.1)',  # Warna biru BMW dengan transparansi
+        hovertemplate='<b>%{fullData.name}</b><br>' +
+                      'Harga: ' + currencies.hover_format(currency, '%{y:,.0f}') + '<br>' +
+                      'Perubahan: %{customdata[0]}' +
+                      '<extra></extra>'
+    )
+
+    # Set fill untuk trace pertama ke 'tozeroy'
+    fig_line.data[0].fill = 'tozeroy'
+    fig_line.data[0].fillcolor = 'rgba(28, 105, 212, 0.1)'
+
+    # Persentase di setiap titik (tanpa kotak dan arrow). Satu trace teks untuk
+    # semua titik, bukan annotation per titik; tahun pertama tiap model tidak diberi label.
+    if show_point_labels:
+        first_point = trend_plot['Model'].ne(trend_plot['Model'].shift())
+        labeled = trend_plot[~first_point]
+        fig_line.add_trace(charts.point_labels(
+            labeled, x='Year', y='Price_Converted', text='Pct_Text', color='Pct_Color',
+            webgl=len(trend_data) > webgl_points
+        ))
+
+    # Hitung range Y-axis yang optimal untuk menampilkan variasi data
+    y_min = trend_data['Price_Converted'].min()
+    y_max = trend_data['Price_Converted'].max()
+    y_range = y_max - y_min
+    # Tambahkan padding 10% di atas dan bawah agar grafik tidak terlalu mepet
+    y_padding = y_range * 0.1
+    y_axis_min = max(0, y_min - y_padding)  # Minimal 0
+    y_axis_max = y_max + y_padding
+
+    fig_line.update_layout(
+        hovermode='x unified',  # Kembali ke 'x unified' agar semua model muncul sekaligus
+        height=400,
+        font=dict(size=12),
+        legend=dict(
+            orientation="h",
+            yanchor="top",
+            y=-0.15,
+            xanchor="center",
+            x=0.5
+        ),
+        margin=dict(l=50, r=50, t=30, b=80),
+        showlegend=True,
+        separators=currencies.plotly_separators(currency),  # Pemisah angka sesuai locale
+        plot_bgcolor='rgba(0,0,0,0)',  # Background transparan
+        paper_bgcolor='rgba(0,0,0,0)',
+        yaxis=dict(
+            range=[y_axis_min, y_axis_max],  # Set range Y-axis agar zoom in
+            gridcolor='rgba(200, 200, 200, 0.2)'  # Grid lebih subtle
+        ),
+        xaxis=dict(
+            gridcolor='rgba(200, 200, 200, 0.2)'
+        )
+    )
+    return fig_line
+
+
+def bar_figure(model_avg, currencies, currency):
+    """Figure bar horizontal rata-rata harga per model (kolom Price_Converted)"""
+    fig_bar = px.bar(
+        model_avg,
+        y='Model',
+        x='Price_Converted',
+        orientation='h',
+        labels={'Price_Converted': 'Harga Rata-rata', 'Model': 'Model'},
+        template='plotly_white',
+        color_discrete_sequence=['#3b82f6']
+    )
+
+    fig_bar.update_layout(
+        height=400,
+        font=dict(size=11),
+        margin=dict(l=50, r=50, t=30, b=50),
+        showlegend=False,
+        separators=currencies.plotly_separators(currency)
+    )
+    return fig_bar
+
+
+# ========================================
+# KARTU INSIGHT
+# ========================================
+def insight_cards(ranking):
+    """HTML empat kartu insight (format paragraf); None = kartu tidak ditampilkan"""
+    best_model = ranking['best']
+    worst_model = ranking['worst']
+    best_future_model = ranking['best_future']
+    most_stable_model = ranking['most_stable']
+
+    # Card 1: Model Terbaik
+    best_card = None
+    if best_model['trend_pct'] > 5:
+        best_card = f"""
+        <div style='background: linear-gradient(135deg, #dcfce7 0%, #bbf7d0 100%);
+                    padding: 20px; border-radius: 12px;
+                    box-shadow: 0 2px 6px rgba(0,0,0,0.08);
+                    border-top: 4px solid #22c55e; height: 200px;'>
+            <p style='color: #15803d; margin: 0 0 12px 0; font-size: 14px; font-weight: 600; text-align: center;'>
+                📈 Model Terbaik
+            </p>
+            <p style='color: #166534; margin: 0; font-size: 14px; line-height: 1.7; text-align: justify;'>
+                <strong style='font-size: 18px; display: block; text-align: center; margin-bottom: 8px;'>{best_model['model']}</strong>
+                menunjukkan performa luar biasa dengan kenaikan <strong>{best_model['trend_pct']:.1f}%</strong> dalam beberapa tahun terakhir.
+                Sangat cocok untuk investasi jangka panjang dengan potensi keuntungan yang menjanjikan.
+            </p>
+        </div>
+        """
+    elif best_model['trend_pct'] > 0:
+        best_card = f"""
+        <div style='background: linear-gradient(135deg, #dbeafe 0%, #bfdbfe 100%);
+                    padding: 20px; border-radius: 12px;
+                    box-shadow: 0 2px 6px rgba(0,0,0,0.08);
+                    border-top: 4px solid #3b82f6; height: 200px;'>
+            <p style='color: #1e40af; margin: 0 0 12px 0; font-size: 14px; font-weight: 600; text-align: center;'>
+                📊 Model Stabil
+            </p>
+            <p style='color: #1e3a8a; margin: 0; font-size: 14px; line-height: 1.7; text-align: justify;'>
+                <strong style='font-size: 18px; display: block; text-align: center; margin-bottom: 8px;'>{best_model['model']}</strong>
+                menunjukkan pertumbuhan stabil dengan kenaikan <strong>{best_model['trend_pct']:.1f}%</strong>.
+                Pilihan yang aman dengan risiko rendah untuk investor yang mengutamakan stabilitas.
+            </p>
+        </div>
+        """
+
+    # Card 2: Prediksi Masa Depan
+    if best_future_model['future_trend_pct'] > 3:
+        future_card = f"""
+        <div style='background: linear-gradient(135deg, #e0e7ff 0%, #c7d2fe 100%);
+                    padding: 20px; border-radius: 12px;
+                    box-shadow: 0 2px 6px rgba(0,0,0,0.08);
+                    border-top: 4px solid #6366f1; height: 200px;'>
+            <p style='color: #3730a3; margin: 0 0 12px 0; font-size: 14px; font-weight: 600; text-align: center;'>
+                🔮 Prediksi Terbaik
+            </p>
+            <p style='color: #312e81; margin: 0; font-size: 14px; line-height: 1.7; text-align: justify;'>
+                <strong style='font-size: 18px; display: block; text-align: center; margin-bottom: 8px;'>{best_future_model['model']}</strong>
+                diprediksi mengalami kenaikan harga sebesar <strong>+{best_future_model['future_trend_pct']:.1f}%</strong> di masa depan.
+                Ini adalah waktu yang tepat untuk membeli dengan potensi keuntungan tinggi.
+            </p>
+        </div>
+        """
+    elif best_future_model['future_trend_pct'] < -3:
+        future_card = f"""
+        <div style='background: linear-gradient(135deg, #fee2e2 0%, #fecaca 100%);
+                    padding: 20px; border-radius: 12px;
+                    box-shadow: 0 2px 6px rgba(0,0,0,0.08);
+                    border-top: 4px solid #ef4444; height: 200px;'>
+            <p style='color: #991b1b; margin: 0 0 12px 0; font-size: 14px; font-weight: 600; text-align: center;'>
+                ⚠️ Perhatian
+            </p>
+            <p style='color: #7f1d1d; margin: 0; font-size: 14px; line-height: 1.7; text-align: justify;'>
+                <strong style='font-size: 18px; display: block; text-align: center; margin-bottom: 8px;'>{best_future_model['model']}</strong>
+                diprediksi mengalami penurunan harga sekitar <strong>{best_future_model['future_trend_pct']:.1f}%</strong>.
+                Pertimbangkan untuk menjual sekarang sebelum harga turun lebih jauh.
+            </p>
+        </div>
+        """
+    else:
+        future_card = f"""
+        <div style='background: linear-gradient(135deg, #e0e7ff 0%, #c7d2fe 100%);
+                    padding: 20px; border-radius: 12px;
+                    box-shadow: 0 2px 6px rgba(0,0,0,0.08);
+                    border-top: 4px solid #6366f1; height: 200px;'>
+            <p style='color: #3730a3; margin: 0 0 12px 0; font-size: 14px; font-weight: 600; text-align: center;'>
+                📊 Stabilitas Harga
+            </p>
+            <p style='color: #312e81; margin: 0; font-size: 14px; line-height: 1.7; text-align: justify;'>
+                <strong style='font-size: 18px; display: block; text-align: center; margin-bottom: 8px;'>{best_future_model['model']}</strong>
+                diprediksi akan mempertahankan harga yang relatif stabil dengan perubahan <strong>{best_future_model['future_trend_pct']:+.1f}%</strong>.
+                Cocok untuk strategi HOLD tanpa urgensi untuk membeli atau menjual.
+            </p>
+        </div>
+        """
+
+    # Card 3: Model Paling Stabil
+    stable_card = f"""
+    <div style='background: linear-gradient(135deg, #fef3c7 0%, #fde68a 100%);
+                padding: 20px; border-radius: 12px;
+                box-shadow: 0 2px 6px rgba(0,0,0,0.08);
+                border-top: 4px solid #f59e0b; height: 200px;'>
+        <p style='color: #92400e; margin: 0 0 12px 0; font-size: 14px; font-weight: 600; text-align: center;'>
+            🛡️ Paling Stabil
+        </p>
+        <p style='color: #78350f; margin: 0; font-size: 14px; line-height: 1.7; text-align: justify;'>
+            <strong style='font-size: 18px; display: block; text-align: center; margin-bottom: 8px;'>{most_stable_model['model']}</strong>
+            memiliki volatilitas harga terendah, artinya harga lebih konsisten dan dapat diprediksi.
+            Ideal untuk investor yang menghindari fluktuasi harga yang ekstrem.
+        </p>
+    </div>
+    """
+
+    # Card 4: Perbandingan Performa
+    compare_card = None
+    if ranking['count'] > 1:
+        compare_card = f"""
+        <div style='background: linear-gradient(135deg, #fce7f3 0%, #fbcfe8 100%);
+                    padding: 20px; border-radius: 12px;
+                    box-shadow: 0 2px 6px rgba(0,0,0,0.08);
+                    border-top: 4px solid #ec4899; height: 200px;'>
+            <p style='color: #831843; margin: 0 0 12px 0; font-size: 14px; font-weight: 600; text-align: center;'>
+                ⚖️ Perbandingan
+            </p>
+            <p style='color: #831843; margin: 0; font-size: 14px; line-height: 1.7; text-align: justify;'>
+                Model terbaik <strong>{best_model['model']}</strong> tumbuh <strong style='color: #15803d;'>{best_model['trend_pct']:+.1f}%</strong>,
+                sementara <strong>{worst_model['model']}</strong> hanya <strong style='color: #991b1b;'>{worst_model['trend_pct']:+.1f}%</strong>.
+                Perbedaan performa yang signifikan menunjukkan pentingnya pemilihan model yang tepat.
+            </p>
+        </div>
+        """
+
+    return [best_card, future_card, stable_card, compare_card]
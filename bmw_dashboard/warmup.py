@@ -0,0 +1,132 @@
+"""Pra-komputasi statistik insight untuk semua kombinasi filter saat start.
+
+Statistik insight satu model (rata-rata terkini, tren, tren masa depan dan
+volatilitas) hanya bergantung pada baris model itu sendiri, pilihan
+transmisi dan tahun, bukan pada model lain yang ikut dipilih. Karena itu
+data dipartisi per Model: setiap worker di process pool menghitung statistik
+modelnya untuk setiap kombinasi (transmisi, tahun), lalu hasilnya digabung
+menjadi `InsightTable` read-only. Insight per klik cukup berupa lookup +
+ranking beberapa baris.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from bmw_dashboard.cube import rollup, slice_cube
+from bmw_dashboard.forecast import pool_context
+from bmw_dashboard.insights import INSIGHT_COLUMNS, model_insights, rank_models
+
+# Di bawah jumlah baris ini overhead process pool lebih besar dari hasilnya
+POOL_MIN_ROWS = 200_000
+
+# Kolom baris yang dikirim ke worker (filter transmisi/tahun + statistik insight)
+WORKER_COLUMNS = ['Year', 'Transmission', 'Model', 'Price_USD', 'Type']
+
+
+def filter_combinations(transmissions, years):
+    """Semua kombinasi (transmisi, tahun) yang bisa dihasilkan FilterState"""
+    transmission_options = [None] + [
+        subset
+        for size in range(1, len(transmissions) + 1)
+        for subset in combinations(sorted(transmissions), size)
+    ]
+    return [(t, y) for t in transmission_options for y in [None] + sorted(years)]
+
+
+def _insight_block(block):
+    """Worker: statistik insight model-model di blok ini untuk setiap kombinasi"""
+    rows, forecast_cube, combos = block
+    results = {}
+    for transmissions, year in combos:
+        mask = (rows['Type'] == 'Actual').to_numpy()
+        if transmissions is not None:
+            mask = mask & rows['Transmission'].isin(transmissions).to_numpy()
+        if year is not None:
+            mask = mask & (rows['Year'] == year).to_numpy()
+        actual = rows[mask]
+        if actual.empty:
+            continue
+
+        forecast = slice_cube(
+            forecast_cube,
+            Transmission=list(transmissions) if transmissions else None,
+            Year=[year] if year is not None else None,
+        )
+        forecast = rollup(forecast, ['Model'])[['Model', 'mean']]
+        forecast = forecast.rename(columns={'mean': 'Price_USD'})
+
+        stats = model_insights(actual, forecast)
+        # Posisi kemunculan pertama model (urutan tie-break seperti tanpa warm-up)
+        first_row = actual.groupby('Model', observed=True)['_row'].min()
+        stats['first_row'] = first_row.reindex(stats['model']).to_numpy()
+        results[(transmissions, year)] = stats
+    return results
+
+
+class InsightTable:
+    """Statistik insight pra-komputasi per (transmisi, tahun), read-only"""
+
+    def __init__(self, parts, version):
+        """Gabungkan hasil worker (dict kombinasi -> statistik) menjadi satu tabel"""
+        self.version = version
+        merged = {}
+        for part in parts:
+            for key, stats in part.items():
+                merged.setdefault(key, []).append(stats)
+        self._groups = {
+            key: pd.concat(frames, ignore_index=True)
+            .sort_values('first_row', kind='stable')
+            .reset_index(drop=True)
+            for key, frames in merged.items()
+        }
+
+    def __len__(self):
+        return sum(len(group) for group in self._groups.values())
+
+    def covers(self, state):
+        """True jika state bisa dijawab tabel (tanpa filter Region/Fuel_Type/rentang tahun)"""
+        return state.regions is None and state.fuel_types is None and state.year_range is None
+
+    def ranking(self, state):
+        """Ranking insight untuk FilterState (lookup, tanpa hitung ulang)"""
+        group = self._groups.get((state.transmissions, state.year))
+        if group is None:
+            return None
+        if state.models is not None:
+            group = group[group['model'].isin(state.models)]
+        return rank_models(group[INSIGHT_COLUMNS].reset_index(drop=True))
+
+
+def build_insight_table(df, cube, version=0, workers=None):
+    """Hitung statistik insight semua model x kombinasi filter di process pool"""
+    rows = df[WORKER_COLUMNS].assign(_row=np.arange(len(df)))
+    forecast_cube = cube[cube['Type'] == 'Forecast']
+    combos = filter_combinations(
+        rows['Transmission'].dropna().unique().tolist(),
+        [int(y) for y in rows['Year'].unique()],
+    )
+
+    # Partisi per Model: statistik satu model tidak bergantung model lain
+    models = rows['Model'].dropna().unique().tolist()
+    if len(rows) < POOL_MIN_ROWS:
+        workers = 1
+    n_blocks = max(1, min(workers or os.cpu_count() or 1, len(models)))
+    blocks = []
+    for part in np.array_split(np.arange(len(models)), n_blocks):
+        part_models = [models[i] for i in part]
+        blocks.append((
+            rows[rows['Model'].isin(part_models)],
+            forecast_cube[forecast_cube['Model'].isin(part_models)],
+            combos,
+        ))
+
+    if n_blocks == 1:
+        parts = [_insight_block(blocks[0])]
+    else:
+        # Warm-up juga berjalan di thread refresher: worker tidak di-fork dari sini
+        with ProcessPoolExecutor(max_workers=n_blocks, mp_context=pool_context()) as pool:
+            parts = list(pool.map(_insight_block, blocks))
+    return InsightTable(parts, version)
@@ -0,0 +1,24 @@
+import os
+import shutil
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CSV = os.path.join(ROOT, 'bmw_pricing_data.csv')
+
+
+@pytest.fixture
+def csv_copy(tmp_path):
+    """Salinan dataset di folder sementara (Parquet & file turunan ditulis di sana)"""
+    path = tmp_path / 'bmw_pricing_data.csv'
+    shutil.copy(CSV, path)
+    return str(path), str(tmp_path / 'bmw_pricing_data.parquet')
+
+
+@pytest.fixture(scope='session')
+def raw_df():
+    return pd.read_csv(CSV)
@@ -0,0 +1,20 @@
+import numpy as np
+
+from bmw_dashboard.cache import ResultCache
+
+
+def test_maxbytes_evicts_and_skips_large_entries():
+    """Cache dengan batas byte membuang entri lama dan tidak menyimpan entri terlalu besar"""
+    cache = ResultCache(maxsize=10, maxbytes=1000)
+    for key in range(3):
+        cache.get_or_compute(key, lambda: np.zeros(50, dtype='int64'))  # 400 byte
+    assert cache.stats()['size'] == 2
+    assert cache.nbytes == 800
+
+    cache.get_or_compute('big', lambda: np.zeros(200, dtype='int64'))  # 1600 byte
+    assert cache.stats()['size'] == 2
+    cache.get_or_compute('big', lambda: np.zeros(200, dtype='int64'))
+    assert cache.stats()['misses'] == 5
+
+    cache.clear()
+    assert cache.nbytes == 0
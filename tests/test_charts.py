@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from bmw_dashboard import charts, views
+from bmw_dashboard.currency import CurrencyTable
+
+
+def trend_frame(n_years, models=('X5', 'M3')):
+    years = np.arange(2000, 2000 + n_years)
+    return pd.DataFrame({
+        'Year': np.tile(years, len(models)),
+        'Model': np.repeat(models, n_years),
+        'Price_Converted': np.random.default_rng(0).normal(60_000, 5_000, n_years * len(models)),
+    })
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(1000)
+    y = np.sin(x / 50.0)
+    y[500] = 25.0  # spike harus tetap terlihat setelah downsampling
+    selected = charts.lttb(x, y, 100)
+
+    assert len(selected) == 100
+    assert selected[0] == 0 and selected[-1] == 999
+    assert np.all(np.diff(selected) > 0)
+    assert 500 in selected
+
+
+def test_lttb_returns_all_points_when_small():
+    np.testing.assert_array_equal(charts.lttb(np.arange(10), np.ones(10), 50), np.arange(10))
+
+
+def test_downsample_caps_each_series():
+    frame = trend_frame(3000)
+    sampled = charts.downsample(frame, 'Year', 'Price_Converted', 'Model', 200)
+    assert sampled.groupby('Model').size().tolist() == [200, 200]
+    assert sampled.index.is_monotonic_increasing
+
+
+def test_trend_figure_switches_to_webgl_above_threshold():
+    currencies = CurrencyTable()
+    small = views.trend_figure(trend_frame(20), currencies, 'USD', show_point_labels=True)
+    assert all(isinstance(trace, go.Scatter) for trace in small.data)
+
+    large = views.trend_figure(
+        trend_frame(3000), currencies, 'USD', show_point_labels=True,
+        webgl_points=5000, chart_width=300,
+    )
+    assert all(isinstance(trace, go.Scattergl) for trace in large.data)
+    # Setiap seri di-downsample ke lebar grafik
+    assert max(len(trace.x) for trace in large.data[:2]) == 300
+
+
+def test_frame_key_follows_content():
+    frame = trend_frame(10)
+    assert charts.frame_key(frame) == charts.frame_key(frame.copy())
+    changed = frame.assign(Price_Converted=frame['Price_Converted'] + 1)
+    assert charts.frame_key(changed) != charts.frame_key(frame)
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bmw_dashboard.cube import YOY_KEYS, build_cube, merge_cubes, rollup, slice_cube, yoy_table
+from bmw_dashboard.engine import DashboardEngine, FilterState
+
+STATES = [
+    {},
+    {'transmissions': ['Manual']},
+    {'models': ['X5', 'i8'], 'regions': ['Asia', 'Europe']},
+    {'year': 2021, 'fuel_types': ['Diesel']},
+    {'year_range': (2016, 2019), 'models': ['M3']},
+]
+
+
+def filter_rows(df, state):
+    """Filter baris mentah dengan pandas biasa (referensi)"""
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in state.selections().items():
+        if values is not None:
+            mask = mask & df[col].isin(values).to_numpy()
+    return df[mask]
+
+
+@pytest.fixture
+def engine(csv_copy):
+    return DashboardEngine.load(*csv_copy)
+
+
+def test_merge_cubes_matches_single_build(raw_df):
+    half = len(raw_df) // 2
+    merged = merge_cubes(build_cube(raw_df.iloc[:half]), build_cube(raw_df.iloc[half:]))
+    expected = build_cube(raw_df)
+    pd.testing.assert_frame_equal(merged, expected, check_exact=False, check_categorical=False)
+
+
+def test_rollup_mean_and_std_match_raw_rows(raw_df):
+    cube = slice_cube(build_cube(raw_df), Model=['X3'])
+    by_year = rollup(cube, ['Year']).set_index('Year')
+    grouped = raw_df[raw_df['Model'] == 'X3'].groupby('Year')['Price_USD']
+    np.testing.assert_allclose(by_year['mean'], grouped.mean())
+    np.testing.assert_allclose(by_year['std'], grouped.std())
+    np.testing.assert_array_equal(by_year['min'], grouped.min())
+
+
+@pytest.mark.parametrize('selection', STATES)
+def test_kpis_match_raw_rows(engine, raw_df, selection):
+    """KPI dari cube sama dengan perhitungan baris mentah (seperti app sebelum cube)"""
+    state = FilterState.from_selection(**selection)
+    rows = filter_rows(raw_df, state)
+    actual = rows[rows['Type'] == 'Actual']
+    forecast = rows[rows['Type'] == 'Forecast']['Price_USD']
+
+    years = state.years()
+    if years is None:
+        available = sorted(actual['Year'].unique())
+        current = actual[actual['Year'] == available[-1]]['Price_USD']
+        prev = actual[actual['Year'] == available[-2]]['Price_USD']
+    else:
+        all_actual = filter_rows(raw_df, FilterState.from_selection(
+            **{key: value for key, value in selection.items() if key not in ('year', 'year_range')}
+        ))
+        all_actual = all_actual[all_actual['Type'] == 'Actual']
+        current = all_actual[all_actual['Year'].isin(years)]['Price_USD']
+        prev = all_actual[all_actual['Year'].isin([y - 1 for y in years])]['Price_USD']
+
+    kpis = engine.kpis(state)
+    assert kpis['has_actual']
+    assert kpis['min'] == pytest.approx(current.min())
+    assert kpis['max'] == pytest.approx(current.max())
+    assert kpis['avg'] == pytest.approx(current.mean())
+    assert kpis['min_pct'] == pytest.approx((current.min() - prev.min()) / prev.min() * 100)
+    assert kpis['avg_pct'] == pytest.approx((current.mean() - prev.mean()) / prev.mean() * 100)
+    assert kpis['predicted'] == pytest.approx(forecast.mean() if len(forecast) else current.mean())
+
+
+@pytest.mark.parametrize('selection', STATES)
+def test_trend_bar_and_table_match_raw_rows(engine, raw_df, selection):
+    state = FilterState.from_selection(**selection)
+    rows = filter_rows(raw_df, state)
+
+    trend = engine.trend(state)
+    expected = rows.groupby(['Year', 'Model'], observed=True)['Price_USD'].mean()
+    np.testing.assert_allclose(trend['Price_USD'].to_numpy(), expected.to_numpy())
+
+    model_avg = engine.model_averages(state).set_index('Model')['Price_USD']
+    expected = rows.groupby('Model', observed=True)['Price_USD'].mean()
+    np.testing.assert_allclose(model_avg.sort_index().to_numpy(), expected.sort_index().to_numpy())
+
+    table = engine.model_table(state).set_index('Model')
+    for model, model_rows in rows.groupby('Model', observed=True):
+        forecast = model_rows[model_rows['Type'] == 'Forecast']['Price_USD']
+        avg = model_rows['Price_USD'].mean()
+        assert table.loc[model, 'avg'] == pytest.approx(avg)
+        assert table.loc[model, 'pred'] == pytest.approx(forecast.mean() if len(forecast) else avg)
+    assert table.loc['Total', 'avg'] == pytest.approx(rows['Price_USD'].mean())
+
+
+def test_yoy_table_pairs_each_year_with_previous(raw_df):
+    table = yoy_table(build_cube(raw_df)).set_index(YOY_KEYS + ['Year'])
+    actual = raw_df[raw_df['Type'] == 'Actual']
+    grouped = actual.groupby(YOY_KEYS + ['Year'])['Price_USD']
+
+    key = ('X5', 'Automatic', 'Asia', 'Diesel')
+    for year in (2012, 2018):
+        row = table.loc[key + (year,)]
+        current, prev = grouped.get_group(key + (year,)), grouped.get_group(key + (year - 1,))
+        assert row['count'] == len(current)
+        assert row['min'] == current.min()
+        assert row['mean'] == pytest.approx(current.mean())
+        assert row['max_prev'] == prev.max()
+        assert row['mean_pct'] == pytest.approx((current.mean() - prev.mean()) / prev.mean() * 100)
+
+
+def test_yoy_table_keeps_keys_missing_in_current_year(raw_df):
+    """Outer join: kunci yang hanya ada di tahun sebelumnya tetap punya baris (count 0)"""
+    rows = raw_df[~((raw_df['Model'] == 'i8') & (raw_df['Year'] == 2019))]
+    table = yoy_table(build_cube(rows))
+    i8 = table[(table['Model'] == 'i8') & (table['Year'] == 2019)]
+    assert len(i8) > 0
+    assert (i8['count'] == 0).all()
+    prev = raw_df[(raw_df['Model'] == 'i8') & (raw_df['Year'] == 2018) & (raw_df['Type'] == 'Actual')]
+    assert i8['count_prev'].sum() == len(prev) > 0
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bmw_dashboard.currency import CurrencyTable
+from bmw_dashboard.engine import DashboardEngine, FilterState
+
+# Kurs berubah di batas tahun 2015 & 2020 (as-of: berlaku sampai titik berikutnya)
+HISTORY = pd.DataFrame({
+    'currency': ['EUR'] * 3,
+    'Year': [2010, 2015, 2020],
+    'rate': [0.5, 1.0, 2.0],
+})
+
+
+def expected_rate(year):
+    return 0.5 if year < 2015 else (1.0 if year < 2020 else 2.0)
+
+
+@pytest.fixture
+def engine(csv_copy):
+    csv_path, parquet_path = csv_copy
+    return DashboardEngine.load(csv_path, parquet_path)
+
+
+@pytest.fixture
+def rates(engine):
+    return CurrencyTable(history=HISTORY).year_rates('EUR', engine.years())
+
+
+@pytest.fixture
+def converted(raw_df):
+    """Baris mentah dengan harga dikonversi kurs tahunnya sendiri"""
+    return raw_df.assign(Price=raw_df['Price_USD'] * raw_df['Year'].map(expected_rate))
+
+
+def test_year_rates_asof_boundaries(rates):
+    series = rates.series()
+    for year in (2014, 2015, 2019, 2020, 2024):
+        assert series[year] == expected_rate(year)
+
+
+@pytest.mark.parametrize('year, year_range', [(2015, None), (2020, None), (None, (2014, 2020))])
+def test_kpis_convert_each_year_at_its_rate(engine, rates, converted, year, year_range):
+    state = FilterState.from_selection(year=year or 'All', year_range=year_range, models=['X5'])
+    kpis = engine.kpis(state, rates)
+
+    years = state.years()
+    rows = converted[converted['Model'] == 'X5']
+    actual = rows[rows['Type'] == 'Actual']
+    current = actual[actual['Year'].isin(years)]['Price']
+    prev = actual[actual['Year'].isin([y - 1 for y in years])]['Price']
+    forecast = rows[(rows['Type'] == 'Forecast') & rows['Year'].isin(years)]['Price']
+
+    assert kpis['min'] == pytest.approx(current.min())
+    assert kpis['max'] == pytest.approx(current.max())
+    assert kpis['avg'] == pytest.approx(current.mean())
+    assert kpis['avg_pct'] == pytest.approx((current.mean() - prev.mean()) / prev.mean() * 100)
+    if len(forecast):
+        assert kpis['predicted'] == pytest.approx(forecast.mean())
+
+
+def test_trend_and_model_table_convert_per_year(engine, rates, converted):
+    state = FilterState.from_selection(transmissions=['Automatic'])
+    rows = converted[converted['Transmission'] == 'Automatic']
+
+    trend = engine.trend(state, rates)
+    expected = rows.groupby(['Year', 'Model'], observed=True)['Price'].mean().to_numpy()
+    np.testing.assert_allclose(trend['Price_EUR'].to_numpy(), expected)
+
+    table = engine.model_table(state, rates).set_index('Model')
+    np.testing.assert_allclose(
+        table.loc[['X5', 'Total'], 'avg'].to_numpy(),
+        [rows.loc[rows['Model'] == 'X5', 'Price'].mean(), rows['Price'].mean()],
+    )
+
+
+def test_currency_switch_is_cache_hit(engine, rates):
+    """Kurs diterapkan setelah lookup: mata uang baru tidak menghitung ulang panel"""
+    state = FilterState.from_selection(year=2020)
+    for panel in (engine.kpis, engine.trend, engine.model_averages, engine.model_table):
+        panel(state)
+    misses = engine.cache_stats()['misses']
+    for panel in (engine.kpis, engine.trend, engine.model_averages, engine.model_table):
+        panel(state, rates)
+    assert engine.cache_stats()['misses'] == misses
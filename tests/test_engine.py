@@ -0,0 +1,139 @@
+import gc
+import os
+
+import pandas as pd
+import pytest
+
+from bmw_dashboard.currency import CurrencyTable
+from bmw_dashboard.engine import DashboardEngine, FilterState
+
+
+def test_yoy_table_kept_without_result_cache(csv_copy):
+    """Tabel YoY dibangun saat load dan tidak bergantung cache hasil (cache_size=0)"""
+    csv_path, parquet_path = csv_copy
+    engine = DashboardEngine.load(csv_path, parquet_path, cache_size=0)
+    cached = DashboardEngine.load(csv_path, parquet_path)
+    rates = CurrencyTable().year_rates('EUR', engine.years())
+
+    assert engine.yoy_in() is engine.yoy_in()
+    assert engine.yoy_in(rates) is engine.yoy_in(rates)
+    state = FilterState.from_selection(year=2020)
+    assert engine.kpis(state, rates) == cached.kpis(state, rates)
+
+    # Data berubah -> tabel YoY ikut dibangun ulang
+    before = engine.yoy_in()
+    engine.append(pd.DataFrame({
+        'Year': [2020], 'Transmission': ['Manual'], 'Model': ['X5'], 'Region': ['Asia'],
+        'Fuel_Type': ['Diesel'], 'Price_USD': [1.0], 'Type': ['Actual'],
+    }))
+    assert engine.yoy_in() is not before
+    assert engine.kpis(state)['min'] == 1.0
+
+
+@pytest.mark.parametrize('mode', ['duckdb', 'streaming'])
+def test_refreshed_keeps_old_snapshot(csv_copy, mode):
+    """Engine lama tetap membaca versinya sendiri setelah append & reload"""
+    csv_path, parquet_path = csv_copy
+    if mode == 'duckdb':
+        engine = DashboardEngine.load_duckdb(csv_path, parquet_path, cache_size=0)
+    else:
+        engine = DashboardEngine.load_streaming(
+            csv_path, spill_dir=parquet_path + '.spill', cache_size=0
+        )
+    state = FilterState.from_selection()
+    total = engine.row_total(state)
+
+    with open(csv_path, 'a', newline='') as f:
+        f.write('2020,Asia,Diesel,Manual,X5,1,Actual\r\n')
+    appended = engine.refreshed()
+    assert appended.row_total(state) == total + 1
+    assert engine.row_total(state) == total
+
+    # CSV ditulis ulang lebih pendek -> reload penuh ke generasi baru
+    with open(csv_path, newline='') as f:
+        lines = f.readlines()
+    with open(csv_path, 'w', newline='') as f:
+        f.writelines(lines[:101])
+    reloaded = appended.refreshed()
+    assert reloaded.row_total(state) == 100
+    assert appended.row_total(state) == total + 1
+    assert engine.row_total(state) == total
+    assert engine.filter(state)['Price_USD'].min() > 1
+
+
+@pytest.mark.parametrize('mode', ['duckdb', 'streaming'])
+def test_spill_generation_removed_only_when_unused(csv_copy, mode):
+    """Load berikutnya tidak menghapus file engine lain; folder dihapus saat engine dilepas"""
+    csv_path, parquet_path = csv_copy
+
+    def load():
+        if mode == 'duckdb':
+            return DashboardEngine.load_duckdb(csv_path, parquet_path, cache_size=0)
+        return DashboardEngine.load_streaming(
+            csv_path, spill_dir=parquet_path + '.spill', cache_size=0
+        )
+
+    first = load()
+    state = FilterState.from_selection()
+    total = first.row_total(state)
+    others = [load() for _ in range(3)]
+    assert first.row_total(state) == total
+    assert len(first.filter(state)) == total
+
+    path = first.spill_generation.path
+    del first
+    gc.collect()
+    assert not os.path.exists(path)
+    assert all(os.path.isdir(engine.spill_generation.path) for engine in others)
+
+
+def test_row_page_matches_across_modes(csv_copy):
+    """Halaman drill-down sama di mode memori, DuckDB & streaming (termasuk urutan terbalik)"""
+    csv_path, parquet_path = csv_copy
+    engines = [
+        DashboardEngine.load(csv_path, parquet_path),
+        DashboardEngine.load_duckdb(csv_path, parquet_path),
+        DashboardEngine.load_streaming(csv_path, spill_dir=parquet_path + '.spill'),
+        # Banyak part file kecil: jendela halaman melintasi batas part
+        DashboardEngine.load_streaming(
+            csv_path, chunk_rows=97, spill_dir=parquet_path + '.spill-small'
+        ),
+    ]
+    state = FilterState.from_selection(models=['X5', 'M3'])
+    cases = [
+        (7, None, False), (190, None, False), (190, None, True),
+        (7, 'Price_USD', True), (150, 'Region', False), (10 ** 6, None, True),
+    ]
+    for offset, sort_by, descending in cases:
+        pages = [
+            engine.row_page(state, offset=offset, limit=25, sort_by=sort_by, descending=descending)
+            for engine in engines
+        ]
+        expected, total = pages[0]
+        for rows, count in pages[1:]:
+            assert count == total
+            pd.testing.assert_frame_equal(
+                rows.astype(str), expected.astype(str), check_categorical=False
+            )
+
+
+@pytest.mark.parametrize('mode', ['memory', 'streaming'])
+def test_partial_last_line_deferred_to_refresh(csv_copy, mode):
+    """Baris terakhir yang belum lengkap tidak ikut di-load, lalu di-ingest setelah selesai ditulis"""
+    csv_path, parquet_path = csv_copy
+    total = DashboardEngine.load(csv_path, parquet_path).row_count()
+    os.remove(parquet_path)
+    with open(csv_path, 'a', newline='') as f:
+        f.write('2020,Asia,Diesel,Man')
+
+    if mode == 'memory':
+        engine = DashboardEngine.load(csv_path, parquet_path)
+    else:
+        engine = DashboardEngine.load_streaming(csv_path)
+    assert engine.row_count() == total
+
+    with open(csv_path, 'a', newline='') as f:
+        f.write('ual,X5,1,Actual\r\n')
+    # Ingest inkremental 1 baris, bukan reload penuh karena CSV dianggap ditulis ulang
+    assert engine.refresh() == 1
+    assert engine.row_count() == total + 1
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bmw_dashboard import forecast, storage
+from bmw_dashboard.cube import build_cube
+
+
+def test_pool_fit_matches_single_process(raw_df, monkeypatch):
+    """Fitting per blok di process pool (forkserver/spawn) sama dengan satu proses"""
+    cube = build_cube(raw_df)
+    expected = forecast.fit_series(cube, workers=1)
+
+    monkeypatch.setattr(forecast, 'POOL_MIN_SERIES', 1)
+    pooled = forecast.fit_series(cube, workers=2)
+    pd.testing.assert_frame_equal(pooled, expected)
+
+
+def series_cube(prices, model='X5'):
+    """Cube satu seri Actual dari harga per tahun (mulai 2010)"""
+    years = np.arange(2010, 2010 + len(prices))
+    df = pd.DataFrame({
+        'Year': years.astype('int16'),
+        'Model': model, 'Transmission': 'Manual', 'Region': 'Asia', 'Fuel_Type': 'Diesel',
+        'Price_USD': np.asarray(prices, dtype='float64'),
+        'Type': 'Actual',
+    })
+    categorical = ['Model', 'Transmission', 'Region', 'Fuel_Type', 'Type']
+    return build_cube(df.astype({col: 'category' for col in categorical}))
+
+
+@pytest.mark.parametrize('prices, method, expected', [
+    # Tren linear: +1000 per tahun
+    (50_000 + 1_000 * np.arange(11), 'linear', 61_000),
+    # Pertumbuhan konstan 5% per tahun
+    (40_000 * 1.05 ** np.arange(11), 'log', 40_000 * 1.05 ** 11),
+])
+def test_fit_picks_method_and_extrapolates(prices, method, expected):
+    params = forecast.fit_series(series_cube(prices))
+    assert params.loc[0, 'method'] == method
+    predicted = forecast.predict(params, [2021])
+    assert predicted.loc[0, 'Price_USD'] == pytest.approx(expected, rel=1e-6)
+
+
+def test_with_model_forecast_replaces_forecast_cells(csv_copy, tmp_path):
+    # Cube bertipe kategori seperti di engine (dtype storage)
+    cube = build_cube(storage.read_csv(csv_copy[0]))
+    result = forecast.with_model_forecast(cube, str(tmp_path / 'params.parquet'))
+
+    actual = cube[cube['Type'] == 'Actual'].reset_index(drop=True)
+    pd.testing.assert_frame_equal(
+        result[result['Type'] == 'Actual'].reset_index(drop=True), actual
+    )
+    last = int(actual['Year'].max())
+    forecast_years = sorted(result.loc[result['Type'] == 'Forecast', 'Year'].unique())
+    assert forecast_years == list(range(last + 1, last + 1 + forecast.DEFAULT_HORIZON))
+
+
+def test_fit_cached_reuses_parameters_until_data_changes(raw_df, tmp_path, monkeypatch):
+    cube = build_cube(raw_df)
+    cache_path = str(tmp_path / 'params.parquet')
+    fitted = forecast.fit_cached(cube, cache_path)
+
+    def no_fit(*args, **kwargs):
+        raise AssertionError("fit_series dipanggil padahal cache cocok")
+
+    monkeypatch.setattr(forecast, 'fit_series', no_fit)
+    pd.testing.assert_frame_equal(forecast.fit_cached(cube, cache_path), fitted)
+
+    # Data actual berubah -> fingerprint berbeda -> fit ulang
+    changed = cube.copy()
+    changed.loc[changed.index[0], 'sum'] += 1.0
+    with pytest.raises(AssertionError, match="fit_series dipanggil"):
+        forecast.fit_cached(changed, cache_path)
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from bmw_dashboard.index import FilterIndex
+
+
+def test_extended_widens_codes_past_int8():
+    """Append yang menambah kategori melewati 127 tidak boleh membuat kode negatif"""
+    df = pd.DataFrame({
+        'Model': pd.Categorical([f"m{i:03d}" for i in range(120)] * 2),
+        'Year': np.tile([2020, 2021], 120),
+    })
+    index = FilterIndex(df, columns=('Model', 'Year'))
+    assert index.columns['Model'].codes.dtype == np.int8
+
+    new_rows = pd.DataFrame({
+        'Model': pd.Categorical([f"n{i:03d}" for i in range(40)]),
+        'Year': [2020] * 40,
+    })
+    extended = index.extended(new_rows)
+    full = pd.concat([df.astype({'Model': str}), new_rows.astype({'Model': str})], ignore_index=True)
+
+    models = ['m005', 'n010', 'n039']
+    rows = extended.rows(Model=models, Year=[2020])
+    expected = np.flatnonzero(full['Model'].isin(models) & (full['Year'] == 2020))
+    np.testing.assert_array_equal(rows, expected)
+    assert (extended.columns['Model'].codes >= 0).all()
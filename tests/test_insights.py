@@ -0,0 +1,101 @@
+import pytest
+
+from bmw_dashboard.engine import DashboardEngine, FilterState
+
+
+def original_ranking(filtered_df):
+    """Loop analisis per model dari app.py sebelum divektorisasi (acuan).
+
+    Satu-satunya perbedaan: sort per Year dibuat stabil, sama dengan
+    `model_insights` (quicksort asli tidak menentukan urutan baris setahun).
+    """
+    actual_data = filtered_df[filtered_df['Type'] == 'Actual']
+    forecast_data = filtered_df[filtered_df['Type'] == 'Forecast']
+    if actual_data.empty:
+        return None
+    model_analysis = []
+    for model in filtered_df['Model'].unique():
+        model_data = actual_data[actual_data['Model'] == model]
+        model_forecast = forecast_data[forecast_data['Model'] == model]
+        if len(model_data) >= 2:
+            sorted_data = model_data.sort_values('Year', kind='stable')
+            recent_years = sorted_data.tail(3)['Price_USD'].mean()
+            older_years = sorted_data.head(max(3, len(sorted_data) - 3))['Price_USD'].mean()
+            trend_pct = ((recent_years - older_years) / older_years * 100) if older_years > 0 else 0
+            if not model_forecast.empty:
+                future_price = model_forecast['Price_USD'].mean()
+                future_trend_pct = ((future_price - recent_years) / recent_years * 100) if recent_years > 0 else 0
+            else:
+                future_trend_pct = 0
+            model_analysis.append({
+                'model': model,
+                'trend_pct': trend_pct,
+                'future_trend_pct': future_trend_pct,
+                'volatility': model_data['Price_USD'].std(),
+            })
+    if not model_analysis:
+        return None
+    model_analysis.sort(key=lambda x: x['trend_pct'], reverse=True)
+    return {
+        'best': model_analysis[0]['model'],
+        'worst': model_analysis[-1]['model'],
+        'best_future': sorted(model_analysis, key=lambda x: x['future_trend_pct'], reverse=True)[0]['model'],
+        'most_stable': sorted(model_analysis, key=lambda x: x['volatility'])[0]['model'],
+    }
+
+
+def filter_states(raw_df):
+    years = ['All'] + sorted(raw_df['Year'].unique().tolist())
+    models = sorted(raw_df['Model'].unique().tolist())
+    model_options = [None, models[:3], models[3:8], [models[0], models[-1]]]
+    for transmissions in [None, ['Automatic'], ['Manual']]:
+        for year in years:
+            for selected in model_options:
+                yield FilterState.from_selection(transmissions, year, selected)
+
+
+def filtered(raw_df, state):
+    mask = raw_df['Model'].notna()
+    for col, values in state.selections().items():
+        if values is not None:
+            mask = mask & raw_df[col].isin(values)
+    return raw_df[mask]
+
+
+@pytest.mark.parametrize('mode', ['memory', 'duckdb', 'streaming'])
+def test_ranking_matches_original_loop(csv_copy, raw_df, mode):
+    csv_path, parquet_path = csv_copy
+    if mode == 'memory':
+        engine = DashboardEngine.load(csv_path, parquet_path)
+    elif mode == 'duckdb':
+        pytest.importorskip('duckdb')
+        engine = DashboardEngine.load_duckdb(csv_path, parquet_path)
+    else:
+        # Insight mode streaming dibaca dari folder spill baris mentah
+        engine = DashboardEngine.load_streaming(csv_path, spill_dir=parquet_path + '.spill')
+
+    for state in filter_states(raw_df):
+        expected = original_ranking(filtered(raw_df, state))
+        ranking = engine.insights(state) if expected is not None else None
+        got = None if not ranking else {
+            role: ranking[role]['model'] for role in ('best', 'worst', 'best_future', 'most_stable')
+        }
+        assert got == expected, state
+
+
+def test_future_ties_go_to_best_trend():
+    """Tren masa depan seri (tahun tanpa Forecast): pilih model dengan tren terbaik"""
+    import pandas as pd
+
+    from bmw_dashboard.insights import rank_models
+
+    analysis = pd.DataFrame({
+        'model': ['A', 'B', 'C'],
+        'current_avg': [1.0, 1.0, 1.0],
+        'trend_pct': [1.0, 5.0, 3.0],
+        'future_trend_pct': [0.0, 0.0, 0.0],
+        'volatility': [2.0, 2.0, 1.0],
+    })
+    ranking = rank_models(analysis)
+    assert ranking['best_future']['model'] == 'B'
+    assert ranking['most_stable']['model'] == 'C'
@@ -0,0 +1,128 @@
+import gc
+import os
+import time
+
+import pytest
+
+from bmw_dashboard.engine import DashboardEngine, FilterState
+from bmw_dashboard.refresher import DataRefresher
+
+NEW_ROW = '2020,Asia,Diesel,Manual,X5,1,Actual\r\n'
+
+
+def append_row(csv_path):
+    with open(csv_path, 'a', newline='') as f:
+        f.write(NEW_ROW)
+
+
+def test_swap_only_when_source_changes(csv_copy):
+    """Rerun tanpa perubahan CSV memakai engine yang sama; setelah append engine ditukar"""
+    csv_path, parquet_path = csv_copy
+    refresher = DataRefresher(DashboardEngine.load(csv_path, parquet_path), interval=0)
+    old = refresher.current()
+    total = old.row_count()
+    assert refresher.current() is old
+    assert refresher.check() is False
+
+    append_row(csv_path)
+    fresh = refresher.current()
+    assert fresh is not old
+    assert fresh.row_count() == total + 1
+    # Snapshot yang dipegang rerun sebelumnya tidak berubah
+    assert old.row_count() == total
+    assert refresher.current() is fresh
+
+
+def test_prepare_runs_on_fresh_engine_before_swap(csv_copy):
+    csv_path, parquet_path = csv_copy
+    prepared = []
+    refresher = DataRefresher(
+        DashboardEngine.load(csv_path, parquet_path), interval=0, prepare=prepared.append
+    )
+    refresher.current()
+    assert prepared == []
+
+    append_row(csv_path)
+    fresh = refresher.current()
+    assert prepared == [fresh]
+
+
+def test_failed_rebuild_keeps_old_engine(csv_copy):
+    """Rebuild gagal -> versi lama tetap dilayani dan dicoba lagi pada pemeriksaan berikutnya"""
+    csv_path, parquet_path = csv_copy
+    failures = []
+
+    def prepare(engine):
+        if not failures:
+            failures.append(engine)
+            raise RuntimeError('warm-up gagal')
+
+    old = DashboardEngine.load(csv_path, parquet_path)
+    refresher = DataRefresher(old, interval=0, prepare=prepare)
+    append_row(csv_path)
+    with pytest.raises(RuntimeError):
+        refresher.check()
+    assert refresher.engine is old
+
+    assert refresher.check() is True
+    assert refresher.engine.row_count() == old.row_count() + 1
+
+
+def test_background_thread_records_error_and_keeps_serving(csv_copy):
+    csv_path, parquet_path = csv_copy
+
+    def prepare(engine):
+        raise RuntimeError('warm-up gagal')
+
+    old = DashboardEngine.load(csv_path, parquet_path)
+    refresher = DataRefresher(old, interval=0.01, prepare=prepare).start()
+    try:
+        append_row(csv_path)
+        deadline = time.monotonic() + 10
+        while refresher.error is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert refresher.error == 'RuntimeError: warm-up gagal'
+        assert refresher.current() is old
+    finally:
+        refresher.stop()
+
+
+@pytest.mark.parametrize('mode', ['duckdb', 'streaming'])
+def test_swap_releases_old_spill_generation(csv_copy, mode):
+    """Folder generasi lama dihapus setelah snapshot terakhir dilepas, generasi aktif tetap ada"""
+    csv_path, parquet_path = csv_copy
+    if mode == 'duckdb':
+        engine = DashboardEngine.load_duckdb(csv_path, parquet_path, cache_size=0)
+    else:
+        engine = DashboardEngine.load_streaming(
+            csv_path, spill_dir=parquet_path + '.spill', cache_size=0
+        )
+    state = FilterState.from_selection()
+    total = engine.row_total(state)
+    refresher = DataRefresher(engine, interval=0)
+    del engine
+
+    # Append: engine baru menambah part ke generasi yang sama
+    append_row(csv_path)
+    snapshot = refresher.current()
+    first_path = snapshot.spill_generation.path
+    assert snapshot.row_total(state) == total + 1
+
+    # CSV ditulis ulang -> reload penuh ke generasi baru
+    with open(csv_path, newline='') as f:
+        lines = f.readlines()
+    with open(csv_path, 'w', newline='') as f:
+        f.writelines(lines[:101])
+    current = refresher.current()
+    assert current.spill_generation.path != first_path
+    assert current.row_total(state) == 100
+
+    # Rerun yang masih memegang snapshot lama tetap membaca datanya
+    assert os.path.isdir(first_path)
+    assert len(snapshot.filter(state)) == total + 1
+
+    del snapshot
+    gc.collect()
+    assert not os.path.exists(first_path)
+    assert os.path.isdir(current.spill_generation.path)
+    assert len(refresher.current().filter(state)) == 100
@@ -0,0 +1,92 @@
+import json
+import os
+
+import pytest
+
+from bmw_dashboard import config, report
+from bmw_dashboard.currency import CurrencyTable
+from bmw_dashboard.engine import DashboardEngine
+
+
+@pytest.fixture
+def engine(csv_copy):
+    return DashboardEngine.load(*csv_copy)
+
+
+@pytest.fixture
+def run_cli(csv_copy, tmp_path, monkeypatch):
+    """Jalankan CLI laporan dengan dataset sementara, kembalikan folder output"""
+    monkeypatch.setenv(config.FORECAST_CACHE_ENV, str(tmp_path / 'forecast.parquet'))
+    out_dir = tmp_path / 'reports'
+
+    def run(*args):
+        report.main([str(out_dir), '--csv', csv_copy[0], '--parquet', csv_copy[1], *args])
+        return out_dir
+    return run
+
+
+def read_manifest(out_dir):
+    with open(out_dir / report.MANIFEST_FILE, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_combination_name_and_state():
+    combo = {'Region': 'Middle East', 'Fuel_Type': 'Petrol'}
+    assert report.combination_name(combo) == 'region-middle-east__fuel-type-petrol'
+    assert report.combination_name({}) == 'all'
+
+    state = report.combination_state(combo, year=2021)
+    selections = state.selections()
+    assert selections['Region'] == ['Middle East']
+    assert selections['Fuel_Type'] == ['Petrol']
+    assert selections['Model'] is None
+    assert state.years() == [2021]
+
+
+def test_combinations_cover_every_dimension_value(engine):
+    combos = report.report_combinations(engine, ['Region', 'Transmission'])
+    assert len(combos) == len(engine.regions()) * len(engine.transmissions())
+    assert len({report.combination_name(combo) for combo in combos}) == len(combos)
+
+
+def test_cli_writes_reports_manifest_and_index(run_cli):
+    out_dir = run_cli('--by', 'Region', '--workers', '1')
+    entries = read_manifest(out_dir)
+    assert len(entries) == 6
+    assert all(entry['status'] == 'ok' for entry in entries)
+    assert (out_dir / report.PLOTLYJS_FILE).exists()
+
+    index = (out_dir / report.INDEX_FILE).read_text(encoding='utf-8')
+    for entry in entries:
+        page = (out_dir / entry['files'][0]).read_text(encoding='utf-8')
+        assert f"Region: {entry['filters']['Region']}" in page
+        assert f"href='{entry['files'][0]}'" in index
+
+
+def test_cli_skip_existing_only_renders_missing_reports(run_cli):
+    out_dir = run_cli('--by', 'Region', '--workers', '1')
+    os.remove(out_dir / 'region-asia.html')
+
+    run_cli('--by', 'Region', '--workers', '1', '--skip-existing')
+    entries = read_manifest(out_dir)
+    # Manifest ditambah hanya untuk laporan yang dibuat ulang; index tetap lengkap
+    assert [entry['name'] for entry in entries[6:]] == ['region-asia']
+    assert (out_dir / 'region-asia.html').exists()
+    index = (out_dir / report.INDEX_FILE).read_text(encoding='utf-8')
+    assert index.count('<li>') == 6
+
+
+def test_pool_reports_match_single_process(engine, tmp_path):
+    currencies = CurrencyTable.load()
+    combos = report.report_combinations(engine, ['Region'])
+    single = report.generate_reports(engine, currencies, combos, str(tmp_path / 'single'), workers=1)
+    pooled = report.generate_reports(engine, currencies, combos, str(tmp_path / 'pool'), workers=2)
+
+    assert sorted(entry['name'] for entry in pooled) == sorted(entry['name'] for entry in single)
+    for entry in single:
+        name = entry['files'][0]
+        assert (tmp_path / 'pool' / name).stat().st_size > 0
+        # Div id plotly acak per render, bandingkan bagian teks laporan saja
+        single_page = (tmp_path / 'single' / name).read_text(encoding='utf-8')
+        pooled_page = (tmp_path / 'pool' / name).read_text(encoding='utf-8')
+        assert single_page.split('<div class="section">')[1] == pooled_page.split('<div class="section">')[1]
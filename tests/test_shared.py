@@ -0,0 +1,32 @@
+import pandas as pd
+
+from bmw_dashboard import shared
+from bmw_dashboard.engine import DashboardEngine, FilterState
+
+
+def test_attach_after_append_with_new_category(csv_copy, tmp_path):
+    """Kategori baru dari append: indeks yang di-attach tetap menunjuk baris yang benar"""
+    csv_path, parquet_path = csv_copy
+    engine = DashboardEngine.load(csv_path, parquet_path)
+    new_rows = pd.DataFrame({
+        'Year': [2020, 2021, 2022, 2023, 2024],
+        'Transmission': ['Automatic'] * 5,
+        'Model': ['A1'] * 5,
+        'Region': ['Europe'] * 5,
+        'Fuel_Type': ['Petrol'] * 5,
+        'Price_USD': [30000.0, 31000.0, 32000.0, 33000.0, 34000.0],
+        'Type': ['Actual'] * 5,
+    })
+    engine.append(new_rows)
+
+    shared_dir = str(tmp_path / 'shared')
+    shared.publish(shared_dir, engine.df, engine.index, engine.source_offset)
+    attached = DashboardEngine.attach_shared(shared_dir)
+
+    for model in ['A1', 'M3', 'M5', 'i8']:
+        state = FilterState.from_selection(models=[model])
+        rows = attached.filter(state)
+        expected = engine.filter(state)
+        assert len(rows) == len(expected), model
+        assert (rows['Model'].astype(str) == model).all(), model
+    assert len(attached.filter(FilterState.from_selection(models=['A1']))) == 5
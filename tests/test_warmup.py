@@ -0,0 +1,25 @@
+import pytest
+
+from bmw_dashboard import warmup
+from bmw_dashboard.engine import DashboardEngine, FilterState
+
+
+def test_pooled_warm_up_matches_on_demand_insights(csv_copy, monkeypatch):
+    """Insight dari tabel warm-up (process pool) sama dengan insight dihitung per klik"""
+    csv_path, parquet_path = csv_copy
+    engine = DashboardEngine.load(csv_path, parquet_path, cache_size=0)
+    states = [
+        FilterState.from_selection(),
+        FilterState.from_selection(transmissions=['Manual'], year=2018),
+        FilterState.from_selection(models=['X5', 'i8', 'M3'], year=2022),
+    ]
+    expected = [engine.insights(state) for state in states]
+
+    monkeypatch.setattr(warmup, 'POOL_MIN_ROWS', 0)
+    assert engine.warm_up(workers=2)
+    for state, ranking in zip(states, expected):
+        assert engine.insight_table.covers(state)
+        result = engine.insights(state)
+        assert result.keys() == ranking.keys()
+        for card, values in ranking.items():
+            assert result[card] == (values if card == 'count' else pytest.approx(values))